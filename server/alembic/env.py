@@ -15,6 +15,7 @@ from core.database import Base
 from models.user import User
 from models.project import Project
 from models.notification import Notification
+from models.match import Match
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,34 @@
+"""Add updated_at columns
+
+Revision ID: 4c1e9b7d2a10
+Revises: 37a2ffa48b2f
+Create Date: 2026-10-17 10:12:41.508214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e9b7d2a10'
+down_revision: Union[str, None] = '37a2ffa48b2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('users', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE projects SET updated_at = created_at")
+    op.execute("UPDATE users SET updated_at = now()")
+    op.create_index(op.f('ix_projects_updated_at'), 'projects', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_users_updated_at'), 'users', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_updated_at'), table_name='users')
+    op.drop_index(op.f('ix_projects_updated_at'), table_name='projects')
+    op.drop_column('users', 'updated_at')
+    op.drop_column('projects', 'updated_at')
@@ -0,0 +1,32 @@
+"""Add embedding columns
+
+Revision ID: 9b3f6d2e8c41
+Revises: 4c1e9b7d2a10
+Create Date: 2026-10-17 14:03:27.114902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f6d2e8c41'
+down_revision: Union[str, None] = '4c1e9b7d2a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('projects', 'users'):
+        op.add_column(table, sa.Column('embedding', sa.LargeBinary(), nullable=True))
+        op.add_column(table, sa.Column('embedding_model', sa.String(), nullable=True))
+        op.add_column(table, sa.Column('embedding_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ('users', 'projects'):
+        op.drop_column(table, 'embedding_hash')
+        op.drop_column(table, 'embedding_model')
+        op.drop_column(table, 'embedding')
@@ -0,0 +1,61 @@
+"""Add user trigram indexes
+
+Revision ID: a9d4f6b2c8e3
+Revises: f2a8d5c1e7b4
+Create Date: 2026-10-17 20:31:54.118270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4f6b2c8e3'
+down_revision: Union[str, None] = 'f2a8d5c1e7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ('username', 'email')
+# Фильтры по навыкам и ролям - containment-запросы (@>), как и у проектов
+JSON_COLUMNS = ('skills', 'roles')
+
+
+def upgrade() -> None:
+    # pg_trgm и GIN есть только в PostgreSQL; в SQLite сходство считается функциями core.trigram
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f'ix_users_{column}_trgm', 'users', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'users', column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            postgresql_using=f'{column}::jsonb'
+        )
+        op.create_index(
+            f'ix_users_{column}_gin', 'users', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'jsonb_path_ops'}
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in JSON_COLUMNS:
+        op.drop_index(f'ix_users_{column}_gin', table_name='users')
+        op.alter_column(
+            'users', column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            postgresql_using=f'{column}::json'
+        )
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f'ix_users_{column}_trgm', table_name='users')
@@ -0,0 +1,33 @@
+"""Add keyset pagination indexes
+
+Revision ID: b3e7a1c5d9f2
+Revises: a9d4f6b2c8e3
+Create Date: 2026-10-17 21:48:13.902561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7a1c5d9f2'
+down_revision: Union[str, None] = 'a9d4f6b2c8e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_projects_created_at_id', 'projects', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_projects_team_lead_created_at_id', 'projects', ['team_lead_id', 'created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_notifications_user_created_at_id', 'notifications', ['user_id', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_created_at_id', table_name='notifications')
+    op.drop_index('ix_projects_team_lead_created_at_id', table_name='projects')
+    op.drop_index('ix_projects_created_at_id', table_name='projects')
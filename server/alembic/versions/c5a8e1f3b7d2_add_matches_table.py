@@ -0,0 +1,42 @@
+"""Add matches table
+
+Revision ID: c5a8e1f3b7d2
+Revises: 9b3f6d2e8c41
+Create Date: 2026-10-17 16:42:08.530117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8e1f3b7d2'
+down_revision: Union[str, None] = '9b3f6d2e8c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'matches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_type', sa.String(length=16), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('target_id', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('model', sa.String(), nullable=False),
+        sa.Column('source_updated_at', sa.DateTime(), nullable=True),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_matches_source', 'matches', ['source_type', 'source_id', 'rank'], unique=False)
+    op.create_index('ix_matches_target', 'matches', ['source_type', 'target_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_matches_target', table_name='matches')
+    op.drop_index('ix_matches_source', table_name='matches')
+    op.drop_table('matches')
@@ -0,0 +1,61 @@
+"""Add entity stats materialized view
+
+Revision ID: c8f1e5a2b6d4
+Revises: b3e7a1c5d9f2
+Create Date: 2026-10-17 22:36:09.417752
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1e5a2b6d4'
+down_revision: Union[str, None] = 'b3e7a1c5d9f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Поля-массивы: (сущность, таблица, колонка); те же, что в services.stats_service.ARRAY_FIELDS
+ARRAY_FIELDS = (
+    ('project', 'projects', 'technologies'),
+    ('project', 'projects', 'required_roles'),
+    ('user', 'users', 'skills'),
+    ('user', 'users', 'roles'),
+)
+
+
+def _array_counts(entity: str, table: str, column: str) -> str:
+    # JSON null и не-массивы разворачиваются как пустой массив
+    array = f"CASE WHEN jsonb_typeof({column}::jsonb) = 'array' THEN {column}::jsonb ELSE '[]'::jsonb END"
+    return (
+        f"SELECT '{entity}'::text AS entity, '{column}'::text AS field, element.value AS value, count(*) AS count "
+        f"FROM {table} CROSS JOIN LATERAL jsonb_array_elements_text({array}) AS element(value) "
+        f"WHERE element.value IS NOT NULL GROUP BY element.value"
+    )
+
+
+def upgrade() -> None:
+    # Материализованные представления есть только в PostgreSQL; в SQLite статистика считается при запросе
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    parts = [
+        "SELECT 'project'::text AS entity, 'status'::text AS field, coalesce(status, 'unknown') AS value, "
+        "count(*) AS count FROM projects GROUP BY coalesce(status, 'unknown')",
+        "SELECT 'user'::text, 'is_active'::text, CASE WHEN is_active THEN 'true' ELSE 'false' END, count(*) "
+        "FROM users GROUP BY CASE WHEN is_active THEN 'true' ELSE 'false' END",
+        # Время обновления: запрос представления выполняется заново при каждом REFRESH
+        "SELECT 'meta'::text, 'refreshed_at'::text, to_char(now() AT TIME ZONE 'UTC', "
+        "'YYYY-MM-DD\"T\"HH24:MI:SS'), 0::bigint",
+    ]
+    parts.extend(_array_counts(*field) for field in ARRAY_FIELDS)
+    op.execute(f"CREATE MATERIALIZED VIEW entity_stats AS {' UNION ALL '.join(parts)}")
+    # Уникальный индекс обязателен для REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ix_entity_stats_key', 'entity_stats', ['entity', 'field', 'value'], unique=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_entity_stats_key', table_name='entity_stats')
+    op.execute('DROP MATERIALIZED VIEW entity_stats')
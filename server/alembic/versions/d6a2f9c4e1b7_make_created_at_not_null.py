@@ -0,0 +1,47 @@
+"""Make created_at not null
+
+Revision ID: d6a2f9c4e1b7
+Revises: c8f1e5a2b6d4
+Create Date: 2026-10-17 23:52:40.186305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6a2f9c4e1b7'
+down_revision: Union[str, None] = 'c8f1e5a2b6d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# created_at - ключ пагинации (created_at, id); для строк без даты берем ближайшую известную
+BACKFILL = {
+    'projects': 'COALESCE(updated_at, CURRENT_TIMESTAMP)',
+    'notifications': 'COALESCE(read_at, CURRENT_TIMESTAMP)',
+}
+
+
+def upgrade() -> None:
+    for table, value in BACKFILL.items():
+        op.execute(f"UPDATE {table} SET created_at = {value} WHERE created_at IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                'created_at',
+                existing_type=sa.DateTime(),
+                nullable=False,
+                server_default=sa.func.now()
+            )
+
+
+def downgrade() -> None:
+    for table in BACKFILL:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                'created_at',
+                existing_type=sa.DateTime(),
+                nullable=True,
+                server_default=None
+            )
@@ -0,0 +1,53 @@
+"""Add project JSONB indexes
+
+Revision ID: e4b7c2d9a6f1
+Revises: c5a8e1f3b7d2
+Create Date: 2026-10-17 18:05:41.216904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7c2d9a6f1'
+down_revision: Union[str, None] = 'c5a8e1f3b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = ('technologies', 'required_roles')
+
+
+def upgrade() -> None:
+    op.create_index('ix_projects_status', 'projects', ['status'], unique=False)
+    # JSONB и GIN есть только в PostgreSQL; в SQLite фильтры выполняются через json_each
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'projects', column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            postgresql_using=f'{column}::jsonb'
+        )
+        # jsonb_path_ops меньше jsonb_ops и покрывает containment (@>), которым фильтруются проекты
+        op.create_index(
+            f'ix_projects_{column}_gin', 'projects', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'jsonb_path_ops'}
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for column in JSON_COLUMNS:
+            op.drop_index(f'ix_projects_{column}_gin', table_name='projects')
+            op.alter_column(
+                'projects', column,
+                type_=sa.JSON(),
+                existing_type=postgresql.JSONB(),
+                postgresql_using=f'{column}::json'
+            )
+    op.drop_index('ix_projects_status', table_name='projects')
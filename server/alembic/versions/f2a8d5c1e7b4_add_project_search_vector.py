@@ -0,0 +1,50 @@
+"""Add project search vector
+
+Revision ID: f2a8d5c1e7b4
+Revises: e4b7c2d9a6f1
+Create Date: 2026-10-17 19:12:27.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8d5c1e7b4'
+down_revision: Union[str, None] = 'e4b7c2d9a6f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        op.add_column('projects', sa.Column('search_language', sa.String(length=32), nullable=True))
+        return
+
+    op.add_column('projects', sa.Column(
+        'search_language', postgresql.REGCONFIG(), nullable=False, server_default=sa.text("'english'::regconfig")
+    ))
+    # Та же эвристика, что и services.fulltext_search.detect_language
+    op.execute(
+        "UPDATE projects SET search_language = 'russian'::regconfig "
+        "WHERE coalesce(title, '') || ' ' || coalesce(description, '') ~* '[а-яё]'"
+    )
+    # Колонка regconfig, а не text: to_tsvector(regconfig, text) неизменяема и допустима в генерируемой колонке
+    op.execute(
+        "ALTER TABLE projects ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector(search_language, coalesce(title, '')), 'A') || "
+        "setweight(jsonb_to_tsvector(search_language, coalesce(technologies, '[]'::jsonb), '[\"string\"]'), 'B') || "
+        "setweight(to_tsvector(search_language, coalesce(description, '')), 'C')"
+        ") STORED"
+    )
+    op.create_index('ix_projects_search_vector', 'projects', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_projects_search_vector', table_name='projects')
+        op.drop_column('projects', 'search_vector')
+    op.drop_column('projects', 'search_language')
@@ -3,7 +3,8 @@ from .routes import (
     users_router,
     projects_router,
     matching_router,
-    notifications_router
+    notifications_router,
+    admin_router
 )
 
 __all__ = [
@@ -11,5 +12,6 @@ __all__ = [
     "users_router",
     "projects_router",
     "matching_router",
-    "notifications_router"
+    "notifications_router",
+    "admin_router"
 ]
\ No newline at end of file
@@ -1,36 +1,24 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from core.database import get_db, check_database_connection
-from core.logging_config import loggers
+from fastapi import APIRouter, Response, status
+from core.config import settings
+from services.warmup import warmup_service
 
 router = APIRouter()
-logger = loggers['api']
 
 @router.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check():
     """
-    Проверка здоровья приложения
+    Проверка живости процесса.
+    Не обращается к базе данных и модели, чтобы оставаться дешевой для частых проб.
     """
-    try:
-        # Проверяем подключение к базе данных
-        db_status = check_database_connection()
-        
-        # Проверяем JWT
-        jwt_status = True  # JWT проверяется при каждом запросе
-        
-        status = {
-            "status": "healthy" if db_status and jwt_status else "unhealthy",
-            "database": "connected" if db_status else "disconnected",
-            "jwt": "configured" if jwt_status else "not configured",
-            "version": "1.0.0"
-        }
-        
-        logger.info(f"Health check completed: {status}")
-        return status
-        
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return {
-            "status": "unhealthy",
-            "error": str(e)
-        } 
\ No newline at end of file
+    return {"status": "healthy", "version": settings.VERSION}
+
+@router.get("/ready")
+async def readiness_check(response: Response):
+    """
+    Проверка готовности воркера к поисковым запросам.
+    Пока модель и индексы загружаются, возвращает 503 и прогресс прогрева.
+    """
+    warmup_status = warmup_service.status()
+    if not warmup_status["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return warmup_status
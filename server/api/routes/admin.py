@@ -0,0 +1,29 @@
+from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from api.deps import get_db
+from api.services.user_service import get_current_user
+from models.user import User
+from services.stats_service import stats_service
+
+router = APIRouter()
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    if "admin" not in (current_user.roles or []):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can view statistics"
+        )
+    return current_user
+
+@router.get("/stats")
+def get_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+) -> Dict[str, Any]:
+    """
+    Статистика проектов и пользователей.
+    При STATS_MATERIALIZED=true читается из материализованного представления,
+    поэтому время ответа не зависит от размера таблиц.
+    """
+    return {**stats_service.get(db), "refresh": stats_service.stats()}
@@ -1,13 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
-from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, undefer
+from typing import List, Dict, Optional, Iterator
+from core.config import settings
 from models.project import Project
 from models.user import User
 from schemas.project import Project as ProjectSchema
 from schemas.user import User as UserSchema
-from api.services.matching_service import matching_service
+from schemas.matching import CompatibilityBatchRequest, CompatibilityMatrix
+from services.matching_service import matching_service
 from api.deps import get_db
 from api.services.user_service import get_current_user
+from services.embedding_engine import embedding_engine
+from services.match_table import match_table
+from services.index_publisher import index_publisher
+from services.inference_executor import inference_executor
+import numpy as np
+import json
 
 router = APIRouter(
     prefix="/matching",
@@ -20,6 +29,8 @@ async def get_matching_profiles(
     project_id: int = Path(...),
     top_k: Optional[int] = Query(10, description="Количество возвращаемых результатов"),
     min_score: Optional[float] = Query(None, description="Минимальный балл совместимости"),
+    ef_search: Optional[int] = Query(None, ge=1, description="Ширина поиска HNSW (точность/скорость)"),
+    nprobe: Optional[int] = Query(None, ge=1, description="Число просматриваемых кластеров IVF (точность/скорость)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -29,7 +40,9 @@ async def get_matching_profiles(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Проект не найден"
         )
-    results = matching_service.find_matching_profiles(project, top_k, min_score)
+    results = await matching_service.find_matching_profiles_async(
+        project, top_k, min_score, ef_search=ef_search, nprobe=nprobe, db=db
+    )
     return [{"profile": profile, "score": score} for profile, score in results]
 
 @router.get("/users/{user_id}/matching-projects", response_model=List[Dict])
@@ -37,6 +50,8 @@ async def get_matching_projects(
     user_id: int = Path(...),
     top_k: Optional[int] = Query(10, description="Количество возвращаемых результатов"),
     min_score: Optional[float] = Query(None, description="Минимальный балл совместимости"),
+    ef_search: Optional[int] = Query(None, ge=1, description="Ширина поиска HNSW (точность/скорость)"),
+    nprobe: Optional[int] = Query(None, ge=1, description="Число просматриваемых кластеров IVF (точность/скорость)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -46,7 +61,9 @@ async def get_matching_projects(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь не найден"
         )
-    results = matching_service.find_matching_projects(user, top_k, min_score)
+    results = await matching_service.find_matching_projects_async(
+        user, top_k, min_score, ef_search=ef_search, nprobe=nprobe, db=db
+    )
     return [{"project": project, "score": score} for project, score in results]
 
 @router.get("/compatibility/{project_id}/{user_id}", response_model=float)
@@ -56,19 +73,75 @@ async def get_compatibility(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(undefer(Project.embedding)).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Проект не найден"
         )
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(undefer(User.embedding)).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь не найден"
         )
-    return matching_service.calculate_compatibility(project, user)
+    similarity = await matching_service.calculate_compatibility_async(project, user)
+    # Сохраняем эмбеддинги, посчитанные для строк без них, как и в пакетном расчете
+    db.commit()
+    return similarity
+
+def _load_by_ids(db: Session, model, ids: List[int], detail: str) -> list:
+    """Загрузка объектов в порядке переданных id (без повторов) с ошибкой 404 для отсутствующих"""
+    ids = list(dict.fromkeys(ids))
+    found = {
+        obj.id: obj
+        for obj in db.query(model).options(undefer(model.embedding)).filter(model.id.in_(ids)).all()
+    }
+    missing = [obj_id for obj_id in ids if obj_id not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{detail}: {missing}"
+        )
+    return [found[obj_id] for obj_id in ids]
+
+def _stream_matrix(project_ids: List[int], user_ids: List[int], scores: np.ndarray) -> Iterator[str]:
+    """Построчная выдача матрицы: сначала порядок участников, затем по строке на проект"""
+    yield json.dumps({"user_ids": user_ids}) + "\n"
+    for project_id, row in zip(project_ids, scores):
+        yield json.dumps({"project_id": project_id, "scores": row.tolist()}) + "\n"
+
+@router.post("/compatibility/batch", response_model=CompatibilityMatrix)
+async def get_compatibility_batch(
+    request: CompatibilityBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Оценка совместимости многих проектов и участников за один запрос.
+    Большие матрицы отдаются потоком NDJSON: первая строка содержит user_ids,
+    каждая следующая - оценки одного проекта.
+    """
+    projects = _load_by_ids(db, Project, request.project_ids, "Проекты не найдены")
+    users = _load_by_ids(db, User, request.user_ids, "Пользователи не найдены")
+    scores = await matching_service.calculate_compatibility_matrix_async(projects, users)
+    # Сохраняем эмбеддинги, посчитанные для строк без них, чтобы не векторизовать их снова
+    db.commit()
+
+    project_ids = [project.id for project in projects]
+    user_ids = [user.id for user in users]
+    if scores.size >= settings.MATCHING_BATCH_STREAM_THRESHOLD:
+        return StreamingResponse(
+            _stream_matrix(project_ids, user_ids, scores),
+            media_type="application/x-ndjson"
+        )
+    return {
+        "user_ids": user_ids,
+        "rows": [
+            {"project_id": project_id, "scores": row.tolist()}
+            for project_id, row in zip(project_ids, scores)
+        ]
+    }
 
 @router.get("/users/{user_id}/recommendations", response_model=Dict)
 async def get_recommendations(
@@ -83,7 +156,7 @@ async def get_recommendations(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь не найден"
         )
-    recommendations = matching_service.get_recommendations(user, top_k)
+    recommendations = await matching_service.get_recommendations_async(user, top_k, db=db)
     return {
         "matching_projects": [
             {"project": project, "score": score}
@@ -93,4 +166,19 @@ async def get_recommendations(
             {"profile": profile, "score": score}
             for profile, score in recommendations["similar_profiles"]
         ]
+    }
+
+@router.get("/stats", response_model=Dict)
+async def get_matching_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Статистика векторизации (размер батчей, попадания в кэш эмбеддингов и его объем)
+    и таблицы подбора (попадания, очередь пересчета), очередь пула векторизации и поиска
+    """
+    return {
+        **embedding_engine.stats(),
+        "matches": match_table.stats(),
+        "shared_index": index_publisher.stats(),
+        "executor": inference_executor.stats()
     }
\ No newline at end of file
@@ -1,5 +1,5 @@
-from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from models.user import User
 from models.notification import Notification
@@ -21,10 +21,26 @@ def get_notification_service(
 
 @router.get("/notifications", response_model=List[Dict[str, Any]])
 async def get_notifications(
+    skip: int = Query(0, ge=0, deprecated=True, description="Устарел, используйте cursor"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=512, description="Курсор из заголовка X-Next-Cursor"),
+    response: Response = None,
     current_user: User = Depends(get_current_user),
     notification_service: NotificationService = Depends(get_notification_service)
 ) -> List[Dict[str, Any]]:
-    notifications = notification_service.get_user_notifications(current_user.id)
+    if skip and cursor is None:
+        # Старая постраничная навигация по смещению в кэшированном списке
+        notifications = notification_service.get_user_notifications(current_user.id)[skip:skip + limit]
+        return [notification.dict() for notification in notifications]
+
+    try:
+        notifications, next_cursor = notification_service.get_user_notifications_page(
+            current_user.id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [notification.dict() for notification in notifications]
 
 @router.post("/notifications/{notification_id}/read")
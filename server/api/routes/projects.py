@@ -1,5 +1,5 @@
 from typing import List, Dict, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, Response
 from sqlalchemy.orm import Session
 from api.deps import get_db
 from api.services.user_service import get_current_user
@@ -9,9 +9,11 @@ from api.services.project_service import (
     create_project,
     get_project,
     get_projects,
+    get_projects_page,
     update_project,
     delete_project,
-    search_projects_db
+    search_projects_db,
+    search_projects_page_db
 )
 from fastapi_limiter.depends import RateLimiter
 from core.database import transaction
@@ -23,8 +25,10 @@ def search_projects(
     query: str = Query(..., min_length=1, max_length=100),
     skills: Optional[List[str]] = Query(None, min_items=1, max_items=20),
     status: Optional[str] = Query(None, pattern="^(active|completed|pending)$"),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, deprecated=True, description="Устарел, используйте cursor"),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=512, description="Курсор из заголовка X-Next-Cursor"),
+    response: Response = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -33,16 +37,38 @@ def search_projects(
         skills=skills,
         status=status
     )
-    return search_projects_db(db=db, filters=filters.dict(), skip=skip, limit=limit)
+    if skip and cursor is None:
+        # Старая постраничная навигация по смещению
+        return search_projects_db(db=db, filters=filters.dict(), skip=skip, limit=limit)
+
+    try:
+        projects, next_cursor = search_projects_page_db(db=db, filters=filters.dict(), limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return projects
 
 @router.get("/", response_model=List[Project])
 def read_projects(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, deprecated=True, description="Устарел, используйте cursor"),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=512, description="Курсор из заголовка X-Next-Cursor"),
+    response: Response = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return get_projects(db=db, skip=skip, limit=limit)
+    if skip and cursor is None:
+        # Старая постраничная навигация по смещению
+        return get_projects(db=db, skip=skip, limit=limit)
+
+    try:
+        projects, next_cursor = get_projects_page(db=db, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return projects
 
 @router.post("/", response_model=Project)
 def create_new_project(
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from core.database import get_db
 from api.services.user_service import (
     get_user,
@@ -8,10 +8,32 @@ from api.services.user_service import (
     update_user,
     delete_user
 )
+from services.user_service import UserService
 from schemas.user import User, UserUpdate
 
 router = APIRouter()
 
+@router.get("/search/", response_model=List[User])
+def search_users(
+    query: Optional[str] = Query(None, min_length=1, max_length=100),
+    skills: Optional[List[str]] = Query(None, min_items=1, max_items=20),
+    role: Optional[str] = Query(None, min_length=1, max_length=50),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=512, description="Курсор из заголовка X-Next-Cursor"),
+    response: Response = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        users, next_cursor = UserService(db).search_users_page(
+            query=query, skills=skills, role=role, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
+
 @router.get("/{user_id}", response_model=User)
 def read_user(
     user_id: int,
@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from models.notification import Notification
 from models.user import User
 from .cache_service import CacheService
 from .matching_service import MatchingService
+from services.pagination import keyset_page
 
 class NotificationService:
     def __init__(
@@ -35,6 +36,20 @@ class NotificationService:
         self.cache_service.set(cache_key, notifications, expire_in=300)  # 5 минут
         return notifications
 
+    def get_user_notifications_page(
+        self,
+        user_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Notification], Optional[str]]:
+        """
+        Страница уведомлений пользователя от новых к старым и курсор следующей страницы
+        """
+        query = self.db.query(Notification).filter(Notification.user_id == user_id)
+        return keyset_page(
+            query, Notification.created_at, Notification.id, limit, cursor, scope=f"notifications:{user_id}"
+        )
+
     def mark_as_read(self, notification_id: int, user_id: int) -> Optional[Notification]:
         """
         Отмечает уведомление как прочитанное
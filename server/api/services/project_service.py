@@ -1,17 +1,27 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List, Optional, Dict
-from sqlalchemy import or_, and_
+from typing import List, Optional, Dict, Tuple
 from models.project import Project
 from models.user import User
 from schemas.project import ProjectCreate, ProjectUpdate
-from sqlalchemy.sql import text
+from services.semantic_search import semantic_search
+from services.match_table import match_table, MATCH_PROJECT
+from core.database import json_array_overlaps
+from services.fulltext_search import fulltext_enabled, fulltext_ranking, set_search_language
+from services.pagination import keyset_page
+from core.config import settings
+from services.search_cursor import list_scope
 
 def get_project(db: Session, project_id: int) -> Optional[Project]:
     return db.query(Project).filter(Project.id == project_id).first()
 
 def get_projects(db: Session, skip: int = 0, limit: int = 100) -> List[Project]:
-    return db.query(Project).offset(skip).limit(limit).all()
+    """Список по смещению; оставлен для устаревшего параметра skip, используйте get_projects_page"""
+    return db.query(Project).order_by(Project.created_at.desc(), Project.id.desc()).offset(skip).limit(limit).all()
+
+def get_projects_page(db: Session, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[Project], Optional[str]]:
+    """Страница проектов от новых к старым по курсору"""
+    return keyset_page(db.query(Project), Project.created_at, Project.id, limit, cursor, scope=list_scope("projects"))
 
 def create_project(db: Session, project: ProjectCreate, user_id: int) -> Project:
     db_project = Project(
@@ -19,8 +29,12 @@ def create_project(db: Session, project: ProjectCreate, user_id: int) -> Project
         team_lead_id=user_id
     )
     db.add(db_project)
+    set_search_language(db_project)
+    semantic_search.embed(db_project)
     db.commit()
     db.refresh(db_project)
+    semantic_search.upsert(db_project)
+    match_table.mark_changed(MATCH_PROJECT, db_project.id)
     return db_project
 
 def update_project(db: Session, project_id: int, project_update: ProjectUpdate) -> Project:
@@ -35,8 +49,12 @@ def update_project(db: Session, project_id: int, project_update: ProjectUpdate)
     for field, value in update_data.items():
         setattr(db_project, field, value)
     
+    set_search_language(db_project)
+    semantic_search.embed(db_project)
     db.commit()
     db.refresh(db_project)
+    semantic_search.upsert(db_project)
+    match_table.mark_changed(MATCH_PROJECT, db_project.id)
     return db_project
 
 def delete_project(db: Session, project_id: int) -> None:
@@ -44,6 +62,8 @@ def delete_project(db: Session, project_id: int) -> None:
     if db_project:
         db.delete(db_project)
         db.commit()
+        semantic_search.remove(project_id)
+        match_table.mark_changed(MATCH_PROJECT, project_id)
 
 def like_project(db: Session, project_id: int, user_id: int) -> Project:
     db_project = get_project(db, project_id)
@@ -97,36 +117,70 @@ def unlike_project(db: Session, project_id: int, user_id: int) -> Project:
     db.refresh(db_project)
     return db_project
 
+def _fulltext_hits(db: Session, filters: Dict, top_k: int) -> Optional[List[Tuple[int, float]]]:
+    """Лексические кандидаты из полнотекстового индекса PostgreSQL, если он выбран вместо BM25 в памяти"""
+    if not fulltext_enabled(db):
+        return None
+    return fulltext_ranking(
+        db, filters["query"], top_k, status=filters.get("status") or None, skills=filters.get("skills")
+    )
+
 def search_projects_db(
     db: Session,
     filters: Dict,
     skip: int = 0,
     limit: int = 20
 ) -> List[Project]:
-    query = db.query(Project)
-    
-    # Безопасный поиск по тексту
+    # Текстовый запрос ищется гибридно (BM25 + векторный индекс) в памяти, из БД читается только страница.
+    # Смещения идут в том же порядке, что и страницы по курсору, без ограничения глубины
     if filters.get("query"):
-        search_terms = [term.strip() for term in filters["query"].split()]
-        search_conditions = []
-        for term in search_terms:
-            search_conditions.append(
-                or_(
-                    Project.title.ilike(f"%{term}%"),
-                    Project.description.ilike(f"%{term}%")
-                )
-            )
-        query = query.filter(and_(*search_conditions))
+        search_results = semantic_search.search_range(
+            filters["query"],
+            skip=skip,
+            limit=limit,
+            filters={"status": filters.get("status") or None},
+            any_filters={"technologies": filters.get("skills")},
+            lexical_hits=_fulltext_hits(db, filters, settings.SEARCH_HYBRID_CANDIDATES)
+        )
+        page_ids = [project["id"] for project, _ in search_results]
+        projects_by_id = {p.id: p for p in db.query(Project).filter(Project.id.in_(page_ids)).all()}
+        return [projects_by_id[project_id] for project_id in page_ids if project_id in projects_by_id]
+
+    # Без текстового запроса сортируем по дате
+    query = _filtered_projects(db, filters).order_by(Project.created_at.desc(), Project.id.desc())
+    return query.offset(skip).limit(limit).all()
+
+def _filtered_projects(db: Session, filters: Dict):
+    query = db.query(Project)
     
-    # Поиск по навыкам через overlap
+    # Хотя бы один из навыков среди технологий проекта (как any_filters в текстовом поиске)
     if filters.get("skills"):
-        query = query.filter(Project.required_skills.overlap(filters["skills"]))
+        query = query.filter(json_array_overlaps(db, Project.technologies, filters["skills"]))
     
     # Точное соответствие статуса
     if filters.get("status"):
         query = query.filter(Project.status == filters["status"])
-    
-    # Добавляем сортировку по релевантности и дате
-    query = query.order_by(Project.created_at.desc())
-    
-    return query.offset(skip).limit(limit).all() 
\ No newline at end of file
+    return query
+
+def search_projects_page_db(
+    db: Session,
+    filters: Dict,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[Project], Optional[str]]:
+    """Страница текстового поиска по курсору: стоимость зависит от размера страницы, а не от ее номера"""
+    if not filters.get("query"):
+        # Без запроса - список от новых к старым по ключу (created_at, id)
+        scope = list_scope("projects", {"skills": filters.get("skills"), "status": filters.get("status")})
+        return keyset_page(_filtered_projects(db, filters), Project.created_at, Project.id, limit, cursor, scope=scope)
+    search_results, next_cursor = semantic_search.search_page(
+        filters["query"],
+        limit=limit,
+        cursor=cursor,
+        filters={"status": filters.get("status") or None},
+        any_filters={"technologies": filters.get("skills")},
+        lexical_hits=_fulltext_hits(db, filters, settings.SEARCH_HYBRID_CANDIDATES)
+    )
+    page_ids = [project["id"] for project, _ in search_results]
+    projects_by_id = {p.id: p for p in db.query(Project).filter(Project.id.in_(page_ids)).all()}
+    return [projects_by_id[project_id] for project_id in page_ids if project_id in projects_by_id], next_cursor
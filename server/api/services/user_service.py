@@ -10,6 +10,8 @@ from schemas.user import UserCreate, UserUpdate
 from schemas.token import TokenPayload
 from core.security import get_password_hash, verify_password
 from core.database import get_db
+from services.profile_search import profile_search
+from services.match_table import match_table, MATCH_USER
 import logging
 
 logger = logging.getLogger(__name__)
@@ -81,8 +83,11 @@ def create_user(db: Session, user: UserCreate) -> User:
     )
     
     db.add(db_user)
+    profile_search.embed(db_user)
     db.commit()
     db.refresh(db_user)
+    profile_search.upsert(db_user)
+    match_table.mark_changed(MATCH_USER, db_user.id)
     return db_user
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
@@ -102,8 +107,11 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> User:
         )
     for key, value in user_update.dict(exclude_unset=True).items():
         setattr(db_user, key, value)
+    profile_search.embed(db_user)
     db.commit()
     db.refresh(db_user)
+    profile_search.upsert(db_user)
+    match_table.mark_changed(MATCH_USER, db_user.id)
     return db_user
 
 def delete_user(db: Session, user_id: int) -> None:
@@ -115,6 +123,8 @@ def delete_user(db: Session, user_id: int) -> None:
         )
     db.delete(db_user)
     db.commit()
+    profile_search.remove(user_id)
+    match_table.mark_changed(MATCH_USER, user_id)
     
 async def get_current_user(
     db: Session = Depends(get_db),
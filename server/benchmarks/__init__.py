@@ -0,0 +1,7 @@
+"""
+Нагрузочные замеры подбора и поиска на синтетическом корпусе.
+
+Запуск из каталога server:
+    python -m benchmarks.run --sizes 1k,10k --encoder hashing --json results/bench.json
+    python -m benchmarks.run --sizes 100k --queries 500 --compare results/previous.json
+"""
@@ -0,0 +1,188 @@
+"""Генератор синтетических участников и проектов, похожих по составу на данные сервиса"""
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+import numpy as np
+
+TECHNOLOGIES = [
+    "python", "fastapi", "django", "flask", "postgresql", "redis", "celery", "docker",
+    "kubernetes", "react", "vue", "angular", "typescript", "node.js", "go", "rust",
+    "java", "spring", "kotlin", "swift", "flutter", "c++", "c#", ".net", "pytorch",
+    "tensorflow", "pandas", "spark", "kafka", "clickhouse", "graphql", "terraform"
+]
+SKILLS = [
+    "backend", "frontend", "mobile", "devops", "machine learning", "data engineering",
+    "ui/ux", "testing", "security", "product management", "analytics", "architecture",
+    "technical writing", "mentoring", "computer vision", "nlp"
+]
+ROLES = ["developer", "designer", "analyst", "tester", "devops", "product manager", "data scientist", "team lead"]
+STATUSES = ["active", "active", "active", "completed", "on_hold"]
+LANGUAGES = ["ru", "en", "de", "es"]
+
+# Шаблоны описаний на нескольких языках: {domain} - предметная область, {tech} - технологии
+PROJECT_TEMPLATES = {
+    "ru": [
+        "Разрабатываем {domain} на {tech}. Ищем команду для запуска MVP за три месяца.",
+        "Платформа для {domain}: backend на {tech}, нужна помощь с архитектурой и тестами.",
+        "Open source библиотека для {domain}. Стек: {tech}. Приветствуются новички."
+    ],
+    "en": [
+        "Building a {domain} product with {tech}. Looking for contributors for the MVP.",
+        "An open source toolkit for {domain} written in {tech}; we need reviewers and docs.",
+        "Startup in {domain}: {tech} stack, remote team, flexible hours."
+    ],
+    "de": [
+        "Wir entwickeln eine Plattform für {domain} mit {tech} und suchen Mitstreiter.",
+        "Open-Source-Projekt im Bereich {domain}, Technologien: {tech}."
+    ],
+    "es": [
+        "Desarrollamos una aplicación de {domain} con {tech}. Buscamos colaboradores.",
+        "Proyecto de código abierto para {domain} usando {tech}."
+    ]
+}
+DOMAINS = [
+    "онлайн-образования", "e-commerce", "fintech", "healthcare", "logistics", "gamedev",
+    "социальных сетей", "smart city", "open data", "edtech", "marketplace", "IoT"
+]
+FIRST_NAMES = ["Анна", "Иван", "Maria", "John", "Lukas", "Sofía", "Ольга", "Pedro", "Emma", "Дмитрий"]
+LAST_NAMES = ["Иванова", "Петров", "Smith", "Müller", "García", "Смирнов", "Brown", "López", "Kuznetsova", "Weber"]
+
+
+@dataclass
+class SyntheticProject:
+    """Проект с полями, которые читают сервисы поиска и подбора"""
+    id: int
+    title: str
+    description: str
+    technologies: List[str]
+    required_roles: List[str]
+    status: str
+    team_lead_id: int
+    embedding: Optional[bytes] = None
+    embedding_model: Optional[str] = None
+    embedding_hash: Optional[str] = None
+    created_at: Any = None
+    updated_at: Any = None
+
+    @property
+    def roles(self) -> List[str]:
+        return self.required_roles
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "required_roles": self.required_roles,
+            "technologies": self.technologies,
+            "team_lead_id": self.team_lead_id,
+            "status": self.status,
+            "created_at": None,
+            "updated_at": None
+        }
+
+
+@dataclass
+class SyntheticUser:
+    """Участник с теми же полями, что у модели User"""
+    id: int
+    username: str
+    email: str
+    skills: List[str]
+    roles: List[str] = field(default_factory=list)
+    is_active: bool = True
+    embedding: Optional[bytes] = None
+    embedding_model: Optional[str] = None
+    embedding_hash: Optional[str] = None
+    updated_at: Any = None
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "email": self.email,
+            "username": self.username,
+            "is_active": self.is_active,
+            "roles": self.roles,
+            "skills": self.skills,
+            "updated_at": None
+        }
+
+
+class CorpusGenerator:
+    """
+    Детерминированный генератор корпуса: одинаковый seed дает одинаковые данные,
+    поэтому результаты разных запусков сравнимы. Популярность технологий и навыков
+    распределена по Ципфу, как в реальных данных.
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        self.rng = np.random.default_rng(seed)
+        self._tech_weights = self._zipf_weights(len(TECHNOLOGIES))
+        self._skill_weights = self._zipf_weights(len(SKILLS))
+
+    @staticmethod
+    def _zipf_weights(count: int) -> np.ndarray:
+        weights = 1.0 / np.arange(1, count + 1)
+        return weights / weights.sum()
+
+    def _pick(self, items: List[str], low: int, high: int, weights: Optional[np.ndarray] = None) -> List[str]:
+        count = int(self.rng.integers(low, high + 1))
+        return [str(item) for item in self.rng.choice(items, size=min(count, len(items)), replace=False, p=weights)]
+
+    def project(self, project_id: int) -> SyntheticProject:
+        language = str(self.rng.choice(LANGUAGES, p=[0.5, 0.3, 0.1, 0.1]))
+        technologies = self._pick(TECHNOLOGIES, 2, 6, self._tech_weights)
+        domain = str(self.rng.choice(DOMAINS))
+        template = str(self.rng.choice(PROJECT_TEMPLATES[language]))
+        return SyntheticProject(
+            id=project_id,
+            title=f"{domain.capitalize()} {technologies[0]} #{project_id}",
+            description=template.format(domain=domain, tech=", ".join(technologies)),
+            technologies=technologies,
+            required_roles=self._pick(ROLES, 1, 3),
+            status=str(self.rng.choice(STATUSES)),
+            team_lead_id=int(self.rng.integers(1, 1 << 30))
+        )
+
+    def user(self, user_id: int) -> SyntheticUser:
+        # Навыки анкеты - и общие навыки, и технологии: других текстовых полей у модели нет
+        skills = self._pick(SKILLS, 1, 4, self._skill_weights) + self._pick(TECHNOLOGIES, 2, 8, self._tech_weights)
+        username = f"{self.rng.choice(FIRST_NAMES)}.{self.rng.choice(LAST_NAMES)}{user_id}".lower()
+        return SyntheticUser(
+            id=user_id,
+            username=username,
+            email=f"{username}@example.com",
+            skills=skills,
+            roles=self._pick(ROLES, 1, 2)
+        )
+
+    def projects(self, count: int, start_id: int = 1) -> List[SyntheticProject]:
+        return [self.project(project_id) for project_id in range(start_id, start_id + count)]
+
+    def users(self, count: int, start_id: int = 1) -> List[SyntheticUser]:
+        return [self.user(user_id) for user_id in range(start_id, start_id + count)]
+
+    def queries(self, count: int) -> List[str]:
+        """Поисковые запросы: популярные технологии повторяются, как в реальном потоке"""
+        queries = []
+        for _ in range(count):
+            kind = self.rng.random()
+            if kind < 0.5:
+                queries.append(str(self.rng.choice(TECHNOLOGIES, p=self._tech_weights)))
+            elif kind < 0.8:
+                queries.append(" ".join(self._pick(TECHNOLOGIES, 2, 3, self._tech_weights)))
+            else:
+                queries.append(f"{self.rng.choice(SKILLS)} {self.rng.choice(DOMAINS)}")
+        return queries
+
+
+def parse_size(value: str) -> int:
+    """Размер корпуса: 1000, 10k, 1m"""
+    value = value.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(value[-1:], 1)
+    return int(float(value[:-1] if multiplier > 1 else value) * multiplier)
+
+
+def generate(size: int, seed: int = 0, users_per_project: float = 1.0) -> Tuple[List[SyntheticProject], List[SyntheticUser]]:
+    """Корпус из size проектов и size * users_per_project участников"""
+    generator = CorpusGenerator(seed)
+    return generator.projects(size), generator.users(max(1, int(size * users_per_project)))
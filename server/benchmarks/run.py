@@ -0,0 +1,229 @@
+"""
+Замер индексации, поиска и подбора на синтетическом корпусе.
+
+Для каждого размера корпуса выполняются операции index_projects/index_profiles
+(с векторизацией и повторно - по сохраненным эмбеддингам), search, search_projects,
+find_matching_profiles, find_matching_projects и get_recommendations. По операциям
+выводятся p50/p95/p99, пропускная способность и RSS процесса; --json сохраняет
+результаты, --compare сравнивает их с предыдущим запуском.
+
+Размер 1m рассчитан на хеширующий кодировщик (--encoder hashing): модели
+sentence-transformers на CPU понадобятся часы на векторизацию корпуса.
+"""
+from typing import List, Dict, Any, Callable, Optional
+import argparse
+import platform
+import tempfile
+import json
+import time
+import os
+import logging
+import numpy as np
+from benchmarks.corpus import CorpusGenerator, parse_size
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = (
+    "index_projects", "index_profiles", "search", "search_projects",
+    "find_matching_profiles", "find_matching_projects", "get_recommendations"
+)
+
+
+def rss_mb() -> float:
+    """Текущий RSS процесса (Linux) или пиковый, если /proc недоступен"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss - килобайты в Linux и байты в macOS
+        return peak / 2 ** 20 if platform.system() == "Darwin" else peak / 2 ** 10
+
+
+def summarize(operation: str, size: int, latencies: List[float], rows: Optional[int] = None) -> Dict[str, Any]:
+    """Перцентили задержки (мс), пропускная способность и память после операции"""
+    latencies_ms = np.asarray(latencies) * 1000
+    total = float(np.sum(latencies))
+    result = {
+        "operation": operation,
+        "size": size,
+        "calls": len(latencies),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        "mean_ms": round(float(np.mean(latencies_ms)), 3),
+        "ops_per_second": round(len(latencies) / total, 2) if total else None,
+        "rss_mb": round(rss_mb(), 1)
+    }
+    if rows is not None:
+        result["rows_per_second"] = round(rows / total, 1) if total else None
+    return result
+
+
+def measure(call: Callable[[Any], Any], arguments: List[Any], warmup: int) -> List[float]:
+    """Задержки вызовов; первые warmup вызовов не учитываются"""
+    for argument in arguments[:warmup]:
+        call(argument)
+    latencies = []
+    for argument in arguments:
+        started = time.perf_counter()
+        call(argument)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _projects_db(projects: List[Any]) -> Any:
+    """Временная SQLite-база с таблицей проектов: search_projects читает из нее страницу"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from models.project import Project
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "projects.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Project.__table__.create(engine)
+    columns = ("id", "title", "description", "technologies", "required_roles", "status", "team_lead_id")
+    with engine.begin() as connection:
+        for start in range(0, len(projects), 10000):
+            connection.execute(Project.__table__.insert(), [
+                {column: getattr(project, column) for column in columns} for project in projects[start:start + 10000]
+            ])
+    return sessionmaker(bind=engine)()
+
+
+def run_size(size: int, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from services.semantic_search import semantic_search
+    from services.profile_search import profile_search
+    from services.matching_service import matching_service
+    from services.project_service import ProjectService
+
+    # Seed зависит от размера, иначе меньший корпус оказался бы в кэше эмбеддингов большего
+    generator = CorpusGenerator(args.seed + size)
+    started = time.perf_counter()
+    projects = generator.projects(size)
+    users = generator.users(max(1, int(size * args.users_per_project)))
+    queries = generator.queries(args.queries)
+    logger.warning(f"Корпус {size}: {len(projects)} проектов, {len(users)} участников за {time.perf_counter() - started:.1f} с")
+
+    operations = set(args.operations.split(","))
+    results: List[Dict[str, Any]] = []
+
+    # Индексация: первый проход векторизует тексты, второй берет сохраненные эмбеддинги
+    for name, index, corpus in (
+        ("index_projects", semantic_search.index_projects, projects),
+        ("index_profiles", profile_search.index_profiles, users)
+    ):
+        for suffix in ("", "_warm"):
+            started = time.perf_counter()
+            index(corpus)
+            if name in operations:
+                results.append(summarize(name + suffix, size, [time.perf_counter() - started], rows=len(corpus)))
+
+    rng = np.random.default_rng(args.seed)
+    sample_projects = [projects[i] for i in rng.integers(0, len(projects), args.queries)]
+    sample_users = [users[i] for i in rng.integers(0, len(users), args.queries)]
+    db = _projects_db(projects) if "search_projects" in operations else None
+    service = ProjectService(db)
+
+    calls = {
+        "search": (lambda query: semantic_search.search(query, args.top_k), queries),
+        "search_projects": (lambda query: service.search_projects(query=query, limit=args.top_k), queries),
+        "find_matching_profiles": (
+            lambda project: matching_service.find_matching_profiles(project, args.top_k), sample_projects
+        ),
+        "find_matching_projects": (lambda user: matching_service.find_matching_projects(user, args.top_k), sample_users),
+        "get_recommendations": (lambda user: matching_service.get_recommendations(user, args.top_k), sample_users)
+    }
+    for name, (call, arguments) in calls.items():
+        if name in operations:
+            results.append(summarize(name, size, measure(call, arguments, args.warmup)))
+
+    if db is not None:
+        db.close()
+    return results
+
+
+def environment(args: argparse.Namespace) -> Dict[str, Any]:
+    """Параметры запуска, без которых результаты нельзя сравнивать"""
+    from services.embedding_engine import embedding_engine
+    from services.vector_index import choose_backend
+    from core.config import settings
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "encoder": embedding_engine.model_name,
+        "backend": choose_backend(),
+        "index_type": settings.SEARCH_INDEX_TYPE,
+        "storage": settings.SEARCH_VECTOR_STORAGE,
+        "queries": args.queries,
+        "top_k": args.top_k,
+        "seed": args.seed
+    }
+
+
+def compare(results: List[Dict[str, Any]], previous_path: str) -> None:
+    """Вывод изменения p95 и пропускной способности относительно предыдущего запуска"""
+    with open(previous_path) as f:
+        previous = {(r["size"], r["operation"]): r for r in json.load(f)["results"]}
+    for result in results:
+        before = previous.get((result["size"], result["operation"]))
+        if before is None:
+            continue
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        print(
+            f"{result['size']:>8} {result['operation']:<26} p95 {before['p95_ms']} -> {result['p95_ms']} мс "
+            f"({p95_change:+.1%})"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер поиска и подбора на синтетическом корпусе")
+    parser.add_argument("--sizes", default="1k,10k", help="Размеры корпуса через запятую: 1k, 10k, 100k, 1m")
+    parser.add_argument("--users-per-project", type=float, default=1.0)
+    parser.add_argument("--queries", type=int, default=200, help="Вызовов на операцию")
+    parser.add_argument("--warmup", type=int, default=10, help="Неучитываемых вызовов перед замером")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--encoder", choices=("sentence-transformers", "hashing"), help="Кодировщик (EMBEDDING_ENCODER)")
+    parser.add_argument("--backend", choices=("auto", "faiss", "numpy"), help="Бэкенд индекса (SEARCH_BACKEND)")
+    parser.add_argument("--operations", default=",".join(OPERATIONS))
+    parser.add_argument("--json", dest="json_path", help="Файл для сохранения результатов")
+    parser.add_argument("--compare", help="Результаты предыдущего запуска для сравнения")
+    args = parser.parse_args()
+
+    # Настройки читаются при импорте сервисов, поэтому задаются до него
+    if args.encoder:
+        os.environ["EMBEDDING_ENCODER"] = args.encoder
+    if args.backend:
+        os.environ["SEARCH_BACKEND"] = args.backend
+    # Замер не должен зависеть от Redis и не должен трогать рабочие снимки индексов
+    os.environ.setdefault("EMBEDDING_CACHE_REDIS", "false")
+    os.environ["SEARCH_INDEX_DIR"] = tempfile.mkdtemp(prefix="bench-indexes-")
+    # Сервисы пишут в лог каждый вызов; оставляем только предупреждения
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    results: List[Dict[str, Any]] = []
+    for size in map(parse_size, args.sizes.split(",")):
+        for result in run_size(size, args):
+            results.append(result)
+            print(
+                f"{result['size']:>8} {result['operation']:<26} p50={result['p50_ms']} мс  "
+                f"p95={result['p95_ms']} мс  p99={result['p99_ms']} мс  "
+                f"{result['ops_per_second']} оп/с  RSS {result['rss_mb']} МБ"
+            )
+
+    report = {"environment": environment(args), "results": results}
+    if args.json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_path)), exist_ok=True)
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl, Field, validator
-import os
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Project Matching API"
@@ -50,6 +49,65 @@ class Settings(BaseSettings):
     # Matching
     MIN_MATCH_SCORE: float = 0.5
     MAX_MATCHES: int = 10
+    # Начиная с этого числа ячеек матрица совместимости отдается потоком строк NDJSON
+    MATCHING_BATCH_STREAM_THRESHOLD: int = Field(10000, env="MATCHING_BATCH_STREAM_THRESHOLD")
+    # Таблица подбора matches: длина списков и число соседей, чьи списки пересчитываются при изменении объекта
+    MATCHES_TOP_K: int = Field(50, env="MATCHES_TOP_K")
+    MATCHES_FANOUT: int = Field(100, env="MATCHES_FANOUT")
+    MATCHES_MAX_AGE_SECONDS: int = Field(24 * 3600, env="MATCHES_MAX_AGE_SECONDS")
+    MATCHES_REFRESH_BATCH_SIZE: int = Field(64, env="MATCHES_REFRESH_BATCH_SIZE")
+
+    # Embeddings
+    EMBEDDING_ENCODER: str = Field("sentence-transformers", env="EMBEDDING_ENCODER")  # sentence-transformers, hashing
+    EMBEDDING_MODEL_NAME: str = Field("all-MiniLM-L6-v2", env="EMBEDDING_MODEL_NAME")
+    EMBEDDING_HASHING_DIMENSION: int = Field(1024, env="EMBEDDING_HASHING_DIMENSION")
+    EMBEDDING_BATCH_WINDOW_MS: float = Field(5.0, env="EMBEDDING_BATCH_WINDOW_MS")
+    EMBEDDING_MAX_BATCH_SIZE: int = Field(64, env="EMBEDDING_MAX_BATCH_SIZE")
+    EMBEDDING_CACHE_SIZE: int = Field(50000, env="EMBEDDING_CACHE_SIZE")
+    EMBEDDING_CACHE_REDIS: bool = Field(True, env="EMBEDDING_CACHE_REDIS")
+    EMBEDDING_CACHE_TTL_SECONDS: int = Field(7 * 24 * 3600, env="EMBEDDING_CACHE_TTL_SECONDS")
+    EMBEDDING_CACHE_DIR: Optional[str] = Field(None, env="EMBEDDING_CACHE_DIR")
+    QUERY_CACHE_SIZE: int = Field(10000, env="QUERY_CACHE_SIZE")
+    QUERY_CACHE_TTL_SECONDS: int = Field(3600, env="QUERY_CACHE_TTL_SECONDS")
+
+    # Пул потоков для векторизации и поиска из async-маршрутов (0 - по числу CPU, не больше 4)
+    INFERENCE_WORKERS: int = Field(0, env="INFERENCE_WORKERS")
+    INFERENCE_MAX_QUEUE: int = Field(64, env="INFERENCE_MAX_QUEUE")
+
+    # Search indexes
+    SEARCH_INDEX_DIR: str = Field("data/indexes", env="SEARCH_INDEX_DIR")
+    SEARCH_INDEX_KEEP_SNAPSHOTS: int = Field(2, env="SEARCH_INDEX_KEEP_SNAPSHOTS")
+    SEARCH_BACKEND: str = Field("auto", env="SEARCH_BACKEND")  # auto, faiss, numpy
+    SEARCH_NUMPY_BLOCK_ROWS: int = Field(65536, env="SEARCH_NUMPY_BLOCK_ROWS")
+    SEARCH_INDEX_TYPE: str = Field("auto", env="SEARCH_INDEX_TYPE")  # auto, flat, hnsw, ivfpq
+    SEARCH_ANN_INDEX_TYPE: str = Field("hnsw", env="SEARCH_ANN_INDEX_TYPE")
+    SEARCH_ANN_THRESHOLD: int = Field(50000, env="SEARCH_ANN_THRESHOLD")
+    SEARCH_HNSW_M: int = Field(32, env="SEARCH_HNSW_M")
+    SEARCH_HNSW_EF_CONSTRUCTION: int = Field(200, env="SEARCH_HNSW_EF_CONSTRUCTION")
+    SEARCH_HNSW_EF_SEARCH: int = Field(64, env="SEARCH_HNSW_EF_SEARCH")
+    SEARCH_IVF_NLIST: int = Field(1024, env="SEARCH_IVF_NLIST")
+    SEARCH_IVF_NPROBE: int = Field(16, env="SEARCH_IVF_NPROBE")
+    SEARCH_PQ_M: int = Field(16, env="SEARCH_PQ_M")
+    SEARCH_VECTOR_STORAGE: str = Field("float32", env="SEARCH_VECTOR_STORAGE")  # float32, float16, int8, pq
+    # До этого числа подходящих под фильтр объектов HNSW-поиск заменяется точным перебором
+    SEARCH_FILTER_EXACT_THRESHOLD: int = Field(4096, env="SEARCH_FILTER_EXACT_THRESHOLD")
+    # Гибридный поиск: кандидаты BM25 и векторного индекса сливаются методом RRF
+    SEARCH_HYBRID_CANDIDATES: int = Field(100, env="SEARCH_HYBRID_CANDIDATES")
+    SEARCH_RRF_K: int = Field(60, env="SEARCH_RRF_K")
+    SEARCH_BM25_K1: float = Field(1.2, env="SEARCH_BM25_K1")
+    SEARCH_BM25_B: float = Field(0.75, env="SEARCH_BM25_B")
+    # Источник лексических кандидатов: memory (BM25 в воркере), postgres (tsvector и ts_rank_cd)
+    # или auto - postgres на PostgreSQL, memory на остальных СУБД
+    SEARCH_LEXICAL_BACKEND: str = Field("auto", env="SEARCH_LEXICAL_BACKEND")
+    # Нечеткий поиск людей: минимальное word_similarity запроса с именем пользователя или email
+    USER_SEARCH_SIMILARITY_THRESHOLD: float = Field(0.5, env="USER_SEARCH_SIMILARITY_THRESHOLD")
+    # Статистика из материализованного представления (PostgreSQL) и период его обновления
+    STATS_MATERIALIZED: bool = Field(False, env="STATS_MATERIALIZED")
+    STATS_REFRESH_INTERVAL_SECONDS: float = Field(300.0, env="STATS_REFRESH_INTERVAL_SECONDS")
+    # Общий индекс хоста: один воркер публикует снимки, остальные отображают их в память
+    SEARCH_SHARED_INDEX: bool = Field(False, env="SEARCH_SHARED_INDEX")
+    SEARCH_PUBLISH_INTERVAL_SECONDS: float = Field(10.0, env="SEARCH_PUBLISH_INTERVAL_SECONDS")
+    SEARCH_SNAPSHOT_POLL_SECONDS: float = Field(2.0, env="SEARCH_SNAPSHOT_POLL_SECONDS")
 
     class Config:
         case_sensitive = True
@@ -1,8 +1,10 @@
-from typing import Generator
-from sqlalchemy import create_engine
+from typing import Generator, Any, Sequence
+from sqlalchemy import create_engine, and_, or_, exists, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from .config import settings
+from . import trigram  # noqa: F401  функции pg_trgm для SQLite
 import logging
 from contextlib import contextmanager
 
@@ -47,4 +49,25 @@ def transaction(db):
         db.commit()
     except Exception:
         db.rollback()
-        raise 
\ No newline at end of file
+        raise
+
+def json_array_contains(db: Session, column: Any, values: Sequence[Any]) -> Any:
+    """
+    Условие "JSON-массив column содержит все values".
+    В PostgreSQL - оператор JSONB @>, который использует GIN-индекс колонки;
+    в SQLite (тесты, локальный запуск) - проверка через json_each.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Тип колонки - JSON с вариантом JSONB, сравнение берется от JSONB, чтобы получить @>, а не LIKE
+        return type_coerce(column, JSONB).contains(list(values))
+    return and_(*[_json_array_has(column, value) for value in values])
+
+def json_array_overlaps(db: Session, column: Any, values: Sequence[Any]) -> Any:
+    """Условие "JSON-массив column содержит хотя бы одно из values" (в PostgreSQL - OR из @>)"""
+    if db.get_bind().dialect.name == "postgresql":
+        return or_(*[type_coerce(column, JSONB).contains([value]) for value in values])
+    return or_(*[_json_array_has(column, value) for value in values])
+
+def _json_array_has(column: Any, value: Any) -> Any:
+    elements = func.json_each(column).table_valued("value")
+    return exists(select(1).select_from(elements).where(elements.c.value == value))
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from typing import Iterator
+import threading
+
+
+class ReadWriteLock:
+    """
+    Блокировка с общим чтением и монопольной записью.
+
+    Поиски по индексу только читают его и выполняются параллельно в пуле потоков;
+    добавление и удаление объектов меняют структуры индекса на месте (FAISS add_with_ids,
+    строки матрицы NumPy) и ждут, пока текущие поиски закончатся. Ожидающая запись
+    не пропускает вперед новые чтения, чтобы поток поисков не задерживал ее бесконечно.
+    Блокировка не реентерабельна.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
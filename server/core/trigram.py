@@ -0,0 +1,54 @@
+from typing import Set, List
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import sqlite3
+import re
+
+# Слова, как их выделяет pg_trgm: последовательности букв и цифр
+WORD_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def _words(text: str) -> List[str]:
+    return WORD_PATTERN.findall((text or "").lower())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Триграммы слов текста с дополнением пробелами, как в pg_trgm"""
+    result: Set[str] = set()
+    for word in _words(text):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(left: str, right: str) -> float:
+    """Доля общих триграмм (аналог similarity из pg_trgm)"""
+    left_trigrams, right_trigrams = trigrams(left), trigrams(right)
+    if not left_trigrams or not right_trigrams:
+        return 0.0
+    return len(left_trigrams & right_trigrams) / len(left_trigrams | right_trigrams)
+
+
+def word_similarity(query: str, text: str) -> float:
+    """
+    Наибольшее сходство запроса с фрагментом текста из стольких же слов подряд.
+    Приближение word_similarity из pg_trgm для SQLite: там сравниваются непрерывные
+    фрагменты упорядоченных триграмм, здесь - фрагменты по границам слов.
+    """
+    query_words, text_words = _words(query), _words(text)
+    if not query_words or not text_words:
+        return 0.0
+    width = min(len(query_words), len(text_words))
+    query_text = " ".join(query_words)
+    return max(
+        similarity(query_text, " ".join(text_words[start:start + width]))
+        for start in range(len(text_words) - width + 1)
+    )
+
+
+@event.listens_for(Engine, "connect")
+def register_sqlite_functions(dbapi_connection, connection_record) -> None:
+    """В SQLite (тесты, локальный запуск) функции pg_trgm заменяются реализацией на Python"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("similarity", 2, similarity, deterministic=True)
+        dbapi_connection.create_function("word_similarity", 2, word_similarity, deterministic=True)
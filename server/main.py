@@ -7,14 +7,20 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
-from core.database import init_db
+from core.database import init_db, SessionLocal
 from api import (
     auth_router,
     users_router,
     projects_router,
     matching_router,
-    notifications_router
+    notifications_router,
+    admin_router
 )
+from api.endpoints.health import router as health_router
+from services.warmup import warmup_service
+from services.index_publisher import index_publisher
+from services.inference_executor import inference_executor
+from services.stats_service import stats_service
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -35,6 +41,7 @@ app = FastAPI(
     * `/api/projects` - управление проектами
     * `/api/matching` - сопоставление проектов и участников
     * `/api/notifications` - управление уведомлениями
+    * `/api/admin` - статистика для администраторов
 
     ## Технологии
     * FastAPI
@@ -58,17 +65,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Курсор следующей страницы поиска передается в заголовке
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Инициализация базы данных
 init_db()
 
+@app.on_event("startup")
+def start_warmup() -> None:
+    """Фоновая загрузка модели и снимков поисковых индексов при старте воркера"""
+    if settings.SEARCH_SHARED_INDEX:
+        # Роль выбирается до прогрева: читатели не перестраивают и не сохраняют индексы
+        index_publisher.assign_role()
+    warmup_service.start(SessionLocal)
+    if settings.SEARCH_SHARED_INDEX:
+        index_publisher.start(SessionLocal, lambda: warmup_service.is_ready)
+    if settings.STATS_MATERIALIZED:
+        stats_service.start(SessionLocal)
+
+@app.on_event("shutdown")
+def stop_inference_executor() -> None:
+    """Остановка пула векторизации и поиска и обновления статистики"""
+    inference_executor.shutdown()
+    stats_service.stop()
+
 # Подключаем роутеры
 app.include_router(auth_router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(users_router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
 app.include_router(projects_router, prefix=f"{settings.API_V1_STR}/projects", tags=["projects"])
 app.include_router(matching_router, prefix=f"{settings.API_V1_STR}/matching", tags=["matching"])
 app.include_router(notifications_router, prefix=f"{settings.API_V1_STR}/notifications", tags=["notifications"])
+app.include_router(admin_router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
+app.include_router(health_router, prefix=settings.API_V1_STR, tags=["health"])
 
 @app.get("/", tags=["info"])
 async def root():
@@ -1,10 +1,12 @@
 from .user import User
 from .project import Project
+from .notification import Notification
 from .associations import project_members, project_likes
 
 __all__ = [
     "User",
     "Project",
+    "Notification",
     "project_members",
     "project_likes"
 ]
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from datetime import datetime
+from core.database import Base
+
+class Match(Base):
+    """
+    Предрассчитанная строка top-k подбора: для проекта - подходящие участники,
+    для участника - подходящие проекты. Список источника - строки с одним
+    (source_type, source_id), упорядоченные по rank.
+    """
+    __tablename__ = "matches"
+
+    id = Column(Integer, primary_key=True)
+    source_type = Column(String(16), nullable=False)  # project, user
+    source_id = Column(Integer, nullable=False)
+    target_id = Column(Integer, nullable=False)
+    rank = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    model = Column(String, nullable=False)  # Кодировщик, которым посчитаны оценки
+    source_updated_at = Column(DateTime, nullable=True)  # updated_at источника на момент расчета
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Чтение списка источника одним запросом по индексу
+        Index("ix_matches_source", "source_type", "source_id", "rank"),
+        # Поиск списков, в которые входит измененный объект
+        Index("ix_matches_target", "source_type", "target_id"),
+    )
+
+    def dict(self) -> dict:
+        return {
+            "source_type": self.source_type,
+            "source_id": self.source_id,
+            "target_id": self.target_id,
+            "rank": self.rank,
+            "score": self.score,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None
+        }
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -14,11 +14,16 @@ class Notification(Base):
     type = Column(String)  # info, warning, error, success
     related_id = Column(Integer, nullable=True)
     is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
     read_at = Column(DateTime, nullable=True)
 
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        # Пагинация уведомлений пользователя по ключу (created_at, id)
+        Index("ix_notifications_user_created_at_id", "user_id", "created_at", "id"),
+    )
+
     def dict(self) -> dict:
         return {
             "id": self.id,
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, LargeBinary, Index, func
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import JSONB, REGCONFIG
 from datetime import datetime
 from core.database import Base
 
@@ -10,13 +11,40 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     description = Column(String)
-    required_roles = Column(JSON)  # Список требуемых ролей
-    technologies = Column(JSON)  # Список технологий
+    # В PostgreSQL - JSONB с GIN-индексами: фильтры по спискам выполняются containment-запросом (@>)
+    required_roles = Column(JSON().with_variant(JSONB(), "postgresql"))  # Список требуемых ролей
+    technologies = Column(JSON().with_variant(JSONB(), "postgresql"))  # Список технологий
     team_lead_id = Column(Integer, ForeignKey("users.id", ondelete='CASCADE'))
-    created_at = Column(DateTime, default=datetime.utcnow)
-    status = Column(String, default="active")  # active, completed, on_hold
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Эмбеддинг текста (float32); не загружается вместе с объектом, пока не запрошен явно
+    embedding = deferred(Column(LargeBinary, nullable=True))
+    embedding_model = Column(String, nullable=True)  # Модель, которой посчитан эмбеддинг
+    embedding_hash = Column(String(64), nullable=True)  # Хеш модели и текста эмбеддинга
+    status = Column(String, default="active", index=True)  # active, completed, on_hold
+    # Конфигурация полнотекстового поиска (russian, english), по ней в PostgreSQL генерируется search_vector
+    search_language = Column(String(32).with_variant(REGCONFIG(), "postgresql"), default="english")
     
     # Отношения
     team_lead = relationship("User", back_populates="projects")
     members = relationship("User", secondary="project_members")
-    liked_by = relationship("User", secondary="project_likes", back_populates="liked_projects") 
\ No newline at end of file
+    liked_by = relationship("User", secondary="project_likes", back_populates="liked_projects")
+
+    __table_args__ = (
+        # Пагинация списков по ключу (created_at, id): общий список и проекты пользователя
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        Index("ix_projects_team_lead_created_at_id", "team_lead_id", "created_at", "id"),
+    )
+
+    def dict(self) -> dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "required_roles": self.required_roles or [],
+            "technologies": self.technologies or [],
+            "team_lead_id": self.team_lead_id,
+            "status": self.status,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
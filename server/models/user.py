@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, JSON, DateTime, LargeBinary
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
 from core.database import Base
 
 class User(Base):
@@ -10,11 +12,27 @@ class User(Base):
     username = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     is_active = Column(Boolean, default=True)
-    roles = Column(JSON)  # Список ролей пользователя
-    skills = Column(JSON)  # Список навыков пользователя
+    roles = Column(JSON().with_variant(JSONB(), "postgresql"))  # Список ролей пользователя
+    skills = Column(JSON().with_variant(JSONB(), "postgresql"))  # Список навыков пользователя
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Эмбеддинг текста (float32); не загружается вместе с объектом, пока не запрошен явно
+    embedding = deferred(Column(LargeBinary, nullable=True))
+    embedding_model = Column(String, nullable=True)  # Модель, которой посчитан эмбеддинг
+    embedding_hash = Column(String(64), nullable=True)  # Хеш модели и текста эмбеддинга
     
     # Отношения
     projects = relationship("Project", back_populates="team_lead", cascade="all, delete-orphan")
     member_of = relationship("Project", secondary="project_members")
     liked_projects = relationship("Project", secondary="project_likes", back_populates="liked_by")
-    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
+
+    def dict(self) -> dict:
+        return {
+            "id": self.id,
+            "email": self.email,
+            "username": self.username,
+            "is_active": self.is_active,
+            "roles": self.roles or [],
+            "skills": self.skills or [],
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -0,0 +1,17 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+class CompatibilityBatchRequest(BaseModel):
+    """Схема запроса пакетной оценки совместимости"""
+    project_ids: List[int] = Field(..., min_items=1, max_items=1000)
+    user_ids: List[int] = Field(..., min_items=1, max_items=1000)
+
+class CompatibilityRow(BaseModel):
+    """Оценки совместимости одного проекта со всеми участниками запроса"""
+    project_id: int
+    scores: List[float]
+
+class CompatibilityMatrix(BaseModel):
+    """Матрица совместимости: строки - проекты, столбцы - участники в порядке user_ids"""
+    user_ids: List[int]
+    rows: List[CompatibilityRow]
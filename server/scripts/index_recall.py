@@ -0,0 +1,150 @@
+"""
+Оценка полноты (recall@k) сжатых и приближенных индексов относительно точного поиска.
+
+Запуск из каталога server:
+    python -m scripts.index_recall --source projects --k 10
+    python -m scripts.index_recall --source synthetic --rows 200000 --dimension 384 \\
+        --index-types flat,hnsw --storages float32,float16,int8,pq --json recall.json
+    python -m scripts.index_recall --rows 500000 --backends numpy,faiss --index-types flat \\
+        --storages float32,float16
+
+Запросы - случайные векторы корпуса с небольшим шумом. Для каждой комбинации
+(бэкенд, тип индекса, формат хранения) выводятся recall@k, размер индекса и время поиска.
+Бэкенд numpy поддерживает только точный поиск, поэтому его имеет смысл сравнивать
+с плоским индексом FAISS.
+"""
+from typing import List, Dict, Any, Tuple
+import argparse
+import json
+import time
+import numpy as np
+from services.vector_index import build_vector_index, normalize, BACKEND_FAISS, INDEX_TYPES, STORAGE_TYPES
+
+
+def synthetic_corpus(rows: int, dimension: int, clusters: int = 100, seed: int = 0) -> np.ndarray:
+    """Кластеризованный синтетический корпус, похожий по структуре на эмбеддинги текстов"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype('float32')
+    labels = rng.integers(0, clusters, rows)
+    return centers[labels] + 0.5 * rng.standard_normal((rows, dimension)).astype('float32')
+
+
+def load_corpus(source: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Сохраненные в БД эмбеддинги проектов или профилей текущей модели"""
+    from core.database import SessionLocal
+    from models.project import Project
+    from models.user import User
+    from services.embedding_engine import embedding_engine
+    from services.embedding_store import load_embedding_matrix
+
+    model = Project if source == "projects" else User
+    db = SessionLocal()
+    try:
+        return load_embedding_matrix(db, model, embedding_engine.model_name, embedding_engine.dimension)
+    finally:
+        db.close()
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int, block: int = 1024) -> np.ndarray:
+    """Точные top-k позиций корпуса для каждого запроса (блочное умножение матриц)"""
+    result = np.empty((len(queries), k), dtype='int64')
+    for start in range(0, len(queries), block):
+        scores = queries[start:start + block] @ corpus.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        result[start:start + block] = top
+    return result
+
+
+def evaluate(
+    ids: np.ndarray,
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    index_type: str,
+    storage: str,
+    k: int,
+    backend: str = BACKEND_FAISS
+) -> Dict[str, Any]:
+    """Построение одной конфигурации индекса и замер recall@k"""
+    started = time.perf_counter()
+    index = build_vector_index(
+        corpus.shape[1], ids, corpus, index_type=index_type, storage=storage, backend=backend
+    )
+    build_seconds = time.perf_counter() - started
+
+    latencies: List[float] = []
+    found = 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        hits = index.search(query, k)
+        latencies.append(time.perf_counter() - started)
+        found += len({item_id for item_id, _ in hits} & set(ids[expected].tolist()))
+
+    memory = index.memory_bytes()
+    return {
+        "backend": index.backend,
+        "index_type": index.index_type,
+        "storage": index.storage,
+        "recall_at_k": found / (len(queries) * k),
+        "memory_bytes": memory,
+        "bytes_per_vector": memory / len(ids),
+        "build_seconds": round(build_seconds, 3),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 3),
+        "queries_per_second": round(len(latencies) / sum(latencies), 1)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recall@k сжатых индексов относительно точного поиска")
+    parser.add_argument("--source", choices=("projects", "profiles", "synthetic"), default="synthetic")
+    parser.add_argument("--rows", type=int, default=100000, help="Размер синтетического корпуса")
+    parser.add_argument("--dimension", type=int, default=384, help="Размерность синтетического корпуса")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--noise", type=float, default=0.05, help="Шум, добавляемый к векторам-запросам")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--backends", default=BACKEND_FAISS, help="Бэкенды через запятую: faiss, numpy")
+    parser.add_argument("--index-types", default="flat,hnsw")
+    parser.add_argument("--storages", default=",".join(STORAGE_TYPES))
+    parser.add_argument("--json", dest="json_path", help="Файл для сохранения результатов")
+    args = parser.parse_args()
+
+    if args.source == "synthetic":
+        corpus = synthetic_corpus(args.rows, args.dimension)
+        ids = np.arange(len(corpus), dtype='int64')
+    else:
+        ids, corpus = load_corpus(args.source)
+    if len(corpus) <= args.k:
+        raise SystemExit(f"Слишком маленький корпус: {len(corpus)} векторов")
+    corpus = normalize(corpus)
+
+    rng = np.random.default_rng(1)
+    sample = corpus[rng.choice(len(corpus), min(args.queries, len(corpus)), replace=False)]
+    queries = normalize(sample + args.noise * rng.standard_normal(sample.shape).astype('float32'))
+    truth = exact_top_k(corpus, queries, args.k)
+
+    results = []
+    for backend in args.backends.split(","):
+        for index_type in args.index_types.split(","):
+            if index_type not in INDEX_TYPES:
+                raise SystemExit(f"Неизвестный тип индекса: {index_type}")
+            for storage in args.storages.split(","):
+                result = evaluate(ids, corpus, queries, truth, index_type, storage, args.k, backend)
+                results.append(result)
+                print(
+                    f"{result['backend']:>6} {result['index_type']:>6} {result['storage']:>8}  "
+                    f"recall@{args.k}={result['recall_at_k']:.4f}  "
+                    f"{result['bytes_per_vector']:.1f} Б/вектор  "
+                    f"p50={result['p50_ms']} мс  p95={result['p95_ms']} мс  "
+                    f"{result['queries_per_second']} запросов/с"
+                )
+                if index_type == "ivfpq":
+                    break
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"rows": len(corpus), "dimension": corpus.shape[1], "k": args.k, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
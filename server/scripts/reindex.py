@@ -0,0 +1,282 @@
+"""
+Полная переиндексация проектов или профилей вне процесса веб-сервера.
+
+Запуск из каталога server:
+    python -m scripts.reindex projects --workers 4
+    python -m scripts.reindex profiles --chunk-size 5000 --resume
+
+Строки читаются из БД порциями по возрастанию id. Сохраненные эмбеддинги (колонка
+embedding) используются как есть, остальные тексты сортируются по длине, чтобы
+в одном батче было меньше паддинга, и векторизуются пулом процессов. Каждая порция
+записывается на диск шардом вместе с контрольной точкой, поэтому прерванный запуск
+продолжается с --resume. В конце индекс собирается из шардов и публикуется новым
+снимком: переключение CURRENT атомарно, воркеры подхватывают его при следующем старте.
+"""
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import argparse
+import pickle
+import shutil
+import json
+import time
+import os
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+# Кодировщик в процессе пула загружается один раз инициализатором
+_worker_encoder = None
+
+
+def _init_worker(encoder_kind: str, model_name: str, threads: int) -> None:
+    global _worker_encoder
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    from services.encoders import create_encoder
+    _worker_encoder = create_encoder(encoder_kind, model_name)
+    _worker_encoder.load()
+
+
+def _encode_batch(texts: List[str]) -> np.ndarray:
+    return _worker_encoder.encode(texts)
+
+
+def length_sorted_batches(texts: List[str], batch_size: int) -> List[List[int]]:
+    """Разбиение позиций текстов на батчи близкой длины"""
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+
+class ReindexCheckpoint:
+    """Шарды и контрольная точка прерываемой переиндексации"""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.state: Dict[str, Any] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(CHECKPOINT_FILE), encoding="utf-8") as f:
+                self.state = json.load(f)
+        except FileNotFoundError:
+            return None
+        return self.state
+
+    def start(self, state: Dict[str, Any]) -> None:
+        """Новый запуск: предыдущие шарды удаляются"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory)
+        self.state = dict(state, shards=[], last_id=0, rows=0, encoded=0)
+        self._write_state()
+
+    def _write_state(self) -> None:
+        tmp_path = self._path(f"{CHECKPOINT_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self._path(CHECKPOINT_FILE))
+
+    def add_shard(self, ids: np.ndarray, vectors: np.ndarray, payloads: List[Dict[str, Any]], encoded: int) -> None:
+        """Запись шарда и продвижение контрольной точки (шард пишется до нее)"""
+        name = f"shard-{len(self.state['shards']):05d}.pkl"
+        tmp_path = self._path(f"{name}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"ids": ids, "vectors": vectors, "payloads": payloads}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(name))
+
+        self.state["shards"].append(name)
+        self.state["last_id"] = int(ids[-1])
+        self.state["rows"] += len(ids)
+        self.state["encoded"] += encoded
+        self._write_state()
+
+    def read_shards(self) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        ids, vectors, payloads = [], [], []
+        for name in self.state["shards"]:
+            with open(self._path(name), "rb") as f:
+                shard = pickle.load(f)
+            ids.append(shard["ids"])
+            vectors.append(shard["vectors"])
+            payloads.extend(shard["payloads"])
+        return np.concatenate(ids), np.vstack(vectors), payloads
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class Reindexer:
+    """Потоковая переиндексация одной таблицы с векторизацией в пуле процессов"""
+
+    def __init__(
+        self,
+        target: str,
+        chunk_size: int = 2048,
+        batch_size: int = 64,
+        workers: Optional[int] = None
+    ) -> None:
+        from models.project import Project
+        from models.user import User
+        from services.semantic_search import semantic_search
+        from services.profile_search import profile_search
+
+        self.model, self.search = {
+            "projects": (Project, semantic_search),
+            "profiles": (User, profile_search)
+        }[target]
+        self.encoder_kind = self.search.engine.encoder.kind
+        self.model_name = self.search.engine.model_name
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self.checkpoint = ReindexCheckpoint(os.path.join(self.search.snapshot_store.root, ".reindex"))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Пул создается только если есть что векторизовать"""
+        if self._pool is None:
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.encoder_kind, self.model_name, threads)
+            )
+        return self._pool
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        batches = length_sorted_batches(texts, self.batch_size)
+        results = self._get_pool().map(_encode_batch, [[texts[i] for i in batch] for batch in batches])
+        vectors: Optional[np.ndarray] = None
+        for batch, encoded in zip(batches, results):
+            if vectors is None:
+                vectors = np.empty((len(texts), encoded.shape[1]), dtype='float32')
+            vectors[batch] = encoded
+        return vectors
+
+    def _process_chunk(self, db: Any, rows: List[Any]) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]], int]:
+        from sqlalchemy import update
+        from services.embedding_cache import embedding_key
+        from services.embedding_store import is_embedding_current, pack_embedding, unpack_embeddings
+
+        ids = np.array([row.id for row in rows], dtype='int64')
+        payloads = [row.dict() for row in rows]
+        texts = [self.search._prepare_text(row) for row in rows]
+        current = [is_embedding_current(row, self.model_name, text) for row, text in zip(rows, texts)]
+        fresh = [i for i, ok in enumerate(current) if ok]
+        stale = [i for i, ok in enumerate(current) if not ok]
+
+        encoded = self._encode([texts[i] for i in stale]) if stale else None
+        dimension = encoded.shape[1] if encoded is not None else len(rows[0].embedding) // 4
+        vectors = np.empty((len(rows), dimension), dtype='float32')
+        if fresh:
+            vectors[fresh] = unpack_embeddings([rows[i].embedding for i in fresh], dimension)
+        if stale:
+            vectors[stale] = encoded
+            # Сохраняем новые эмбеддинги, не меняя updated_at: текст строк не изменился
+            db.execute(update(self.model), [
+                {
+                    "id": rows[i].id,
+                    "embedding": pack_embedding(vectors[i]),
+                    "embedding_model": self.model_name,
+                    "embedding_hash": embedding_key(self.model_name, texts[i]),
+                    "updated_at": rows[i].updated_at
+                }
+                for i in stale
+            ])
+            db.commit()
+
+        return ids, vectors, payloads, len(stale)
+
+    def run(self, resume: bool = False) -> Dict[str, Any]:
+        from sqlalchemy.orm import undefer
+        from core.database import SessionLocal
+        from services.index_snapshot import table_fingerprint
+
+        db = SessionLocal()
+        started = time.monotonic()
+        processed = 0
+        try:
+            state = self.checkpoint.load() if resume else None
+            if state is None or state.get("model") != self.model_name or state.get("chunk_size") != self.chunk_size:
+                # Отпечаток берется до чтения строк: изменения во время переиндексации сделают снимок устаревшим
+                self.checkpoint.start({
+                    "model": self.model_name,
+                    "chunk_size": self.chunk_size,
+                    "fingerprint": table_fingerprint(db, self.model)
+                })
+            else:
+                logger.info(f"Продолжение переиндексации с id > {state['last_id']} ({state['rows']} строк готово)")
+
+            while True:
+                rows = (
+                    db.query(self.model)
+                    .options(undefer(self.model.embedding))
+                    .filter(self.model.id > self.checkpoint.state["last_id"])
+                    .order_by(self.model.id)
+                    .limit(self.chunk_size)
+                    .all()
+                )
+                if not rows:
+                    break
+                ids, vectors, payloads, encoded = self._process_chunk(db, rows)
+                self.checkpoint.add_shard(ids, vectors, payloads, encoded)
+                db.expunge_all()
+                processed += len(rows)
+                elapsed = time.monotonic() - started
+                logger.info(
+                    f"Шард {len(self.checkpoint.state['shards'])}: {self.checkpoint.state['rows']} строк, "
+                    f"{processed / elapsed:.1f} строк/с"
+                )
+        finally:
+            db.close()
+            if self._pool is not None:
+                self._pool.shutdown()
+
+        state = self.checkpoint.state
+        if not state["shards"]:
+            logger.info("Нет строк для индексации")
+            self.checkpoint.clear()
+            return {"rows": 0}
+
+        ids, vectors, payloads = self.checkpoint.read_shards()
+        self.search.replace_index(ids, vectors, payloads)
+        version = self.search.save_snapshot(state["fingerprint"])
+        self.checkpoint.clear()
+
+        elapsed = time.monotonic() - started
+        report = {
+            "version": version,
+            "rows": int(len(ids)),
+            "encoded": state["encoded"],
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(processed / elapsed, 1) if elapsed else None
+        }
+        logger.info(f"Переиндексация завершена: {report}")
+        return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Полная переиндексация проектов или профилей")
+    parser.add_argument("target", choices=("projects", "profiles"))
+    parser.add_argument("--chunk-size", type=int, default=2048, help="Строк в одной порции и шарде")
+    parser.add_argument("--batch-size", type=int, default=64, help="Текстов в одном вызове модели")
+    parser.add_argument("--workers", type=int, default=None, help="Процессов векторизации")
+    parser.add_argument("--resume", action="store_true", help="Продолжить с последней контрольной точки")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    report = Reindexer(args.target, args.chunk_size, args.batch_size, args.workers).run(resume=args.resume)
+    print(json.dumps(report, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +0,0 @@
-from .user_service import (
-    get_user_by_email,
-    get_user_by_id,
-    create_user,
-    authenticate_user,
-    update_user,
-    deactivate_user,
-    activate_user
-)
-
-from .auth_service import (
-    create_access_token,
-    create_refresh_token,
-    verify_token,
-    authenticate_and_create_tokens,
-    refresh_access_token
-)
-
-from .project_service import (
-    get_project,
-    get_user_projects,
-    create_project,
-    update_project,
-    delete_project,
-    get_all_projects
-)
-
-__all__ = [
-    # user_service
-    "get_user_by_email",
-    "get_user_by_id",
-    "create_user",
-    "authenticate_user",
-    "update_user",
-    "deactivate_user",
-    "activate_user",
-    
-    # auth_service
-    "create_access_token",
-    "create_refresh_token",
-    "verify_token",
-    "authenticate_and_create_tokens",
-    "refresh_access_token",
-    
-    # project_service
-    "get_project",
-    "get_user_projects",
-    "create_project",
-    "update_project",
-    "delete_project",
-    "get_all_projects"
-] 
\ No newline at end of file
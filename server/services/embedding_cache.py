@@ -0,0 +1,321 @@
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from collections import OrderedDict
+from redis import Redis
+from redis.exceptions import RedisError
+from core.config import settings
+import numpy as np
+import threading
+import hashlib
+import unicodedata
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+def normalize_text(text: str) -> str:
+    """Нормализация текста перед хешированием: схлопывание пробелов и переносов строк"""
+    return " ".join(text.split())
+
+def normalize_query(text: str) -> str:
+    """Нормализация поискового запроса: пробелы и регистр не влияют на ключ"""
+    return normalize_text(unicodedata.normalize("NFKC", text)).casefold()
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Ключ кэша: хеш от имени модели и нормализованного текста"""
+    digest = hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CacheTier:
+    """Базовый уровень кэша эмбеддингов со счетчиками попаданий"""
+    name = "tier"
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        raise NotImplementedError
+
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        raise NotImplementedError
+
+    def bytes_stored(self) -> int:
+        raise NotImplementedError
+
+    def _count(self, values: List[Optional[np.ndarray]]) -> List[Optional[np.ndarray]]:
+        found = sum(1 for value in values if value is not None)
+        self.hits += found
+        self.misses += len(values) - found
+        return values
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "bytes": self.bytes_stored()
+        }
+
+
+class LRUCacheTier(CacheTier):
+    """Внутрипроцессный LRU-кэш"""
+    name = "memory"
+
+    def __init__(self, max_items: int) -> None:
+        super().__init__()
+        self.max_items = max_items
+        self._items: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        values: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for key in keys:
+                value = self._items.get(key)
+                if value is not None:
+                    self._items.move_to_end(key)
+                values.append(value)
+        return self._count(values)
+
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for key, vector in items.items():
+                previous = self._items.pop(key, None)
+                if previous is not None:
+                    self._bytes -= previous.nbytes
+                # Копия, чтобы срез не удерживал в памяти весь массив батча
+                stored = np.array(vector, dtype='float32', copy=True)
+                self._items[key] = stored
+                self._bytes += stored.nbytes
+            while len(self._items) > self.max_items:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def bytes_stored(self) -> int:
+        return self._bytes
+
+
+class RedisCacheTier(CacheTier):
+    """Общий для воркеров кэш в Redis: значения хранятся как сырые байты float32"""
+    name = "redis"
+
+    def __init__(self, redis: Redis, ttl: int, prefix: str = "emb:", retry_after: float = 30.0) -> None:
+        super().__init__()
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+        self.retry_after = retry_after
+        self._bytes_written = 0
+        self._disabled_until = 0.0
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    def _disable(self, e: Exception) -> None:
+        """После ошибки Redis уровень пропускается, чтобы не добавлять задержку к каждому запросу"""
+        logger.warning(f"Кэш эмбеддингов в Redis недоступен: {str(e)}")
+        self._disabled_until = time.monotonic() + self.retry_after
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        if not self._available():
+            return [None] * len(keys)
+        try:
+            raw = self.redis.mget([self.prefix + key for key in keys])
+        except RedisError as e:
+            self._disable(e)
+            return [None] * len(keys)
+        return self._count([
+            np.frombuffer(value, dtype='float32') if value is not None else None
+            for value in raw
+        ])
+
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not self._available():
+            return
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for key, vector in items.items():
+                pipeline.set(self.prefix + key, vector.astype('float32').tobytes(), ex=self.ttl)
+            pipeline.execute()
+            self._bytes_written += sum(vector.nbytes for vector in items.values())
+        except RedisError as e:
+            self._disable(e)
+
+    def bytes_stored(self) -> int:
+        """Объем, записанный этим процессом (без учета истекших ключей)"""
+        return self._bytes_written
+
+
+class DiskCacheTier(CacheTier):
+    """Дисковый кэш для массовой переиндексации: один файл float32 на текст"""
+    name = "disk"
+
+    def __init__(self, directory: str) -> None:
+        super().__init__()
+        self.directory = directory
+        self._bytes_written = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.f32")
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        values: List[Optional[np.ndarray]] = []
+        for key in keys:
+            try:
+                values.append(np.fromfile(self._path(key), dtype='float32'))
+            except (FileNotFoundError, ValueError):
+                values.append(None)
+        return self._count(values)
+
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        for key, vector in items.items():
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            vector.astype('float32').tofile(tmp_path)
+            os.replace(tmp_path, path)
+            self._bytes_written += vector.nbytes
+
+    def bytes_stored(self) -> int:
+        """Объем, записанный этим процессом"""
+        return self._bytes_written
+
+
+class QueryEmbeddingCache:
+    """
+    LRU-кэш эмбеддингов поисковых запросов с TTL.
+
+    Отделен от кэша эмбеддингов документов: массовая индексация не вытесняет популярные
+    запросы, а попадание обходится без хеширования и обращения к Redis. Ключ - имя
+    кодировщика (включает модель и версию схемы признаков) и нормализованный запрос.
+    TTL ограничивает время жизни вектора, если модель заменили без смены имени.
+    """
+
+    def __init__(self, max_items: int, ttl_seconds: float) -> None:
+        self.max_items = max_items
+        self.ttl = ttl_seconds
+        self._items: "OrderedDict[Tuple[str, str], Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, model_name: str, query: str) -> Optional[np.ndarray]:
+        key = (model_name, query)
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] <= now:
+                del self._items[key]
+                self.expired += 1
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, model_name: str, query: str, vector: np.ndarray) -> None:
+        if self.max_items <= 0:
+            return
+        # Вектор только читается поиском, поэтому защищаем его от изменения вместо копирования при каждом get
+        vector = np.array(vector, dtype='float32', copy=True)
+        vector.flags.writeable = False
+        with self._lock:
+            self._items[(model_name, query)] = (time.monotonic() + self.ttl, vector)
+            self._items.move_to_end((model_name, query))
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class EmbeddingCache:
+    """
+    Многоуровневый кэш эмбеддингов.
+    Уровни опрашиваются по порядку, найденное значение поднимается на более быстрые уровни.
+    """
+
+    def __init__(self, tiers: Optional[List[CacheTier]] = None) -> None:
+        self.tiers = tiers or []
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        missing = list(range(len(keys)))
+        for level, tier in enumerate(self.tiers):
+            if not missing:
+                break
+            values = tier.get_many([keys[i] for i in missing])
+            found = {}
+            still_missing = []
+            for i, value in zip(missing, values):
+                if value is None:
+                    still_missing.append(i)
+                else:
+                    results[i] = value
+                    found[keys[i]] = value
+            # Поднимаем найденное на верхние уровни
+            for upper in self.tiers[:level]:
+                if found:
+                    upper.set_many(found)
+            missing = still_missing
+        return results
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        return self.get_many([key])[0]
+
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        for tier in self.tiers:
+            tier.set_many(items)
+
+    def set(self, key: str, vector: np.ndarray) -> None:
+        self.set_many({key: vector})
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика по уровням кэша: попадания, промахи и объем данных"""
+        return {tier.name: tier.stats() for tier in self.tiers}
+
+    @classmethod
+    def from_settings(cls) -> "EmbeddingCache":
+        tiers: List[CacheTier] = [LRUCacheTier(settings.EMBEDDING_CACHE_SIZE)]
+        if settings.EMBEDDING_CACHE_REDIS:
+            tiers.append(RedisCacheTier(
+                Redis(
+                    host=settings.REDIS_HOST,
+                    port=settings.REDIS_PORT,
+                    db=settings.REDIS_DB,
+                    socket_connect_timeout=0.5,
+                    socket_timeout=0.5
+                ),
+                ttl=settings.EMBEDDING_CACHE_TTL_SECONDS
+            ))
+        if settings.EMBEDDING_CACHE_DIR:
+            tiers.append(DiskCacheTier(settings.EMBEDDING_CACHE_DIR))
+        return cls(tiers)
+
+# Создаем глобальный экземпляр кэша
+embedding_cache = EmbeddingCache.from_settings()
+query_embedding_cache = QueryEmbeddingCache(settings.QUERY_CACHE_SIZE, settings.QUERY_CACHE_TTL_SECONDS)
@@ -0,0 +1,183 @@
+from typing import List, Tuple, Dict, Any, Optional
+from concurrent.futures import Future
+from core.config import settings
+from services.embedding_cache import (
+    EmbeddingCache, QueryEmbeddingCache, embedding_cache, query_embedding_cache, embedding_key, normalize_query
+)
+from services.encoders import Encoder, create_encoder
+import numpy as np
+import threading
+import queue
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingEngine:
+    """
+    Общий для процесса сервис векторизации текстов.
+
+    Один кодировщик используется всеми сервисами поиска и сопоставления; его тип
+    задается настройкой EMBEDDING_ENCODER (по умолчанию модель sentence-transformers).
+    Модель загружается при первом обращении или заранее через load().
+    Одиночные запросы из разных потоков собираются в течение короткого окна
+    в один батч и векторизуются одним вызовом model.encode.
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        batch_window_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        cache: Optional[EmbeddingCache] = None,
+        encoder: Optional[Encoder] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None
+    ) -> None:
+        self.encoder = encoder or create_encoder(model_name=model_name)
+        # Имя кодировщика входит в ключи кэша и сохраняется вместе с эмбеддингами
+        self.model_name = self.encoder.name
+        self.batch_window = (batch_window_ms if batch_window_ms is not None
+                             else settings.EMBEDDING_BATCH_WINDOW_MS) / 1000
+        self.max_batch_size = max_batch_size or settings.EMBEDDING_MAX_BATCH_SIZE
+        self.cache = cache if cache is not None else embedding_cache
+        self.query_cache = query_cache if query_cache is not None else query_embedding_cache
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._model_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._batches = 0
+        self._batched_texts = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.encoder.is_loaded
+
+    @property
+    def load_seconds(self) -> Optional[float]:
+        return self.encoder.load_seconds
+
+    def load(self) -> None:
+        """Загрузка модели кодировщика (повторные вызовы ничего не делают)"""
+        self.encoder.load()
+
+    @property
+    def dimension(self) -> int:
+        return self.encoder.dimension
+
+    def _ensure_worker(self) -> None:
+        """Запуск фонового потока, собирающего запросы в батчи"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self) -> List[Tuple[str, Future]]:
+        """Ожидание первого запроса и добор остальных в пределах окна"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            pending = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not pending:
+                continue
+            try:
+                vectors = self._encode_uncached([text for text, _ in pending])
+            except Exception as e:
+                logger.error(f"Ошибка при векторизации батча: {str(e)}")
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            self._batches += 1
+            self._batched_texts += len(pending)
+            for (_, future), vector in zip(pending, vectors):
+                future.set_result(vector)
+
+    def submit(self, text: str) -> "Future[np.ndarray]":
+        """Постановка текста в очередь на векторизацию (сразу завершается при попадании в кэш)"""
+        future: "Future[np.ndarray]" = Future()
+        cached = self.cache.get(embedding_key(self.model_name, text))
+        if cached is not None:
+            future.set_result(cached)
+            return future
+
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return future
+
+    def encode_one(self, text: str) -> np.ndarray:
+        """Векторизация одного текста через общий батч"""
+        return self.submit(text).result()
+
+    def encode_query(self, query: str) -> np.ndarray:
+        """
+        Векторизация поискового запроса. Векторизуется нормализованный текст, поэтому
+        запросы, отличающиеся регистром и пробелами, получают один вектор из кэша запросов.
+        """
+        normalized = normalize_query(query)
+        vector = self.query_cache.get(self.model_name, normalized)
+        if vector is None:
+            vector = self.encode_one(normalized)
+            self.query_cache.set(self.model_name, normalized, vector)
+        return vector
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Векторизация списка текстов: из кэша берутся готовые, остальные одним вызовом модели"""
+        if not texts:
+            return np.zeros((0, self.dimension), dtype='float32')
+
+        keys = [embedding_key(self.model_name, text) for text in texts]
+        cached = self.cache.get_many(keys)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if not missing:
+            return np.vstack(cached)
+
+        encoded = self._encode_uncached([texts[i] for i in missing])
+        vectors = np.empty((len(texts), self.dimension), dtype='float32')
+        for i, vector in enumerate(cached):
+            if vector is not None:
+                vectors[i] = vector
+        vectors[missing] = encoded
+        return vectors
+
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        """Вызов кодировщика и запись результатов в кэш"""
+        with self._model_lock:
+            vectors = self.encoder.encode(texts)
+        self.cache.set_many({
+            embedding_key(self.model_name, text): vector for text, vector in zip(texts, vectors)
+        })
+        return vectors
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика батчинга"""
+        return {
+            "model": self.model_name,
+            "encoder": self.encoder.kind,
+            "model_loaded": self.is_loaded,
+            "model_load_seconds": self.load_seconds,
+            "queue_size": self._queue.qsize(),
+            "batches": self._batches,
+            "batched_texts": self._batched_texts,
+            "avg_batch_size": self._batched_texts / self._batches if self._batches else 0.0,
+            "cache": self.cache.stats(),
+            "query_cache": self.query_cache.stats()
+        }
+
+# Создаем глобальный экземпляр сервиса
+embedding_engine = EmbeddingEngine()
@@ -0,0 +1,104 @@
+from typing import List, Tuple, Dict, Any
+from collections import defaultdict
+from sqlalchemy import inspect, update, bindparam
+from sqlalchemy.orm.attributes import set_committed_value
+from services.embedding_cache import embedding_key
+import numpy as np
+
+# Эмбеддинги хранятся в БД как сырые байты float32 с фиксированным порядком байт
+EMBEDDING_DTYPE = np.dtype('<f4')
+EMBEDDING_COLUMNS = ("embedding", "embedding_model", "embedding_hash")
+
+def pack_embedding(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+def unpack_embeddings(blobs: List[bytes], dimension: int) -> np.ndarray:
+    """Сборка матрицы из сохраненных эмбеддингов одним копированием"""
+    if not blobs:
+        return np.zeros((0, dimension), dtype='float32')
+    matrix = np.frombuffer(b"".join(blobs), dtype=EMBEDDING_DTYPE).reshape(len(blobs), dimension)
+    return matrix.astype('float32', copy=False)
+
+def is_embedding_current(obj: Any, model_name: str, text: str) -> bool:
+    """Сохраненный эмбеддинг посчитан этой моделью по текущему тексту объекта"""
+    return (
+        obj.embedding is not None
+        and obj.embedding_model == model_name
+        and obj.embedding_hash == embedding_key(model_name, text)
+    )
+
+def store_embedding(obj: Any, model_name: str, text: str, vector: np.ndarray) -> None:
+    """Запись эмбеддинга в колонки объекта (сохраняется при следующем commit)"""
+    _store_embeddings([(obj, _embedding_values(model_name, text, vector))])
+
+def _embedding_values(model_name: str, text: str, vector: np.ndarray) -> Dict[str, Any]:
+    return {
+        "embedding": pack_embedding(vector),
+        "embedding_model": model_name,
+        "embedding_hash": embedding_key(model_name, text)
+    }
+
+def _store_embeddings(items: List[Tuple[Any, Dict[str, Any]]]) -> None:
+    """
+    Запись эмбеддингов в объекты.
+    Новые объекты сохраняют их при вставке. Для строк, уже записанных в БД, эмбеддинги
+    пишутся отдельным UPDATE в сессии объекта, а updated_at явно остается прежним:
+    пересчет эмбеддинга не изменение данных, и по updated_at его не должны видеть
+    ни клиенты, ни таблица подбора, ни публикатор индексов.
+    """
+    rows = defaultdict(list)
+    for obj, values in items:
+        state = inspect(obj, raiseerr=False)
+        if state is None or not state.persistent:
+            for field, value in values.items():
+                setattr(obj, field, value)
+            continue
+        # Значения считаются уже сохраненными, поэтому flush объекта их не перезапишет
+        for field, value in values.items():
+            set_committed_value(obj, field, value)
+        rows[(state.session, type(obj))].append(
+            {"_id": obj.id, **{f"_{field}": value for field, value in values.items()}}
+        )
+
+    for (session, model), params in rows.items():
+        table = model.__table__
+        statement = update(table).where(table.c.id == bindparam("_id")).values(
+            {field: bindparam(f"_{field}") for field in EMBEDDING_COLUMNS}
+        )
+        if "updated_at" in table.c:
+            # Явное значение отключает onupdate колонки
+            statement = statement.values(updated_at=table.c.updated_at)
+        session.execute(statement, params)
+
+def collect_embeddings(objects: List[Any], texts: List[str], engine: Any) -> Tuple[np.ndarray, int]:
+    """
+    Матрица эмбеддингов объектов.
+    Актуальные берутся из колонки embedding, остальные векторизуются одним батчем
+    и записываются в объекты. Возвращает матрицу и число заново посчитанных векторов.
+    """
+    current = [is_embedding_current(obj, engine.model_name, text) for obj, text in zip(objects, texts)]
+    stale = [i for i, ok in enumerate(current) if not ok]
+    if not stale:
+        return unpack_embeddings([obj.embedding for obj in objects], engine.dimension), 0
+
+    vectors = np.empty((len(objects), engine.dimension), dtype='float32')
+    fresh = [i for i, ok in enumerate(current) if ok]
+    if fresh:
+        vectors[fresh] = unpack_embeddings([objects[i].embedding for i in fresh], engine.dimension)
+
+    encoded = engine.encode([texts[i] for i in stale])
+    _store_embeddings([
+        (objects[i], _embedding_values(engine.model_name, texts[i], vector))
+        for i, vector in zip(stale, encoded)
+    ])
+    vectors[stale] = encoded
+    return vectors, len(stale)
+
+def load_embedding_matrix(db: Any, model: Any, model_name: str, dimension: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Загрузка id и сохраненных эмбеддингов модели model_name одним запросом"""
+    rows = db.query(model.id, model.embedding).filter(
+        model.embedding_model == model_name,
+        model.embedding.isnot(None)
+    ).order_by(model.id).all()
+    ids = np.array([row[0] for row in rows], dtype='int64')
+    return ids, unpack_embeddings([row[1] for row in rows], dimension)
@@ -0,0 +1,179 @@
+from typing import List, Dict, Any, Optional
+from core.config import settings
+import numpy as np
+import threading
+import zlib
+import time
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+ENCODER_SENTENCE_TRANSFORMERS = "sentence-transformers"
+ENCODER_HASHING = "hashing"
+ENCODER_TYPES = (ENCODER_SENTENCE_TRANSFORMERS, ENCODER_HASHING)
+
+# Версия схемы признаков хеширующего кодировщика: входит в его имя, поэтому при
+# изменении токенизации сохраненные эмбеддинги и снимки индексов считаются устаревшими
+HASHING_SCHEME_VERSION = 1
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class Encoder:
+    """
+    Интерфейс кодировщика текстов в векторы.
+
+    Имя кодировщика (name) однозначно определяет пространство векторов: оно входит
+    в ключи кэша эмбеддингов, сохраняется рядом с эмбеддингом в БД и в метаданных
+    снимков индекса, поэтому векторы разных кодировщиков никогда не смешиваются.
+    """
+    kind = ""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        raise NotImplementedError
+
+    def load(self) -> None:
+        raise NotImplementedError
+
+    @property
+    def dimension(self) -> int:
+        raise NotImplementedError
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class SentenceTransformerEncoder(Encoder):
+    """Модель sentence-transformers; загружается при первом обращении или через load()"""
+    kind = ENCODER_SENTENCE_TRANSFORMERS
+
+    def __init__(self, model_name: str) -> None:
+        super().__init__(model_name)
+        self._model: Optional[Any] = None
+        self._dimension: Optional[int] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> None:
+        """Загрузка модели (повторные вызовы ничего не делают)"""
+        if self._model is not None:
+            return
+        with self._load_lock:
+            if self._model is not None:
+                return
+            try:
+                started = time.monotonic()
+                # Импорт библиотеки тоже тяжелый, поэтому выполняется только здесь
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(self.name)
+                self._dimension = model.get_sentence_embedding_dimension()
+                self._model = model
+                self.load_seconds = time.monotonic() - started
+                logger.info(f"Модель векторизации {self.name} загружена за {self.load_seconds:.2f} с")
+            except Exception as e:
+                logger.error(f"Ошибка при загрузке модели векторизации: {str(e)}")
+                raise
+
+    @property
+    def model(self) -> Any:
+        self.load()
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        self.load()
+        return self._dimension
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts), dtype='float32')
+
+
+class HashingEncoder(Encoder):
+    """
+    Разреженный хеширующий кодировщик без модели.
+
+    Признаки - слова и пары соседних слов в нижнем регистре, которые хешируются
+    (crc32) в один из dimension столбцов со знаком. Вес столбца - сублинейная частота
+    1 + log(tf) попавших в него признаков. IDF не используется: вектор текста не должен
+    зависеть от корпуса, иначе сохраненные эмбеддинги устаревали бы при каждом его
+    изменении. Векторы нормализуются, скалярное произведение равно косинусному сходству.
+    Модель не нужна, поэтому кодировщик готов сразу после создания.
+    """
+    kind = ENCODER_HASHING
+
+    def __init__(self, dimension: Optional[int] = None, max_cached_features: int = 200000) -> None:
+        dimension = dimension or settings.EMBEDDING_HASHING_DIMENSION
+        super().__init__(f"{ENCODER_HASHING}-v{HASHING_SCHEME_VERSION}-{dimension}")
+        self._dimension = dimension
+        self.max_cached_features = max_cached_features
+        # Коды уже встречавшихся признаков: crc32 дороже поиска в словаре
+        self._codes: Dict[str, int] = {}
+        self.load_seconds = 0.0
+
+    @property
+    def is_loaded(self) -> bool:
+        return True
+
+    def load(self) -> None:
+        pass
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def _code(self, token: str) -> int:
+        """Код признака: столбец * 2 + бит знака"""
+        digest = zlib.crc32(token.encode("utf-8"))
+        code = (digest % self._dimension) * 2 + (digest >> 31)
+        if len(self._codes) >= self.max_cached_features:
+            self._codes.clear()
+        self._codes[token] = code
+        return code
+
+    def _tokens(self, text: str) -> List[str]:
+        words = TOKEN_PATTERN.findall(text.lower())
+        return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        # Коды признаков всего батча собираются в один массив, частоты и веса считаются в NumPy
+        lengths, codes = [], []
+        cached = self._codes.get
+        for text in texts:
+            tokens = self._tokens(text)
+            text_codes = [cached(token) for token in tokens]
+            if None in text_codes:
+                text_codes = [
+                    code if code is not None else self._code(token)
+                    for code, token in zip(text_codes, tokens)
+                ]
+            codes.extend(text_codes)
+            lengths.append(len(text_codes))
+
+        rows = np.repeat(np.arange(len(texts), dtype='int64'), lengths)
+        keys = rows * (2 * self._dimension) + np.asarray(codes, dtype='int64')
+        keys, counts = np.unique(keys, return_counts=True)
+        weights = np.where(keys & 1, 1.0, -1.0) * (1.0 + np.log(counts))
+        vectors = np.bincount(keys >> 1, weights=weights, minlength=len(texts) * self._dimension)
+        vectors = vectors.astype('float32').reshape(len(texts), self._dimension)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+def create_encoder(kind: Optional[str] = None, model_name: Optional[str] = None) -> Encoder:
+    """Кодировщик по конфигурации развертывания (по умолчанию модель sentence-transformers)"""
+    kind = kind or settings.EMBEDDING_ENCODER
+    if kind == ENCODER_SENTENCE_TRANSFORMERS:
+        return SentenceTransformerEncoder(model_name or settings.EMBEDDING_MODEL_NAME)
+    if kind == ENCODER_HASHING:
+        return HashingEncoder()
+    raise ValueError(f"Неизвестный кодировщик: {kind}")
@@ -0,0 +1,179 @@
+from typing import List, Dict, Any, Iterable, Sequence
+import numpy as np
+
+
+class FilterIndex:
+    """
+    Колоночные фильтры по объектам поискового индекса.
+
+    Каждому объекту выделяется слот; для каждого значения поля хранится битовая маска
+    слотов (np.uint8, 1 бит на объект). Фильтр запроса - пересечение масок,
+    результат - массив id объектов, по которым затем ищет векторный индекс.
+
+    Поля-множества (set_fields) принимают скаляр или список; фильтр по ним требует
+    наличия всех указанных значений. Логические поля (flag_fields) хранят одну маску.
+    """
+
+    def __init__(self, set_fields: Sequence[str] = (), flag_fields: Sequence[str] = ()) -> None:
+        self.set_fields = tuple(set_fields)
+        self.flag_fields = tuple(flag_fields)
+        self._capacity = 0
+        self._ids = np.zeros(0, dtype='int64')
+        self._live = np.zeros(0, dtype='uint8')
+        self._slots: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._next_slot = 0
+        self._values: Dict[str, Dict[Any, np.ndarray]] = {field: {} for field in self.set_fields}
+        self._flags: Dict[str, np.ndarray] = {field: np.zeros(0, dtype='uint8') for field in self.flag_fields}
+        # Значения полей объекта по слотам, чтобы при обновлении снять старые биты
+        self._row_values: Dict[int, Dict[str, List[Any]]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        rows: Iterable[Dict[str, Any]],
+        set_fields: Sequence[str] = (),
+        flag_fields: Sequence[str] = ()
+    ) -> "FilterIndex":
+        """Построение фильтров по словарям объектов с ключом id"""
+        filter_index = cls(set_fields, flag_fields)
+        for row in rows:
+            filter_index.upsert(row["id"], row)
+        return filter_index
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @staticmethod
+    def _as_values(value: Any) -> List[Any]:
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple, set)):
+            return list(value)
+        return [value]
+
+    def _grow(self, slots: int) -> None:
+        """Увеличение емкости масок с запасом, чтобы не копировать их на каждой вставке"""
+        capacity = max(8, self._capacity)
+        while capacity < slots:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+        extra_bytes = capacity // 8 - self._capacity // 8
+
+        def extend(bits: np.ndarray) -> np.ndarray:
+            return np.concatenate([bits, np.zeros(extra_bytes, dtype='uint8')])
+
+        self._ids = np.concatenate([self._ids, np.zeros(capacity - self._capacity, dtype='int64')])
+        self._live = extend(self._live)
+        for values in self._values.values():
+            for value in list(values):
+                values[value] = extend(values[value])
+        for field in self._flags:
+            self._flags[field] = extend(self._flags[field])
+        self._capacity = capacity
+
+    def _new_bits(self) -> np.ndarray:
+        return np.zeros(self._capacity // 8, dtype='uint8')
+
+    @staticmethod
+    def _set_bit(bits: np.ndarray, slot: int, on: bool) -> None:
+        if on:
+            bits[slot >> 3] |= np.uint8(1 << (slot & 7))
+        else:
+            bits[slot >> 3] &= np.uint8(~(1 << (slot & 7)) & 0xFF)
+
+    def _clear_slot(self, slot: int) -> None:
+        for field, values in self._row_values.pop(slot, {}).items():
+            for value in values:
+                bits = self._values[field].get(value)
+                if bits is not None:
+                    self._set_bit(bits, slot, False)
+        for bits in self._flags.values():
+            self._set_bit(bits, slot, False)
+
+    def upsert(self, item_id: int, row: Dict[str, Any]) -> None:
+        """Добавление или обновление значений фильтров объекта"""
+        slot = self._slots.get(item_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = self._next_slot
+                self._next_slot += 1
+                self._grow(self._next_slot)
+            self._slots[item_id] = slot
+            self._ids[slot] = item_id
+            self._set_bit(self._live, slot, True)
+        else:
+            self._clear_slot(slot)
+
+        row_values: Dict[str, List[Any]] = {}
+        for field in self.set_fields:
+            values = self._as_values(row.get(field))
+            for value in values:
+                bits = self._values[field].get(value)
+                if bits is None:
+                    bits = self._values[field][value] = self._new_bits()
+                self._set_bit(bits, slot, True)
+            row_values[field] = values
+        self._row_values[slot] = row_values
+        for field in self.flag_fields:
+            self._set_bit(self._flags[field], slot, bool(row.get(field)))
+
+    def remove(self, item_id: int) -> None:
+        """Удаление объекта из фильтров; слот переиспользуется следующей вставкой"""
+        slot = self._slots.pop(item_id, None)
+        if slot is None:
+            return
+        self._clear_slot(slot)
+        self._set_bit(self._live, slot, False)
+        self._free.append(slot)
+
+    def mask(self, **filters: Any) -> np.ndarray:
+        """Битовая маска слотов, удовлетворяющих всем фильтрам (None - фильтр не задан)"""
+        bits = self._live.copy()
+        for field, value in filters.items():
+            if value is None:
+                continue
+            if field in self._flags:
+                flag = self._flags[field]
+                bits &= flag if value else ~flag
+            elif field in self._values:
+                for item in self._as_values(value):
+                    value_bits = self._values[field].get(item)
+                    if value_bits is None:
+                        return np.zeros_like(bits)
+                    bits &= value_bits
+            else:
+                raise ValueError(f"Неизвестное поле фильтра: {field}")
+        return bits
+
+    def any_mask(self, field: str, values: Any) -> np.ndarray:
+        """Битовая маска слотов, у которых поле-множество содержит хотя бы одно из значений"""
+        if field not in self._values:
+            raise ValueError(f"Неизвестное поле фильтра: {field}")
+        bits = np.zeros_like(self._live)
+        for item in self._as_values(values):
+            value_bits = self._values[field].get(item)
+            if value_bits is not None:
+                bits |= value_bits
+        return bits & self._live
+
+    def ids_for_mask(self, bits: np.ndarray) -> np.ndarray:
+        """id объектов по битовой маске слотов"""
+        selected = np.unpackbits(bits, bitorder='little').astype(bool)
+        return self._ids[selected[:self._capacity]]
+
+    def matching_ids(self, **filters: Any) -> np.ndarray:
+        """id объектов, удовлетворяющих всем фильтрам"""
+        return self.ids_for_mask(self.mask(**filters))
+
+    def stats(self) -> Dict[str, Any]:
+        """Число объектов, значений полей и объем масок в байтах"""
+        masks = sum(len(values) for values in self._values.values()) + len(self._flags) + 1
+        return {
+            "rows": len(self),
+            "values": {field: len(values) for field, values in self._values.items()},
+            "bytes": masks * (self._capacity // 8) + self._ids.nbytes
+        }
@@ -0,0 +1,89 @@
+from typing import List, Tuple, Optional, Sequence
+from sqlalchemy import func, literal, literal_column
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.orm import Session, Query
+from core.config import settings
+from core.database import json_array_overlaps
+from models.project import Project
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+LANGUAGE_RUSSIAN = "russian"
+LANGUAGE_ENGLISH = "english"
+
+CYRILLIC_PATTERN = re.compile(r"[а-яё]", re.IGNORECASE)
+
+# Генерируемая колонка из миграции f2a8d5c1e7b4; в модели ее нет, потому что в SQLite такого типа нет
+SEARCH_VECTOR = literal_column("projects.search_vector", TSVECTOR)
+
+
+def detect_language(text: str) -> str:
+    """
+    Конфигурация полнотекстового поиска для текста проекта.
+    Текст с кириллицей индексируется конфигурацией russian: латинские слова в ней
+    стеммируются английским стеммером, поэтому смешанные описания тоже находятся.
+    """
+    return LANGUAGE_RUSSIAN if CYRILLIC_PATTERN.search(text or "") else LANGUAGE_ENGLISH
+
+
+def set_search_language(project: Project) -> None:
+    """Конфигурация строки для колонки search_vector; вызывается перед сохранением проекта"""
+    project.search_language = detect_language(f"{project.title or ''} {project.description or ''}")
+
+
+def fulltext_enabled(db: Session) -> bool:
+    """
+    Лексическая часть гибридного поиска выполняется в PostgreSQL, а не в памяти воркера.
+    Без PostgreSQL (например, на SQLite) всегда используется BM25 в памяти.
+    """
+    if settings.SEARCH_LEXICAL_BACKEND == "memory":
+        return False
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def build_fulltext_query(
+    db: Session,
+    query: str,
+    limit: int,
+    status: Optional[str] = None,
+    skills: Optional[Sequence[str]] = None
+) -> Query:
+    """
+    Запрос (id, ts_rank_cd) по GIN-индексу search_vector.
+    Язык запроса заранее не известен, поэтому он разбирается обеими конфигурациями,
+    и строка подходит, если совпала хотя бы одна из форм.
+    """
+    tsquery = func.websearch_to_tsquery(literal(LANGUAGE_RUSSIAN, REGCONFIG), query).op("||")(
+        func.websearch_to_tsquery(literal(LANGUAGE_ENGLISH, REGCONFIG), query)
+    )
+    # Веса: название (A) > технологии (B) > описание (C)
+    rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery)
+    fulltext = db.query(Project.id, rank.label("rank")).filter(SEARCH_VECTOR.op("@@")(tsquery))
+    if status:
+        fulltext = fulltext.filter(Project.status == status)
+    if skills:
+        fulltext = fulltext.filter(json_array_overlaps(db, Project.technologies, skills))
+    return fulltext.order_by(rank.desc(), Project.id).limit(limit)
+
+
+def fulltext_ranking(
+    db: Session,
+    query: str,
+    top_k: int = 10,
+    status: Optional[str] = None,
+    skills: Optional[Sequence[str]] = None
+) -> List[Tuple[int, float]]:
+    """
+    Ранжированный список (id, оценка) для слияния с векторными кандидатами.
+    Кандидатов столько же, сколько берет векторная часть: не меньше top_k, чтобы глубокие
+    страницы не обрезались на SEARCH_HYBRID_CANDIDATES.
+    """
+    try:
+        candidates = max(top_k, settings.SEARCH_HYBRID_CANDIDATES)
+        rows = build_fulltext_query(db, query, candidates, status, skills).all()
+        return [(row.id, float(row.rank)) for row in rows]
+    except Exception as e:
+        logger.error(f"Ошибка при полнотекстовом поиске проектов: {str(e)}")
+        raise
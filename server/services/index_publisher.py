@@ -0,0 +1,204 @@
+from typing import List, Dict, Any, Optional, Callable
+from datetime import datetime
+from sqlalchemy.orm import Session, undefer
+from core.config import settings
+from services.index_snapshot import table_fingerprint, is_snapshot_stale
+import threading
+import time
+import os
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: общий индекс недоступен, каждый воркер работает как раньше
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ROLE_PUBLISHER = "publisher"
+ROLE_READER = "reader"
+LOCK_FILE = ".publisher.lock"
+
+
+class IndexPublisher:
+    """
+    Общие для всех воркеров хоста поисковые индексы.
+
+    Снимки индексов уже лежат на диске версиями и отображаются через mmap без копирования
+    (FaissVectorIndex.read с IO_FLAG_MMAP_IFC), поэтому страницы матриц в page cache
+    общие для всех процессов, отобразивших один снимок.
+    Публикатор - воркер, захвативший файловую блокировку в SEARCH_INDEX_DIR (одна на хост).
+    Он раз в SEARCH_PUBLISH_INTERVAL_SECONDS догоняет изменения таблиц по updated_at
+    и сохраняет новую версию снимка; CURRENT переключается атомарно. Остальные
+    воркеры - читатели: они не меняют индексы сами (иначе индекс копируется из mmap
+    в память процесса), а раз в SEARCH_SNAPSHOT_POLL_SECONDS проверяют CURRENT и
+    подменяют индекс более новой версией. Блокировка снимается ядром при завершении
+    процесса, после чего роль публикатора забирает следующий воркер.
+    """
+
+    def __init__(
+        self,
+        searches: Optional[List[Any]] = None,
+        lock_dir: Optional[str] = None,
+        publish_interval: Optional[float] = None,
+        poll_interval: Optional[float] = None
+    ) -> None:
+        self._searches = searches
+        self.lock_path = os.path.join(lock_dir or settings.SEARCH_INDEX_DIR, LOCK_FILE)
+        self.publish_interval = publish_interval or settings.SEARCH_PUBLISH_INTERVAL_SECONDS
+        self.poll_interval = poll_interval or settings.SEARCH_SNAPSHOT_POLL_SECONDS
+        self.role: Optional[str] = None
+        self._lock_file: Optional[Any] = None
+        self._thread: Optional[threading.Thread] = None
+        self._published = 0
+        self._swapped = 0
+        self._last_published_at: Optional[float] = None
+
+    @property
+    def searches(self) -> List[Any]:
+        if self._searches is None:
+            from services.semantic_search import semantic_search
+            from services.profile_search import profile_search
+            self._searches = [semantic_search, profile_search]
+        return self._searches
+
+    def try_acquire(self) -> bool:
+        """Попытка стать публикатором хоста (неблокирующая файловая блокировка)"""
+        if self._lock_file is not None:
+            return True
+        if fcntl is None:
+            return False
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        lock_file = open(self.lock_path, "a+")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._lock_file = lock_file
+        return True
+
+    def assign_role(self) -> str:
+        """Выбор роли воркера; вызывается до прогрева, чтобы читатели не перестраивали индексы"""
+        self.role = ROLE_PUBLISHER if self.try_acquire() else ROLE_READER
+        for search in self.searches:
+            search.shared_reader = self.role == ROLE_READER
+        logger.info(f"Воркер {os.getpid()} использует общий индекс хоста в роли {self.role}")
+        return self.role
+
+    def promote(self) -> bool:
+        """
+        Переход читателя в роль публикатора, если блокировку освободил завершившийся
+        публикатор. Вызывается на каждом цикле читателя.
+        """
+        if self.role == ROLE_PUBLISHER or not self.try_acquire():
+            return False
+        self.role = ROLE_PUBLISHER
+        for search in self.searches:
+            search.shared_reader = False
+        logger.info(f"Воркер {os.getpid()} стал публикатором общего индекса хоста")
+        return True
+
+    def catch_up(self, db: Session, search: Any) -> Optional[str]:
+        """
+        Применение к индексу изменений таблицы после последнего снимка и публикация
+        новой версии. Возвращает версию или None, если изменений нет.
+        """
+        model = search.model
+        fingerprint = table_fingerprint(db, model)
+        if not is_snapshot_stale(search.snapshot_meta, fingerprint):
+            return None
+
+        query = db.query(model).options(undefer(model.embedding))
+        since = search.snapshot_meta.get("max_updated_at")
+        if since:
+            # >=: строки с тем же updated_at, что и в снимке, могли быть записаны после него
+            query = query.filter(model.updated_at >= datetime.fromisoformat(since))
+        changed = 0
+        for row in query.yield_per(1000):
+            search.upsert(row)
+            changed += 1
+        # Эмбеддинги строк, записанных без них, сохраняем, чтобы не векторизовать снова;
+        # updated_at они не меняют, поэтому строки не попадут в следующую выборку изменений
+        db.commit()
+
+        existing = {row_id for row_id, in db.query(model.id)}
+        removed = [item_id for item_id in search.indexed_ids() if item_id not in existing]
+        for item_id in removed:
+            search.remove(item_id)
+
+        version = search.save_snapshot(fingerprint)
+        self._published += 1
+        self._last_published_at = time.time()
+        logger.info(
+            f"Опубликован снимок {search.snapshot_store.name} {version}: "
+            f"изменено {changed}, удалено {len(removed)}"
+        )
+        return version
+
+    def refresh(self, search: Any) -> bool:
+        """Подмена индекса читателя более новой опубликованной версией"""
+        version = search.snapshot_store.current_version()
+        if version is None or (search.snapshot_version is not None and version <= search.snapshot_version):
+            return False
+        if not search.load_snapshot():
+            return False
+        self._swapped += 1
+        return True
+
+    def run_once(self, session_factory: Callable[[], Session]) -> None:
+        """Один цикл: публикация у публикатора или проверка новых версий у читателя"""
+        promoted = self.promote()
+        for search in self.searches:
+            try:
+                if promoted:
+                    # Изменения догоняем от последней версии, опубликованной прежним публикатором
+                    self.refresh(search)
+                if self.role == ROLE_PUBLISHER:
+                    db = session_factory()
+                    try:
+                        self.catch_up(db, search)
+                    except Exception:
+                        db.rollback()
+                        raise
+                    finally:
+                        db.close()
+                else:
+                    self.refresh(search)
+            except Exception as e:
+                logger.error(f"Ошибка синхронизации общего индекса {search.snapshot_store.name}: {str(e)}")
+
+    def _run(self, session_factory: Callable[[], Session], is_ready: Callable[[], bool]) -> None:
+        while True:
+            time.sleep(self.publish_interval if self.role == ROLE_PUBLISHER else self.poll_interval)
+            # До окончания прогрева индексы загружает и сохраняет warm_start
+            if is_ready():
+                self.run_once(session_factory)
+
+    def start(self, session_factory: Callable[[], Session], is_ready: Callable[[], bool] = lambda: True) -> None:
+        """Выбор роли и запуск фонового потока синхронизации"""
+        if self._thread is not None:
+            return
+        if self.role is None:
+            self.assign_role()
+        self._thread = threading.Thread(
+            target=self._run, args=(session_factory, is_ready), name="index-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def stats(self) -> Dict[str, Any]:
+        """Роль воркера и версии индексов"""
+        return {
+            "role": self.role,
+            "published": self._published,
+            "swapped": self._swapped,
+            "last_published_at": self._last_published_at,
+            "versions": {search.snapshot_store.name: search.snapshot_version for search in self.searches}
+        }
+
+# Создаем глобальный экземпляр сервиса
+index_publisher = IndexPublisher()
@@ -0,0 +1,150 @@
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from core.config import settings
+from services.vector_index import VectorIndex, read_vector_index
+from services.encoders import ENCODER_SENTENCE_TRANSFORMERS
+import pickle
+import shutil
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+IDMAP_FILE = "idmap.pkl"
+CURRENT_FILE = "CURRENT"
+
+
+@dataclass
+class IndexSnapshot:
+    """Загруженный с диска снимок индекса"""
+    version: str
+    index: VectorIndex
+    ids: List[int]
+    payloads: List[Dict[str, Any]]
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class IndexSnapshotStore:
+    """
+    Хранилище версионированных снимков векторного индекса.
+
+    Каждый снимок лежит в отдельной директории `<base_dir>/<name>/<version>`
+    и состоит из файлов индекса (их записывает бэкенд) и sidecar-файла с картой id
+    и метаданными. Состояние индекса для его чтения берется из meta["vector_index"].
+    Актуальная версия указывается в файле CURRENT, который заменяется атомарно,
+    поэтому читатели никогда не видят недописанный снимок.
+    """
+
+    def __init__(self, name: str, base_dir: Optional[str] = None, keep: Optional[int] = None) -> None:
+        self.name = name
+        self.root = os.path.join(base_dir or settings.SEARCH_INDEX_DIR, name)
+        self.keep = keep if keep is not None else settings.SEARCH_INDEX_KEEP_SNAPSHOTS
+
+    def _version_dir(self, version: str) -> str:
+        return os.path.join(self.root, version)
+
+    def current_version(self) -> Optional[str]:
+        """Версия актуального снимка или None, если снимков нет"""
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE), encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def save(
+        self,
+        index: VectorIndex,
+        ids: List[int],
+        payloads: List[Dict[str, Any]],
+        meta: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Сохранение нового снимка и переключение CURRENT на него"""
+        version = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+        tmp_dir = self._version_dir(f".{version}.tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        try:
+            index.write(tmp_dir)
+            with open(os.path.join(tmp_dir, IDMAP_FILE), "wb") as f:
+                pickle.dump(
+                    {"ids": list(ids), "payloads": list(payloads), "meta": dict(meta or {})},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_dir, self._version_dir(version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        current_tmp = os.path.join(self.root, f".{CURRENT_FILE}.tmp")
+        with open(current_tmp, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(current_tmp, os.path.join(self.root, CURRENT_FILE))
+
+        self._prune(version)
+        logger.info(f"Снимок индекса {self.name} сохранен: версия {version}, {len(ids)} записей")
+        return version
+
+    def load(self, mmap: bool = True) -> Optional[IndexSnapshot]:
+        """Загрузка актуального снимка (по умолчанию индекс отображается в память)"""
+        version = self.current_version()
+        if version is None:
+            return None
+
+        version_dir = self._version_dir(version)
+        try:
+            with open(os.path.join(version_dir, IDMAP_FILE), "rb") as f:
+                sidecar = pickle.load(f)
+            index = read_vector_index(version_dir, sidecar.get("meta", {}).get("vector_index", {}), mmap)
+        except (OSError, RuntimeError, ValueError, pickle.UnpicklingError) as e:
+            logger.warning(f"Не удалось загрузить снимок индекса {self.name} ({version}): {str(e)}")
+            return None
+
+        return IndexSnapshot(
+            version=version,
+            index=index,
+            ids=sidecar["ids"],
+            payloads=sidecar["payloads"],
+            meta=sidecar.get("meta", {})
+        )
+
+    def _prune(self, current: str) -> None:
+        """Удаление старых снимков сверх лимита хранения"""
+        if self.keep <= 0:
+            return
+        versions = sorted(
+            entry for entry in os.listdir(self.root)
+            if not entry.startswith(".") and entry != CURRENT_FILE
+            and os.path.isdir(self._version_dir(entry))
+        )
+        for version in versions[:-self.keep]:
+            if version != current:
+                shutil.rmtree(self._version_dir(version), ignore_errors=True)
+
+
+def table_fingerprint(db: Session, model: Any) -> Dict[str, Any]:
+    """Отпечаток таблицы: количество строк и время последнего изменения"""
+    row_count, max_updated_at = db.query(func.count(model.id), func.max(model.updated_at)).one()
+    return {
+        "row_count": int(row_count or 0),
+        "max_updated_at": max_updated_at.isoformat() if max_updated_at else None
+    }
+
+
+def is_snapshot_stale(meta: Dict[str, Any], fingerprint: Dict[str, Any]) -> bool:
+    """Снимок устарел, если отпечаток таблицы изменился с момента его записи"""
+    return (
+        meta.get("row_count") != fingerprint["row_count"]
+        or meta.get("max_updated_at") != fingerprint["max_updated_at"]
+    )
+
+
+def is_snapshot_compatible(meta: Dict[str, Any], engine: Any) -> bool:
+    """Снимок построен тем же кодировщиком (старые снимки без поля encoder - sentence-transformers)"""
+    return (
+        meta.get("encoder", ENCODER_SENTENCE_TRANSFORMERS) == engine.encoder.kind
+        and meta.get("model") == engine.model_name
+    )
@@ -0,0 +1,130 @@
+from typing import Any, Callable, Dict, Optional, TypeVar
+from concurrent.futures import Future, ThreadPoolExecutor
+from fastapi import HTTPException, status
+from core.config import settings
+import asyncio
+import functools
+import threading
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class InferenceExecutor:
+    """
+    Ограниченный пул потоков для векторизации и поиска по индексам.
+
+    Маршруты FastAPI объявлены как async def, и синхронный вызов model.encode или
+    поиска по индексу остановил бы цикл событий воркера вместе со всеми остальными
+    запросами. Эти вызовы выполняются в отдельном пуле из INFERENCE_WORKERS потоков
+    (NumPy, FAISS и torch отпускают GIL), а корутина только ждет результат.
+    Очередь ограничена INFERENCE_MAX_QUEUE задачами: при переполнении запрос сразу
+    получает 503, а не ждет неограниченно, накапливая память и задержку.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: Optional[int] = None) -> None:
+        self.workers = workers or settings.INFERENCE_WORKERS or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue if max_queue is not None else settings.INFERENCE_MAX_QUEUE
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._max_queue_depth = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Пул создается при первой задаче, чтобы импорт модуля не запускал потоки"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        return self._executor
+
+    def _call(self, func: Callable[..., T], submitted: float) -> T:
+        started = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_seconds += started - submitted
+        try:
+            result = func()
+        except Exception:
+            with self._lock:
+                self._running -= 1
+                self._failed += 1
+                self._run_seconds += time.monotonic() - started
+            raise
+        with self._lock:
+            self._running -= 1
+            self._completed += 1
+            self._run_seconds += time.monotonic() - started
+        return result
+
+    def _release_cancelled(self, future: Future) -> None:
+        """Задача, отмененная до запуска (клиент отключился, истек таймаут), освобождает место в очереди"""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Выполнение синхронной функции в пуле без блокировки цикла событий"""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                rejected = True
+            else:
+                rejected = False
+                self._queued += 1
+                self._max_queue_depth = max(self._max_queue_depth, self._queued)
+        if rejected:
+            logger.warning(f"Очередь векторизации и поиска переполнена ({self.max_queue} задач)")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервис подбора перегружен, повторите запрос позже",
+                headers={"Retry-After": "1"}
+            )
+
+        call = functools.partial(func, *args, **kwargs)
+        try:
+            future = self._get_executor().submit(self._call, call, time.monotonic())
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            raise
+        # Отмена ожидающей корутины отменяет и future; _call тогда не выполнится и место не вернет
+        future.add_done_callback(self._release_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Глубина очереди, занятые потоки и средние времена ожидания и выполнения"""
+        with self._lock:
+            finished = self._completed + self._failed
+            started = finished + self._running
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_ms": self._wait_seconds / started * 1000 if started else 0.0,
+                "avg_run_ms": self._run_seconds / finished * 1000 if finished else 0.0
+            }
+
+# Создаем глобальный экземпляр сервиса
+inference_executor = InferenceExecutor()
@@ -0,0 +1,173 @@
+from typing import List, Tuple, Dict, Optional, Sequence, Iterable
+from collections import Counter
+from array import array
+import numpy as np
+import math
+import re
+
+# Слова, а также имена технологий с точками и плюсами внутри или на конце: node.js, c++, c#
+TOKEN_PATTERN = re.compile(r"\w+(?:[.+#-]+\w+)*[+#]*", re.UNICODE)
+
+# Ограничение частоты термина в документе: частоты хранятся как uint16
+MAX_TERM_FREQUENCY = 65535
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Tuple[int, float]]], k: int = 60) -> List[Tuple[int, float]]:
+    """
+    Слияние ранжированных списков (id, оценка) методом RRF: оценка объекта -
+    сумма 1 / (k + ранг) по спискам, в которые он попал. Оценки исходных списков
+    не используются, поэтому их шкалы не нужно согласовывать.
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (item_id, _) in enumerate(ranking, start=1):
+            fused[item_id] = fused.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class LexicalIndex:
+    """
+    Инвертированный индекс с ранжированием BM25.
+
+    Постинги термина - компактные массивы номеров документов (uint32) и частот (uint16),
+    пополняемые только в конец. Обновленный документ получает новый номер, старый
+    помечается удаленным и не участвует в поиске; когда удаленных становится много,
+    индекс уплотняется. Поиск суммирует вклады терминов запроса векторно по постингам.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, compact_ratio: float = 0.25) -> None:
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+        self._terms: Dict[str, int] = {}
+        self._postings: List[array] = []
+        self._frequencies: List[array] = []
+        self._ids = array('q')
+        self._lengths = array('I')
+        self._live = array('B')
+        self._slots: Dict[int, int] = {}
+        self._total_length = 0
+        self._deleted = 0
+        # Знаменатель BM25 по документам; сбрасывается при изменении индекса
+        self._norms: Optional[np.ndarray] = None
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[int, str]], k1: float = 1.2, b: float = 0.75) -> "LexicalIndex":
+        """Построение индекса по парам (id, текст)"""
+        lexical_index = cls(k1, b)
+        for item_id, text in documents:
+            lexical_index.upsert(item_id, text)
+        return lexical_index
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def upsert(self, item_id: int, text: str) -> None:
+        """Добавление или замена документа"""
+        self._discard(item_id)
+        counts = Counter(tokenize(text))
+        slot = len(self._ids)
+        length = sum(counts.values())
+        self._ids.append(item_id)
+        self._lengths.append(length)
+        self._live.append(1)
+        self._slots[item_id] = slot
+        self._total_length += length
+        for term, frequency in counts.items():
+            term_id = self._terms.get(term)
+            if term_id is None:
+                term_id = self._terms[term] = len(self._postings)
+                self._postings.append(array('I'))
+                self._frequencies.append(array('H'))
+            self._postings[term_id].append(slot)
+            self._frequencies[term_id].append(min(frequency, MAX_TERM_FREQUENCY))
+        self._norms = None
+
+    def remove(self, item_id: int) -> None:
+        """Удаление документа"""
+        self._discard(item_id)
+        self._norms = None
+
+    def _discard(self, item_id: int) -> None:
+        slot = self._slots.pop(item_id, None)
+        if slot is None:
+            return
+        self._live[slot] = 0
+        self._total_length -= self._lengths[slot]
+        self._deleted += 1
+        if self._deleted > max(1024, self.compact_ratio * len(self._ids)):
+            self.compact()
+
+    def compact(self) -> None:
+        """Удаление помеченных документов из постингов и перенумерация оставшихся"""
+        live = np.frombuffer(self._live, dtype='uint8').astype(bool)
+        new_slots = np.cumsum(live, dtype='int64') - 1
+        for term_id, postings in enumerate(self._postings):
+            slots = np.frombuffer(postings, dtype='uint32')
+            keep = live[slots]
+            frequencies = np.frombuffer(self._frequencies[term_id], dtype='uint16')[keep]
+            self._postings[term_id] = array('I', new_slots[slots[keep]].astype('uint32').tobytes())
+            self._frequencies[term_id] = array('H', frequencies.tobytes())
+
+        ids = np.frombuffer(self._ids, dtype='int64')[live]
+        self._ids = array('q', ids.tobytes())
+        self._lengths = array('I', np.frombuffer(self._lengths, dtype='uint32')[live].tobytes())
+        self._live = array('B', bytes([1]) * len(ids))
+        self._slots = {item_id: slot for slot, item_id in enumerate(ids.tolist())}
+        self._deleted = 0
+        self._norms = None
+
+    def _get_norms(self) -> np.ndarray:
+        if self._norms is None:
+            lengths = np.frombuffer(self._lengths, dtype='uint32').astype('float32')
+            average = self._total_length / len(self._slots) if self._slots else 1.0
+            self._norms = self.k1 * (1 - self.b + self.b * lengths / max(average, 1.0))
+        return self._norms
+
+    def search(self, query: str, top_k: int, allowed_ids: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """top_k документов по BM25; allowed_ids ограничивает поиск подмножеством документов"""
+        if not self._slots or top_k <= 0:
+            return []
+        term_ids = [self._terms[term] for term in set(tokenize(query)) if term in self._terms]
+        if not term_ids:
+            return []
+
+        norms = self._get_norms()
+        live = np.frombuffer(self._live, dtype='uint8') if self._deleted else None
+        documents = len(self._slots)
+        scores = np.zeros(len(self._ids), dtype='float32')
+        for term_id in term_ids:
+            slots = np.frombuffer(self._postings[term_id], dtype='uint32')
+            frequencies = np.frombuffer(self._frequencies[term_id], dtype='uint16').astype('float32')
+            # Удаленные документы остаются в постингах до уплотнения, но не входят в df
+            frequency = len(slots) if live is None else int(np.count_nonzero(live[slots]))
+            idf = math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+            # В одном постинге документ встречается один раз, поэтому сложение без np.add.at
+            scores[slots] += idf * frequencies * (self.k1 + 1) / (frequencies + norms[slots])
+
+        if live is not None:
+            scores *= live
+        candidates = np.flatnonzero(scores)
+        if allowed_ids is not None:
+            # Проверяются только документы с ненулевой оценкой, а не весь фильтр
+            ids = np.frombuffer(self._ids, dtype='int64')
+            candidates = candidates[np.isin(ids[candidates], allowed_ids)]
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(self._ids[slot]), float(scores[slot])) for slot in candidates]
+
+    def stats(self) -> Dict[str, int]:
+        """Число документов, терминов, постингов и их объем в байтах"""
+        postings = sum(len(slots) for slots in self._postings)
+        return {
+            "documents": len(self),
+            "deleted": self._deleted,
+            "terms": len(self._terms),
+            "postings": postings,
+            "bytes": postings * 6 + len(self._ids) * 13
+        }
@@ -0,0 +1,238 @@
+from typing import List, Tuple, Dict, Any, Optional, Set, Callable
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session, undefer
+from core.config import settings
+from models.match import Match
+from models.project import Project
+from models.user import User
+from services.embedding_engine import EmbeddingEngine, embedding_engine
+from services.semantic_search import SemanticSearch, semantic_search
+from services.profile_search import ProfileSearch, profile_search
+import threading
+import queue
+import logging
+
+logger = logging.getLogger(__name__)
+
+MATCH_PROJECT = "project"  # Список участников для проекта
+MATCH_USER = "user"  # Список проектов для участника
+
+
+class MatchTable:
+    """
+    Материализованная таблица подбора matches: top-k участников каждого проекта
+    и top-k проектов каждого участника.
+
+    Изменение объекта ставится в очередь, фоновый поток пересчитывает только
+    затронутые списки: список самого объекта, списки, в которые он уже входит,
+    и списки его MATCHES_FANOUT ближайших соседей - тех, в чей top-k он может попасть.
+    Чтение - один запрос по индексу (source_type, source_id, rank). Список считается
+    устаревшим, если источник изменился после расчета, сменился кодировщик, истек
+    MATCHES_MAX_AGE_SECONDS или пересчет еще в очереди; тогда вызывающий выполняет
+    живой поиск, а список ставится на пересчет.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        engine: Optional[EmbeddingEngine] = None,
+        project_search: Optional[SemanticSearch] = None,
+        user_search: Optional[ProfileSearch] = None,
+        top_k: Optional[int] = None,
+        fanout: Optional[int] = None,
+        max_age_seconds: Optional[int] = None
+    ) -> None:
+        self.session_factory = session_factory
+        self.engine = engine or embedding_engine
+        self.project_search = project_search or semantic_search
+        self.user_search = user_search or profile_search
+        self.top_k = top_k or settings.MATCHES_TOP_K
+        self.fanout = fanout or settings.MATCHES_FANOUT
+        self.max_age = timedelta(seconds=max_age_seconds or settings.MATCHES_MAX_AGE_SECONDS)
+        self._queue: "queue.Queue[Tuple[str, int, bool]]" = queue.Queue()
+        self._pending: Set[Tuple[str, int]] = set()
+        self._pending_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._refreshed = 0
+
+    def _sides(self, source_type: str) -> Tuple[Any, Any, Any]:
+        """Модель источника, его поисковый сервис и сервис, в котором ищутся пары"""
+        if source_type == MATCH_PROJECT:
+            return Project, self.project_search, self.user_search
+        if source_type == MATCH_USER:
+            return User, self.user_search, self.project_search
+        raise ValueError(f"Неизвестный тип источника: {source_type}")
+
+    @staticmethod
+    def _opposite(source_type: str) -> str:
+        return MATCH_USER if source_type == MATCH_PROJECT else MATCH_PROJECT
+
+    def lookup(self, db: Session, source_type: str, source: Any, top_k: int) -> Optional[List[Tuple[Dict[str, Any], float]]]:
+        """
+        Предрассчитанный список пар источника или None, если его нельзя использовать.
+        Устаревший или отсутствующий список ставится на пересчет.
+        """
+        if top_k > self.top_k:
+            return None
+        key = (source_type, source.id)
+        with self._pending_lock:
+            pending = key in self._pending
+        if pending:
+            self._misses += 1
+            return None
+
+        rows = (
+            db.query(Match)
+            .filter(Match.source_type == source_type, Match.source_id == source.id)
+            .order_by(Match.rank)
+            .limit(top_k)
+            .all()
+        )
+        _, _, other = self._sides(source_type)
+        results = [(other.get_payload(row.target_id), row.score) for row in rows]
+        if (
+            not rows
+            or rows[0].model != self.engine.model_name
+            or rows[0].source_updated_at != source.updated_at
+            or rows[0].computed_at < datetime.utcnow() - self.max_age
+            # Пара удалена из индекса после расчета
+            or any(payload is None for payload, _ in results)
+        ):
+            self._misses += 1
+            self.mark_changed(source_type, source.id, propagate=False)
+            return None
+
+        self._hits += 1
+        return results
+
+    def mark_changed(self, source_type: str, source_id: int, propagate: bool = True) -> None:
+        """
+        Постановка объекта в очередь на пересчет. propagate - объект изменился,
+        и нужно пересчитать также списки, на которые он влияет.
+        """
+        with self._pending_lock:
+            self._pending.add((source_type, source_id))
+        self._ensure_worker()
+        self._queue.put((source_type, source_id, propagate))
+
+    def _ensure_worker(self) -> None:
+        """Запуск фонового потока пересчета"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="match-refresher", daemon=True)
+                self._worker.start()
+
+    def _collect_changes(self) -> List[Tuple[str, int, bool]]:
+        """Ожидание первого изменения и добор уже накопившихся"""
+        changes = [self._queue.get()]
+        while len(changes) < settings.MATCHES_REFRESH_BATCH_SIZE:
+            try:
+                changes.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return changes
+
+    def _run(self) -> None:
+        while True:
+            changes = self._collect_changes()
+            if self.session_factory is None:
+                from core.database import SessionLocal
+                self.session_factory = SessionLocal
+            db = self.session_factory()
+            try:
+                self.refresh(db, changes)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Ошибка при пересчете таблицы подбора: {str(e)}")
+                with self._pending_lock:
+                    self._pending.difference_update((source_type, source_id) for source_type, source_id, _ in changes)
+            finally:
+                db.close()
+
+    def _load(self, db: Session, source_type: str, source_id: int) -> Optional[Any]:
+        model, _, _ = self._sides(source_type)
+        return db.query(model).options(undefer(model.embedding)).filter(model.id == source_id).first()
+
+    def _affected(self, db: Session, source_type: str, source_id: int) -> Set[Tuple[str, int]]:
+        """Списки противоположной стороны, на которые может повлиять изменение объекта"""
+        opposite = self._opposite(source_type)
+        holders = db.query(Match.source_id).filter(
+            Match.source_type == opposite, Match.target_id == source_id
+        ).distinct()
+        affected = {(opposite, holder_id) for holder_id, in holders}
+
+        source = self._load(db, source_type, source_id)
+        if source is not None:
+            _, own, other = self._sides(source_type)
+            vector = own.embed(source)
+            if vector is not None:
+                affected.update((opposite, payload["id"]) for payload, _ in other.search_vector(vector, self.fanout))
+        return affected
+
+    def _refresh_list(self, db: Session, source_type: str, source_id: int) -> None:
+        """Пересчет списка одного источника (удаленный источник - удаление списка)"""
+        db.query(Match).filter(
+            Match.source_type == source_type, Match.source_id == source_id
+        ).delete(synchronize_session=False)
+
+        source = self._load(db, source_type, source_id)
+        if source is None:
+            return
+        _, own, other = self._sides(source_type)
+        # Эмбеддинг, пересчитанный при смене кодировщика, сохраняется вместе со списком без изменения updated_at
+        vector = own.embed(source)
+        source_updated_at = source.updated_at
+        if vector is None:
+            return
+
+        computed_at = datetime.utcnow()
+        db.add_all([
+            Match(
+                source_type=source_type,
+                source_id=source_id,
+                target_id=payload["id"],
+                rank=rank,
+                score=score,
+                model=self.engine.model_name,
+                source_updated_at=source_updated_at,
+                computed_at=computed_at
+            )
+            for rank, (payload, score) in enumerate(other.search_vector(vector, self.top_k))
+        ])
+        self._refreshed += 1
+
+    def refresh(self, db: Session, changes: List[Tuple[str, int, bool]]) -> int:
+        """Пересчет списков, затронутых изменениями (source_type, source_id, propagate)"""
+        lists: Set[Tuple[str, int]] = set()
+        for source_type, source_id, propagate in changes:
+            lists.add((source_type, source_id))
+            if propagate:
+                lists |= self._affected(db, source_type, source_id)
+
+        for source_type, source_id in sorted(lists):
+            self._refresh_list(db, source_type, source_id)
+        db.commit()
+
+        with self._pending_lock:
+            self._pending.difference_update((source_type, source_id) for source_type, source_id, _ in changes)
+        logger.info(f"Таблица подбора: пересчитано списков {len(lists)} по {len(changes)} изменениям")
+        return len(lists)
+
+    def stats(self) -> Dict[str, Any]:
+        """Попадания в таблицу подбора и очередь пересчета"""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "refreshed_lists": self._refreshed,
+            "queue_size": self._queue.qsize()
+        }
+
+# Создаем глобальный экземпляр сервиса
+match_table = MatchTable()
@@ -4,61 +4,55 @@ from models.project import Project
 from models.user import User
 from services.semantic_search import semantic_search
 from services.profile_search import profile_search
+from services.embedding_engine import embedding_engine
+from services.vector_index import normalize
+from services.embedding_store import collect_embeddings
+from services.match_table import match_table, MATCH_PROJECT, MATCH_USER
+from services.inference_executor import inference_executor
+import numpy as np
 import logging
 from fastapi import HTTPException, status
 
 logger = logging.getLogger(__name__)
 
 class MatchingService:
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Optional[Session] = None) -> None:
         self.db = db
         self.min_compatibility_score = 0.3  # Минимальный порог совместимости
     
-    def _prepare_project_text(self, project: Project) -> str:
-        """Подготовка текста проекта для сопоставления"""
-        return f"""
-        Название проекта: {project.title}
-        Описание: {project.description or ''}
-        Требуемые технологии: {', '.join(project.technologies or [])}
-        Требуемые роли: {', '.join(project.roles or [])}
-        Статус проекта: {project.status}
-        """
-    
-    def _prepare_profile_text(self, user: User) -> str:
-        """Подготовка текста анкеты для сопоставления"""
-        return f"""
-        Имя: {user.full_name}
-        Био: {user.bio or ''}
-        Навыки: {', '.join(user.skills or [])}
-        Опыт: {user.experience or ''}
-        Образование: {user.education or ''}
-        Технологии: {', '.join(user.technologies or [])}
-        Роли: {user.role}
-        Языки: {', '.join(user.languages or [])}
-        """
-    
     def find_matching_profiles(
         self,
         project: Project,
         top_k: int = 10,
-        min_score: Optional[float] = None
+        min_score: Optional[float] = None,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        db: Optional[Session] = None
     ) -> List[Tuple[Dict[str, Any], float]]:
-        """Поиск подходящих участников для проекта"""
+        """
+        Поиск подходящих участников для проекта.
+        С сессией БД список читается из таблицы подбора; живой поиск по эмбеддингу
+        проекта выполняется, если список устарел или заданы параметры ANN-поиска.
+        """
         try:
-            # Подготавливаем текст проекта
-            project_text = self._prepare_project_text(project)
-            
-            # Ищем подходящие анкеты
-            results = profile_search.search(project_text, top_k)
-            
-            # Фильтруем по минимальному порогу совместимости
-            min_score = min_score or self.min_compatibility_score
+            results = None
+            if db is not None and ef_search is None and nprobe is None:
+                results = match_table.lookup(db, MATCH_PROJECT, project, top_k)
+            if results is None:
+                # Ищем подходящие анкеты по эмбеддингу проекта
+                vector = semantic_search.embed(project)
+                if vector is None:
+                    raise ValueError(f"Не удалось получить эмбеддинг проекта {project.id}")
+                results = profile_search.search_vector(vector, top_k, ef_search=ef_search, nprobe=nprobe)
+            
+            # Фильтруем по минимальному порогу косинусного сходства
+            min_score = min_score if min_score is not None else self.min_compatibility_score
             filtered_results = [
                 (profile, score) for profile, score in results
                 if score >= min_score
             ]
             
-            logger.info(f"Найдено {len(filtered_results)} подходящих участников для проекта {project.title}")
+            logger.info(f"Найдено {len(filtered_results)} подходящих участников для проекта {project.id}")
             return filtered_results
             
         except Exception as e:
@@ -72,24 +66,35 @@ class MatchingService:
         self,
         user: User,
         top_k: int = 10,
-        min_score: Optional[float] = None
+        min_score: Optional[float] = None,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        db: Optional[Session] = None
     ) -> List[Tuple[Dict[str, Any], float]]:
-        """Поиск подходящих проектов для участника"""
+        """
+        Поиск подходящих проектов для участника.
+        С сессией БД список читается из таблицы подбора; живой поиск по эмбеддингу
+        анкеты выполняется, если список устарел или заданы параметры ANN-поиска.
+        """
         try:
-            # Подготавливаем текст анкеты
-            profile_text = self._prepare_profile_text(user)
-            
-            # Ищем подходящие проекты
-            results = semantic_search.search(profile_text, top_k)
-            
-            # Фильтруем по минимальному порогу совместимости
-            min_score = min_score or self.min_compatibility_score
+            results = None
+            if db is not None and ef_search is None and nprobe is None:
+                results = match_table.lookup(db, MATCH_USER, user, top_k)
+            if results is None:
+                # Ищем подходящие проекты по эмбеддингу анкеты
+                vector = profile_search.embed(user)
+                if vector is None:
+                    raise ValueError(f"Не удалось получить эмбеддинг участника {user.id}")
+                results = semantic_search.search_vector(vector, top_k, ef_search=ef_search, nprobe=nprobe)
+            
+            # Фильтруем по минимальному порогу косинусного сходства
+            min_score = min_score if min_score is not None else self.min_compatibility_score
             filtered_results = [
                 (project, score) for project, score in results
                 if score >= min_score
             ]
             
-            logger.info(f"Найдено {len(filtered_results)} подходящих проектов для участника {user.full_name}")
+            logger.info(f"Найдено {len(filtered_results)} подходящих проектов для участника {user.id}")
             return filtered_results
             
         except Exception as e:
@@ -106,18 +111,9 @@ class MatchingService:
     ) -> float:
         """Оценка совместимости проекта и участника"""
         try:
-            # Подготавливаем тексты
-            project_text = self._prepare_project_text(project)
-            profile_text = self._prepare_profile_text(user)
-            
-            # Векторизуем тексты
-            project_vector = semantic_search._vectorize_text(project_text)
-            profile_vector = profile_search._vectorize_text(profile_text)
+            similarity = float(self.calculate_compatibility_matrix([project], [user])[0, 0])
             
-            # Вычисляем сходство
-            similarity = semantic_search._compute_similarity(project_vector, profile_vector)
-            
-            logger.info(f"Совместимость проекта {project.title} и участника {user.full_name}: {similarity:.2f}")
+            logger.info(f"Совместимость проекта {project.id} и участника {user.id}: {similarity:.2f}")
             return similarity
             
         except Exception as e:
@@ -127,25 +123,60 @@ class MatchingService:
                 detail="Ошибка при расчете совместимости"
             )
     
+    def calculate_compatibility_matrix(
+        self,
+        projects: List[Project],
+        users: List[User]
+    ) -> np.ndarray:
+        """
+        Матрица косинусной совместимости проектов (строки) и участников (столбцы).
+        Эмбеддинги берутся из колонки embedding (векторизуются только устаревшие),
+        а вся матрица считается одним матричным произведением.
+        """
+        try:
+            project_vectors, _ = collect_embeddings(
+                projects, [semantic_search._prepare_text(project) for project in projects], embedding_engine
+            )
+            user_vectors, _ = collect_embeddings(
+                users, [profile_search._prepare_text(user) for user in users], embedding_engine
+            )
+            project_vectors = normalize(project_vectors)
+            user_vectors = normalize(user_vectors)
+            return project_vectors @ user_vectors.T
+        except Exception as e:
+            logger.error(f"Ошибка при расчете матрицы совместимости: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Ошибка при расчете совместимости"
+            )
+    
     def get_recommendations(
         self,
         user: User,
-        top_k: int = 5
+        top_k: int = 5,
+        db: Optional[Session] = None
     ) -> Dict[str, List[Tuple[Dict[str, Any], float]]]:
-        """Получение рекомендаций для участника"""
+        """
+        Получение рекомендаций для участника.
+        С сессией БД подходящие проекты читаются из таблицы подбора.
+        """
         try:
             # Находим подходящие проекты
-            matching_projects = self.find_matching_projects(user, top_k)
+            matching_projects = self.find_matching_projects(user, top_k, db=db)
             
-            # Находим похожих участников
-            profile_text = self._prepare_profile_text(user)
-            similar_profiles = profile_search.search(profile_text, top_k)
+            # Похожих участников ищем по сохраненному эмбеддингу анкеты: это документ,
+            # а не поисковый запрос, и в кэш запросов он попадать не должен
+            vector = profile_search.embed(user)
+            if vector is None:
+                raise ValueError(f"Не удалось получить эмбеддинг участника {user.id}")
+            # Один лишний результат на случай, если первым найдется сам пользователь
+            similar_profiles = profile_search.search_vector(vector, top_k + 1)
             
             # Фильтруем похожих участников (исключаем самого пользователя)
             similar_profiles = [
                 (profile, score) for profile, score in similar_profiles
                 if profile['id'] != user.id
-            ]
+            ][:top_k]
             
             return {
                 'matching_projects': matching_projects,
@@ -159,5 +190,27 @@ class MatchingService:
                 detail="Ошибка при получении рекомендаций"
             )
 
+    # Асинхронные обертки для маршрутов: работа выполняется в пуле векторизации и поиска
+
+    async def find_matching_profiles_async(self, *args: Any, **kwargs: Any) -> List[Tuple[Dict[str, Any], float]]:
+        return await inference_executor.run(self.find_matching_profiles, *args, **kwargs)
+
+    async def find_matching_projects_async(self, *args: Any, **kwargs: Any) -> List[Tuple[Dict[str, Any], float]]:
+        return await inference_executor.run(self.find_matching_projects, *args, **kwargs)
+
+    async def calculate_compatibility_async(self, project: Project, user: User) -> float:
+        return await inference_executor.run(self.calculate_compatibility, project, user)
+
+    async def calculate_compatibility_matrix_async(self, projects: List[Project], users: List[User]) -> np.ndarray:
+        return await inference_executor.run(self.calculate_compatibility_matrix, projects, users)
+
+    async def get_recommendations_async(
+        self,
+        user: User,
+        top_k: int = 5,
+        db: Optional[Session] = None
+    ) -> Dict[str, List[Tuple[Dict[str, Any], float]]]:
+        return await inference_executor.run(self.get_recommendations, user, top_k, db=db)
+
 # Создаем глобальный экземпляр сервиса
 matching_service = MatchingService() 
\ No newline at end of file
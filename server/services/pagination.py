@@ -0,0 +1,44 @@
+from typing import List, Any, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from services.search_cursor import pack_state, unpack_state
+
+
+def keyset_page(
+    query: Query,
+    created_column: Any,
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    scope: str = ""
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Страница списка по ключу (created_at, id) от новых к старым и курсор следующей страницы.
+
+    В отличие от offset, БД не перебирает пропущенные строки: следующая страница начинается
+    сразу после последней записи предыдущей по составному индексу (..., created_at, id).
+    scope привязывает курсор к списку (например, уведомлениям конкретного пользователя).
+    """
+    if cursor:
+        state = unpack_state(cursor)
+        if state.get("k") != scope:
+            raise ValueError("Курсор относится к другому списку")
+        try:
+            last_created_at = datetime.fromisoformat(state["t"])
+            last_id = int(state["i"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError("Некорректный курсор") from e
+        query = query.filter(tuple_(created_column, id_column) < tuple_(last_created_at, last_id))
+
+    # Одна лишняя запись показывает, есть ли следующая страница
+    rows = query.order_by(created_column.desc(), id_column.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = pack_state({
+            "k": scope,
+            "t": getattr(last, created_column.key).isoformat(),
+            "i": getattr(last, id_column.key)
+        })
+    return rows[:limit], next_cursor
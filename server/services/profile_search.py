@@ -1,34 +1,47 @@
 from typing import List, Tuple, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
 import numpy as np
 from models.user import User
-from sqlalchemy.orm import Session
-import faiss
-import pickle
-import os
-from datetime import datetime
+from sqlalchemy.orm import Session, undefer
+from services.embedding_engine import EmbeddingEngine, embedding_engine
+from services.vector_index import VectorIndex, create_vector_index, build_vector_index
+from services.embedding_store import collect_embeddings
+from services.inference_executor import inference_executor
+from services.index_snapshot import IndexSnapshotStore, table_fingerprint, is_snapshot_stale, is_snapshot_compatible
+from core.locks import ReadWriteLock
 import logging
 from fastapi import HTTPException, status
 
 logger = logging.getLogger(__name__)
 
 class ProfileSearch:
-    def __init__(self) -> None:
+    model = User
+
+    def __init__(
+        self,
+        engine: Optional[EmbeddingEngine] = None,
+        snapshot_store: Optional[IndexSnapshotStore] = None
+    ) -> None:
         """Инициализация сервиса поиска профилей"""
         try:
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-            self.dimension = self.model.get_sentence_embedding_dimension()
-            self.index = faiss.IndexFlatL2(self.dimension)
-            self.profiles: List[User] = []
+            self.engine = engine or embedding_engine
+            # Индекс создается при первом обращении, чтобы импорт модуля не загружал модель
+            self.index: Optional[VectorIndex] = None
+            self._lock = ReadWriteLock()
+            self.profiles: Dict[int, Dict[str, Any]] = {}
+            self.snapshot_store = snapshot_store or IndexSnapshotStore("profiles")
+            self.snapshot_version: Optional[str] = None
+            self.snapshot_meta: Dict[str, Any] = {}
+            # Воркер-читатель общего индекса хоста: изменения публикует процесс-публикатор
+            self.shared_reader = False
             logger.info("Сервис поиска профилей успешно инициализирован")
         except Exception as e:
             logger.error(f"Ошибка при инициализации сервиса: {str(e)}")
             raise
 
     def _vectorize_text(self, text: str) -> np.ndarray:
-        """Векторизация текста"""
+        """Векторизация поискового запроса (через кэш запросов)"""
         try:
-            return self.model.encode([text])[0]
+            return self.engine.encode_query(text)
         except Exception as e:
             logger.error(f"Ошибка при векторизации текста: {str(e)}")
             raise
@@ -41,44 +54,112 @@ class ProfileSearch:
             logger.error(f"Ошибка при вычислении сходства: {str(e)}")
             raise
 
+    def _prepare_text(self, profile: User) -> str:
+        """Подготовка текста профиля для индексации"""
+        return f"{profile.username or ''} {' '.join(profile.skills or [])} {' '.join(profile.roles or [])}"
+
+    @property
+    def dimension(self) -> int:
+        return self.engine.dimension
+
+    def _get_index(self) -> VectorIndex:
+        if self.index is None:
+            self.index = create_vector_index(self.dimension)
+        return self.index
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def indexed_ids(self) -> List[int]:
+        """id всех объектов индекса"""
+        with self._lock.read():
+            return list(self.profiles)
+
+    def get_payload(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Данные профиля из индекса или None, если его нет в индексе"""
+        return self.profiles.get(user_id)
+
     def index_profiles(self, profiles: List[User]) -> None:
-        """Индексация профилей"""
+        """Полная индексация профилей"""
         try:
             if not profiles:
                 return
 
-            # Очищаем предыдущий индекс
-            self.index = faiss.IndexFlatL2(self.dimension)
-            self.profiles = []
-
-            # Подготавливаем тексты профилей
-            texts = []
-            for profile in profiles:
-                text = f"""
-                {profile.full_name}
-                {profile.bio or ''}
-                {' '.join(profile.skills or [])}
-                {profile.experience or ''}
-                {profile.education or ''}
-                {' '.join(profile.technologies or [])}
-                {profile.role}
-                {' '.join(profile.languages or [])}
-                """
-                texts.append(text)
-
-            # Векторизуем тексты
-            vectors = self.model.encode(texts)
-
-            # Добавляем векторы в индекс
-            self.index.add(np.array(vectors).astype('float32'))
-            self.profiles = profiles
-
-            logger.info(f"Успешно проиндексировано {len(profiles)} профилей")
+            # Берем сохраненные эмбеддинги, векторизуем только новые и измененные тексты
+            texts = [self._prepare_text(profile) for profile in profiles]
+            vectors, encoded = collect_embeddings(profiles, texts, self.engine)
+            ids = np.array([profile.id for profile in profiles], dtype='int64')
+
+            # Собираем новый индекс и подменяем им предыдущий
+            self.replace_index(ids, vectors, [profile.dict() for profile in profiles])
+
+            logger.info(f"Успешно проиндексировано {len(profiles)} профилей (векторизовано заново: {encoded})")
         except Exception as e:
             logger.error(f"Ошибка при индексации профилей: {str(e)}")
             raise
 
-    def search(self, query: str, top_k: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+    def replace_index(self, ids: np.ndarray, vectors: np.ndarray, payloads: List[Dict[str, Any]]) -> None:
+        """Сборка нового индекса из готовых векторов и подмена им текущего"""
+        try:
+            index = build_vector_index(vectors.shape[1], ids, vectors)
+            payload_map = {int(item_id): payload for item_id, payload in zip(ids, payloads)}
+            with self._lock.write():
+                self.index = index
+                self.profiles = payload_map
+        except Exception as e:
+            logger.error(f"Ошибка при сборке индекса профилей: {str(e)}")
+            raise
+
+    def embed(self, profile: User) -> Optional[np.ndarray]:
+        """
+        Эмбеддинг профиля: из колонки embedding, а если текст или модель изменились -
+        новый, записанный в колонку. Вызывается до commit, чтобы вектор сохранился вместе с объектом.
+        """
+        try:
+            vectors, _ = collect_embeddings([profile], [self._prepare_text(profile)], self.engine)
+            return vectors[0]
+        except Exception as e:
+            logger.error(f"Ошибка при векторизации профиля {profile.id}: {str(e)}")
+            return None
+
+    def upsert(self, profile: User) -> None:
+        """
+        Добавление или обновление одного профиля в индексе.
+        Ошибка не прерывает запись в БД: индекс будет перестроен при следующем старте.
+        В воркере-читателе общего индекса изменение применит публикатор.
+        """
+        if self.shared_reader:
+            return
+        try:
+            vector = self.embed(profile)
+            if vector is None:
+                return
+            with self._lock.write():
+                self._get_index().upsert(profile.id, vector, exists=profile.id in self.profiles)
+                self.profiles[profile.id] = profile.dict()
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении профиля {profile.id} в индексе: {str(e)}")
+
+    def remove(self, user_id: int) -> None:
+        """Удаление профиля из индекса"""
+        if self.shared_reader:
+            return
+        try:
+            with self._lock.write():
+                if user_id not in self.profiles:
+                    return
+                self.index.remove(user_id)
+                del self.profiles[user_id]
+        except Exception as e:
+            logger.error(f"Ошибка при удалении профиля {user_id} из индекса: {str(e)}")
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
         """Поиск профилей по запросу"""
         try:
             if not self.profiles:
@@ -86,24 +167,85 @@ class ProfileSearch:
 
             # Векторизуем запрос
             query_vector = self._vectorize_text(query)
+            return self.search_vector(query_vector, top_k, ef_search=ef_search, nprobe=nprobe)
+        except Exception as e:
+            logger.error(f"Ошибка при поиске профилей: {str(e)}")
+            raise
 
-            # Ищем ближайшие векторы
-            distances, indices = self.index.search(
-                np.array([query_vector]).astype('float32'),
-                min(top_k, len(self.profiles))
+    def search_vector(
+        self,
+        query_vector: np.ndarray,
+        top_k: int = 10,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Поиск профилей по готовому вектору запроса"""
+        if not self.profiles:
+            return []
+
+        # Ищем ближайшие векторы; оценка - косинусное сходство
+        with self._lock.read():
+            hits = self.index.search(query_vector, top_k, ef_search=ef_search, nprobe=nprobe)
+
+        # Формируем результаты
+        results = []
+        for user_id, similarity in hits:
+            profile = self.profiles.get(user_id)
+            if profile is not None:
+                results.append((profile, similarity))
+
+        return results
+
+    async def search_async(self, *args: Any, **kwargs: Any) -> List[Tuple[Dict[str, Any], float]]:
+        """Поиск в пуле векторизации и поиска, без блокировки цикла событий"""
+        return await inference_executor.run(self.search, *args, **kwargs)
+
+    def save_snapshot(self, fingerprint: Optional[Dict[str, Any]] = None) -> str:
+        """Сохранение снимка индекса и карты id на диск"""
+        meta = dict(fingerprint or {})
+        meta["model"] = self.engine.model_name
+        meta["encoder"] = self.engine.encoder.kind
+        with self._lock.read():
+            index = self._get_index()
+            meta["dimension"] = index.dimension
+            meta["vector_index"] = index.state()
+            self.snapshot_version = self.snapshot_store.save(
+                index, list(self.profiles), list(self.profiles.values()), meta
             )
+        self.snapshot_meta = meta
+        return self.snapshot_version
+
+    def load_snapshot(self) -> bool:
+        """Загрузка последнего снимка индекса, отображенного в память"""
+        snapshot = self.snapshot_store.load()
+        if snapshot is None or not is_snapshot_compatible(snapshot.meta, self.engine):
+            return False
+
+        with self._lock.write():
+            self.index = snapshot.index
+            self.profiles = dict(zip(snapshot.ids, snapshot.payloads))
+        self.snapshot_version = snapshot.version
+        self.snapshot_meta = snapshot.meta
+        logger.info(f"Загружен снимок индекса профилей {snapshot.version}: {len(self.profiles)} профилей")
+        return True
+
+    def warm_start(self, db: Session) -> None:
+        """Загрузка снимка при старте воркера с переиндексацией, если он устарел"""
+        try:
+            fingerprint = table_fingerprint(db, User)
+            if self.load_snapshot() and (self.shared_reader or not is_snapshot_stale(self.snapshot_meta, fingerprint)):
+                # Устаревший снимок читатель не перестраивает: новую версию опубликует публикатор
+                return
 
-            # Формируем результаты
-            results = []
-            for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-                if idx < len(self.profiles):
-                    profile = self.profiles[idx]
-                    similarity = 1 / (1 + distance)  # Преобразуем расстояние в сходство
-                    results.append((profile.dict(), similarity))
-
-            return results
+            logger.info("Снимок индекса профилей отсутствует или устарел, выполняется переиндексация")
+            self.index_profiles(db.query(User).options(undefer(User.embedding)).all())
+            # Сохраняем посчитанные эмбеддинги, чтобы следующая перестройка не векторизовала их заново;
+            # updated_at при этом не меняется, поэтому отпечаток таблицы остается прежним
+            db.commit()
+            if not self.shared_reader:
+                self.save_snapshot(fingerprint)
         except Exception as e:
-            logger.error(f"Ошибка при поиске профилей: {str(e)}")
+            logger.error(f"Ошибка при загрузке индекса профилей: {str(e)}")
             raise
 
 # Создаем глобальный экземпляр сервиса
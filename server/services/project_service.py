@@ -1,11 +1,17 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy import or_
 from fastapi import HTTPException, status
 from models.project import Project
+from core.database import json_array_contains
+from services.fulltext_search import fulltext_enabled, fulltext_ranking, set_search_language
+from services.pagination import keyset_page
+from core.config import settings
+from services.stats_service import stats_service
 from models.user import User
 from schemas.project import ProjectCreate, ProjectUpdate
 from services.semantic_search import semantic_search
+from services.match_table import match_table, MATCH_PROJECT
 from datetime import datetime
 
 class ProjectService:
@@ -24,8 +30,20 @@ class ProjectService:
         ).first()
 
     def get_user_projects(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Project]:
-        """Получение всех проектов пользователя"""
-        return self.db.query(Project).filter(Project.user_id == user_id).offset(skip).limit(limit).all()
+        """Получение всех проектов пользователя (смещение устарело, используйте get_user_projects_page)"""
+        return self.db.query(Project).filter(Project.team_lead_id == user_id).order_by(
+            Project.created_at.desc(), Project.id.desc()
+        ).offset(skip).limit(limit).all()
+
+    def get_user_projects_page(
+        self,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Project], Optional[str]]:
+        """Страница проектов пользователя от новых к старым по курсору"""
+        query = self.db.query(Project).filter(Project.team_lead_id == user_id)
+        return keyset_page(query, Project.created_at, Project.id, limit, cursor, scope=f"user_projects:{user_id}")
 
     def create_project(self, project: ProjectCreate, user_id: int) -> Project:
         """Создание нового проекта"""
@@ -53,8 +71,12 @@ class ProjectService:
             updated_at=datetime.utcnow()
         )
         self.db.add(db_project)
+        set_search_language(db_project)
+        semantic_search.embed(db_project)
         self.db.commit()
         self.db.refresh(db_project)
+        semantic_search.upsert(db_project)
+        match_table.mark_changed(MATCH_PROJECT, db_project.id)
         return db_project
 
     def update_project(self, project_id: int, project_update: ProjectUpdate) -> Optional[Project]:
@@ -83,8 +105,12 @@ class ProjectService:
             setattr(db_project, field, value)
         
         db_project.updated_at = datetime.utcnow()
+        set_search_language(db_project)
+        semantic_search.embed(db_project)
         self.db.commit()
         self.db.refresh(db_project)
+        semantic_search.upsert(db_project)
+        match_table.mark_changed(MATCH_PROJECT, db_project.id)
         return db_project
 
     def delete_project(self, project_id: int) -> bool:
@@ -95,6 +121,8 @@ class ProjectService:
         
         self.db.delete(db_project)
         self.db.commit()
+        semantic_search.remove(project_id)
+        match_table.mark_changed(MATCH_PROJECT, project_id)
         return True
 
     def get_all_projects(self, current_user: User) -> List[Project]:
@@ -136,6 +164,12 @@ class ProjectService:
             self.db.commit()
         return True
 
+    def _fulltext_hits(self, query: str, status: Optional[str], top_k: int) -> Optional[List[Tuple[int, float]]]:
+        """Лексические кандидаты полнотекстового индекса PostgreSQL, если он выбран вместо BM25 в памяти"""
+        if not fulltext_enabled(self.db):
+            return None
+        return fulltext_ranking(self.db, query, top_k, status=status or None)
+
     def search_projects(
         self,
         query: Optional[str] = None,
@@ -147,38 +181,80 @@ class ProjectService:
         limit: int = 10
     ) -> List[Project]:
         """Поиск и фильтрация проектов с использованием семантического поиска"""
-        # Получаем все проекты
-        projects = self.db.query(Project).all()
-        
-        # Применяем фильтры
+        # С запросом фильтры применяются масками общего индекса, а из БД читается только страница;
+        # смещения идут в том же порядке, что и страницы по курсору, без ограничения глубины
+        if query:
+            search_results = semantic_search.search_range(
+                query,
+                skip=skip,
+                limit=limit,
+                filters={
+                    "status": status or None,
+                    "technologies": technologies,
+                    "required_roles": required_roles,
+                    "is_active": is_active
+                },
+                lexical_hits=self._fulltext_hits(query, status, settings.SEARCH_HYBRID_CANDIDATES)
+            )
+            page_ids = [project["id"] for project, _ in search_results]
+            projects_by_id = {
+                p.id: p for p in self.db.query(Project).filter(Project.id.in_(page_ids)).all()
+            }
+            return [projects_by_id[project_id] for project_id in page_ids if project_id in projects_by_id]
+
+        # Без запроса фильтры выполняются в БД: в PostgreSQL списки проверяются по GIN-индексам (@>)
+        projects = self.db.query(Project)
         if status:
-            projects = [p for p in projects if p.status == status]
+            projects = projects.filter(Project.status == status)
         if technologies:
-            projects = [p for p in projects if all(t in (p.technologies or []) for t in technologies)]
+            projects = projects.filter(json_array_contains(self.db, Project.technologies, technologies))
         if required_roles:
-            projects = [p for p in projects if all(r in (p.required_roles or []) for r in required_roles)]
+            projects = projects.filter(json_array_contains(self.db, Project.required_roles, required_roles))
         if is_active is not None:
-            projects = [p for p in projects if p.is_active == is_active]
-        
-        # Если есть поисковый запрос, используем семантический поиск
-        if query:
-            # Индексируем отфильтрованные проекты
-            semantic_search.index_projects(projects)
-            # Получаем результаты с оценками релевантности
-            search_results = semantic_search.search(query, top_k=len(projects))
-            # Извлекаем только проекты из результатов
-            projects = [project for project, _ in search_results]
-        
-        # Применяем пагинацию
-        return projects[skip:skip + limit]
+            # Активность проекта определяется статусом, как и в масках индекса
+            # NULL-статус - неактивный проект, как в масках индекса; в SQL "status != 'active'" его отбросил бы
+            projects = projects.filter(
+                Project.status == "active" if is_active else or_(Project.status.is_(None), Project.status != "active")
+            )
+
+        return projects.order_by(Project.id).offset(skip).limit(limit).all()
+
+    def search_projects_page(
+        self,
+        query: str,
+        status: Optional[str] = None,
+        technologies: Optional[List[str]] = None,
+        required_roles: Optional[List[str]] = None,
+        is_active: Optional[bool] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Project], Optional[str]]:
+        """Страница поиска проектов по курсору и курсор следующей страницы"""
+        search_results, next_cursor = semantic_search.search_page(
+            query,
+            limit=limit,
+            cursor=cursor,
+            filters={
+                "status": status or None,
+                "technologies": technologies,
+                "required_roles": required_roles,
+                "is_active": is_active
+            },
+            lexical_hits=self._fulltext_hits(query, status, settings.SEARCH_HYBRID_CANDIDATES)
+        )
+        page_ids = [project["id"] for project, _ in search_results]
+        projects_by_id = {
+            p.id: p for p in self.db.query(Project).filter(Project.id.in_(page_ids)).all()
+        }
+        return [projects_by_id[project_id] for project_id in page_ids if project_id in projects_by_id], next_cursor
 
     def get_projects_by_technology(self, technology: str) -> List[Project]:
         """Получение проектов по технологии"""
-        return self.db.query(Project).filter(Project.technologies.contains([technology])).all()
+        return self.db.query(Project).filter(json_array_contains(self.db, Project.technologies, [technology])).all()
 
     def get_projects_by_role(self, role: str) -> List[Project]:
         """Получение проектов по требуемой роли"""
-        return self.db.query(Project).filter(Project.required_roles.contains([role])).all()
+        return self.db.query(Project).filter(json_array_contains(self.db, Project.required_roles, [role])).all()
 
     def get_projects_by_status(self, status: str) -> List[Project]:
         """Получение проектов по статусу"""
@@ -189,66 +265,24 @@ class ProjectService:
         return self.db.query(Project).filter(Project.is_active == True).all()
 
     def get_project_statistics(self) -> dict:
-        """Получение статистики по проектам"""
-        total_projects = self.db.query(Project).count()
-        active_projects = self.db.query(Project).filter(Project.is_active == True).count()
-        completed_projects = self.db.query(Project).filter(Project.status == "completed").count()
-        on_hold_projects = self.db.query(Project).filter(Project.status == "on_hold").count()
-        
-        # Получаем топ технологий
-        all_technologies = []
-        for project in self.db.query(Project).all():
-            all_technologies.extend(project.technologies or [])
-        technology_counts = {}
-        for tech in all_technologies:
-            technology_counts[tech] = technology_counts.get(tech, 0) + 1
-        top_technologies = sorted(technology_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        # Получаем топ требуемых ролей
-        all_roles = []
-        for project in self.db.query(Project).all():
-            all_roles.extend(project.required_roles or [])
-        role_counts = {}
-        for role in all_roles:
-            role_counts[role] = role_counts.get(role, 0) + 1
-        top_roles = sorted(role_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        
+        """Получение статистики по проектам (группировка в БД, см. StatsService)"""
+        stats = stats_service.get(self.db)["projects"]
+        by_status = stats["by_status"]
         return {
-            "total_projects": total_projects,
-            "active_projects": active_projects,
-            "completed_projects": completed_projects,
-            "on_hold_projects": on_hold_projects,
-            "top_technologies": dict(top_technologies),
-            "top_roles": dict(top_roles)
+            "total_projects": stats["total"],
+            "active_projects": by_status.get("active", 0),
+            "completed_projects": by_status.get("completed", 0),
+            "on_hold_projects": by_status.get("on_hold", 0),
+            "top_technologies": dict(list(stats["technologies"].items())[:5]),
+            "top_roles": dict(list(stats["required_roles"].items())[:5])
         }
 
     def get_project_stats(self) -> Dict[str, Any]:
         """Получает статистику по проектам"""
-        total_projects = self.db.query(func.count(Project.id)).scalar()
-        active_projects = self.db.query(func.count(Project.id)).filter(Project.is_active == True).scalar()
-        
-        # Подсчет технологий
-        all_technologies: List[str] = []
-        projects = self.db.query(Project).all()
-        for project in projects:
-            all_technologies.extend(project.technologies)
-        
-        technology_counts: Dict[str, int] = {}
-        for tech in all_technologies:
-            technology_counts[tech] = technology_counts.get(tech, 0) + 1
-        
-        # Подсчет ролей
-        all_roles: List[str] = []
-        for project in projects:
-            all_roles.extend(project.required_roles)
-        
-        role_counts: Dict[str, int] = {}
-        for role in all_roles:
-            role_counts[role] = role_counts.get(role, 0) + 1
-        
+        stats = stats_service.get(self.db)["projects"]
         return {
-            "total_projects": total_projects,
-            "active_projects": active_projects,
-            "technology_stats": technology_counts,
-            "role_stats": role_counts
-        } 
\ No newline at end of file
+            "total_projects": stats["total"],
+            "active_projects": stats["by_status"].get("active", 0),
+            "technology_stats": stats["technologies"],
+            "role_stats": stats["required_roles"]
+        }
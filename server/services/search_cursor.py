@@ -0,0 +1,80 @@
+from typing import Dict, Any, Optional
+from core.config import settings
+from services.embedding_cache import normalize_query
+import base64
+import hashlib
+import hmac
+import json
+
+SIGNATURE_BYTES = 16
+
+# Части выдачи гибридного поиска: голова RRF и хвост по косинусному сходству
+PAGE_HEAD = "h"
+PAGE_TAIL = "t"
+
+
+def query_key(model_name: str, query: str, filters: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Идентификатор запроса для курсора: кодировщик, нормализованный запрос и фильтры.
+    По той же паре (кодировщик, нормализованный запрос) вектор запроса берется из кэша запросов.
+    """
+    normalized_filters = {field: value for field, value in sorted((filters or {}).items()) if value}
+    raw = json.dumps([model_name, normalize_query(query), normalized_filters], ensure_ascii=False, default=list)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def list_scope(name: str, filters: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Область курсора списка без запроса: имя списка и его фильтры.
+    Курсор, выданный для одного набора фильтров, не подходит к другому.
+    """
+    normalized_filters = {field: value for field, value in sorted((filters or {}).items()) if value}
+    if not normalized_filters:
+        return name
+    raw = json.dumps(normalized_filters, ensure_ascii=False, default=list)
+    return f"{name}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]}"
+
+
+def _sign(body: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), body, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+def pack_state(state: Dict[str, Any]) -> str:
+    """Подписанное непрозрачное представление состояния курсора"""
+    body = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(_sign(body) + body).decode("ascii").rstrip("=")
+
+
+def unpack_state(cursor: str) -> Dict[str, Any]:
+    """Состояние курсора после проверки подписи"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        signature, body = raw[:SIGNATURE_BYTES], raw[SIGNATURE_BYTES:]
+        state = json.loads(body)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Некорректный курсор") from e
+    if not hmac.compare_digest(signature, _sign(body)) or not isinstance(state, dict):
+        raise ValueError("Некорректный курсор")
+    return state
+
+
+def encode_cursor(key: str, last_score: float, last_id: int, seen: int, part: Optional[str] = None) -> str:
+    """
+    Непрозрачный курсор страницы: запрос, оценка и id последнего результата, число выданных
+    и, для гибридного поиска, часть выдачи (PAGE_HEAD или PAGE_TAIL), к которой он относится.
+    """
+    state = {"k": key, "s": last_score, "i": last_id, "n": seen}
+    if part is not None:
+        state["p"] = part
+    return pack_state(state)
+
+
+def decode_cursor(cursor: str, key: str) -> Dict[str, Any]:
+    """
+    Разбор курсора с проверкой подписи и принадлежности тому же запросу.
+    Подпись не дает подделать число выданных результатов и заставить искать сколь угодно глубоко.
+    """
+    state = unpack_state(cursor)
+    if state.get("k") != key:
+        raise ValueError("Курсор относится к другому запросу")
+    return state
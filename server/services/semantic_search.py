@@ -1,34 +1,57 @@
 from typing import List, Tuple, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
 import numpy as np
 from models.project import Project
-from sqlalchemy.orm import Session
-import faiss
-import pickle
-import os
-from datetime import datetime
+from sqlalchemy.orm import Session, undefer
+from services.embedding_engine import EmbeddingEngine, embedding_engine
+from services.vector_index import VectorIndex, create_vector_index, build_vector_index
+from services.embedding_store import collect_embeddings
+from services.filter_index import FilterIndex
+from services.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from services.search_cursor import query_key, encode_cursor, decode_cursor, PAGE_HEAD, PAGE_TAIL
+from services.inference_executor import inference_executor
+from core.config import settings
+from core.locks import ReadWriteLock
+from services.index_snapshot import IndexSnapshotStore, table_fingerprint, is_snapshot_stale, is_snapshot_compatible
 import logging
 from fastapi import HTTPException, status
 
 logger = logging.getLogger(__name__)
 
+# Поля проекта, по которым поиск можно ограничить фильтрами
+FILTER_SET_FIELDS = ("status", "technologies", "required_roles")
+FILTER_FLAG_FIELDS = ("is_active",)
+
 class SemanticSearch:
-    def __init__(self) -> None:
+    model = Project
+
+    def __init__(
+        self,
+        engine: Optional[EmbeddingEngine] = None,
+        snapshot_store: Optional[IndexSnapshotStore] = None
+    ) -> None:
         """Инициализация сервиса семантического поиска"""
         try:
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-            self.dimension = self.model.get_sentence_embedding_dimension()
-            self.index = faiss.IndexFlatL2(self.dimension)
-            self.projects: List[Project] = []
+            self.engine = engine or embedding_engine
+            # Индекс создается при первом обращении, чтобы импорт модуля не загружал модель
+            self.index: Optional[VectorIndex] = None
+            self._lock = ReadWriteLock()
+            self.projects: Dict[int, Dict[str, Any]] = {}
+            self.filters = self._build_filters([])
+            self.lexical = self._build_lexical([])
+            self.snapshot_store = snapshot_store or IndexSnapshotStore("projects")
+            self.snapshot_version: Optional[str] = None
+            self.snapshot_meta: Dict[str, Any] = {}
+            # Воркер-читатель общего индекса хоста: изменения публикует процесс-публикатор
+            self.shared_reader = False
             logger.info("Сервис семантического поиска успешно инициализирован")
         except Exception as e:
             logger.error(f"Ошибка при инициализации сервиса: {str(e)}")
             raise
 
     def _vectorize_text(self, text: str) -> np.ndarray:
-        """Векторизация текста"""
+        """Векторизация поискового запроса (через кэш запросов)"""
         try:
-            return self.model.encode([text])[0]
+            return self.engine.encode_query(text)
         except Exception as e:
             logger.error(f"Ошибка при векторизации текста: {str(e)}")
             raise
@@ -41,60 +64,451 @@ class SemanticSearch:
             logger.error(f"Ошибка при вычислении сходства: {str(e)}")
             raise
 
+    def _prepare_text(self, project: Project) -> str:
+        """Подготовка текста проекта для индексации"""
+        return f"{project.title} {project.description} {' '.join(project.technologies or [])} {' '.join(project.required_roles or [])}"
+
+    @property
+    def dimension(self) -> int:
+        return self.engine.dimension
+
+    def _get_index(self) -> VectorIndex:
+        if self.index is None:
+            self.index = create_vector_index(self.dimension)
+        return self.index
+
+    @staticmethod
+    def _filter_row(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Значения фильтров проекта; у модели нет is_active, активность определяется статусом"""
+        row = dict(payload)
+        row.setdefault("is_active", payload.get("status") == "active")
+        return row
+
+    def _build_filters(self, payloads: List[Dict[str, Any]]) -> FilterIndex:
+        return FilterIndex.build(
+            (self._filter_row(payload) for payload in payloads),
+            set_fields=FILTER_SET_FIELDS,
+            flag_fields=FILTER_FLAG_FIELDS
+        )
+
+    @staticmethod
+    def _lexical_text(payload: Dict[str, Any]) -> str:
+        """Текст проекта для BM25: те же поля, что и для векторизации"""
+        return " ".join([
+            payload.get("title") or "",
+            payload.get("description") or "",
+            *(payload.get("technologies") or []),
+            *(payload.get("required_roles") or [])
+        ])
+
+    def _build_lexical(self, payloads: List[Dict[str, Any]]) -> LexicalIndex:
+        return LexicalIndex.build(
+            ((payload["id"], self._lexical_text(payload)) for payload in payloads),
+            k1=settings.SEARCH_BM25_K1,
+            b=settings.SEARCH_BM25_B
+        )
+
+    def _allowed_ids(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        any_filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        id проектов, подходящих под фильтры, или None, если фильтров нет.
+        any_filters - поля-множества, которые должны содержать хотя бы одно из значений.
+        """
+        any_filters = {field: values for field, values in (any_filters or {}).items() if values}
+        if not filters and not any_filters:
+            return None
+        bits = self.filters.mask(**(filters or {}))
+        for field, values in any_filters.items():
+            bits &= self.filters.any_mask(field, values)
+        return self.filters.ids_for_mask(bits)
+
+    def __len__(self) -> int:
+        return len(self.projects)
+
+    def indexed_ids(self) -> List[int]:
+        """id всех объектов индекса"""
+        with self._lock.read():
+            return list(self.projects)
+
+    def get_payload(self, project_id: int) -> Optional[Dict[str, Any]]:
+        """Данные проекта из индекса или None, если его нет в индексе"""
+        return self.projects.get(project_id)
+
     def index_projects(self, projects: List[Project]) -> None:
-        """Индексация проектов"""
+        """Полная индексация проектов"""
         try:
             if not projects:
                 return
 
-            # Очищаем предыдущий индекс
-            self.index = faiss.IndexFlatL2(self.dimension)
-            self.projects = []
+            # Берем сохраненные эмбеддинги, векторизуем только новые и измененные тексты
+            texts = [self._prepare_text(project) for project in projects]
+            vectors, encoded = collect_embeddings(projects, texts, self.engine)
+            ids = np.array([project.id for project in projects], dtype='int64')
 
-            # Подготавливаем тексты проектов
-            texts = []
-            for project in projects:
-                text = f"{project.title} {project.description} {' '.join(project.technologies or [])} {' '.join(project.roles or [])}"
-                texts.append(text)
+            # Собираем новый индекс и подменяем им предыдущий
+            self.replace_index(ids, vectors, [project.dict() for project in projects])
 
-            # Векторизуем тексты
-            vectors = self.model.encode(texts)
-
-            # Добавляем векторы в индекс
-            self.index.add(np.array(vectors).astype('float32'))
-            self.projects = projects
-
-            logger.info(f"Успешно проиндексировано {len(projects)} проектов")
+            logger.info(f"Успешно проиндексировано {len(projects)} проектов (векторизовано заново: {encoded})")
         except Exception as e:
             logger.error(f"Ошибка при индексации проектов: {str(e)}")
             raise
 
-    def search(self, query: str, top_k: int = 10) -> List[Tuple[Dict[str, Any], float]]:
-        """Поиск проектов по запросу"""
+    def replace_index(self, ids: np.ndarray, vectors: np.ndarray, payloads: List[Dict[str, Any]]) -> None:
+        """Сборка нового индекса из готовых векторов и подмена им текущего"""
+        try:
+            index = build_vector_index(vectors.shape[1], ids, vectors)
+            payload_map = {int(item_id): payload for item_id, payload in zip(ids, payloads)}
+            filters = self._build_filters(payloads)
+            lexical = self._build_lexical(payloads)
+            with self._lock.write():
+                self.index = index
+                self.projects = payload_map
+                self.filters = filters
+                self.lexical = lexical
+        except Exception as e:
+            logger.error(f"Ошибка при сборке индекса проектов: {str(e)}")
+            raise
+
+    def embed(self, project: Project) -> Optional[np.ndarray]:
+        """
+        Эмбеддинг проекта: из колонки embedding, а если текст или модель изменились -
+        новый, записанный в колонку. Вызывается до commit, чтобы вектор сохранился вместе с объектом.
+        """
+        try:
+            vectors, _ = collect_embeddings([project], [self._prepare_text(project)], self.engine)
+            return vectors[0]
+        except Exception as e:
+            logger.error(f"Ошибка при векторизации проекта {project.id}: {str(e)}")
+            return None
+
+    def upsert(self, project: Project) -> None:
+        """
+        Добавление или обновление одного проекта в индексе.
+        Ошибка не прерывает запись в БД: индекс будет перестроен при следующем старте.
+        В воркере-читателе общего индекса изменение применит публикатор.
+        """
+        if self.shared_reader:
+            return
+        try:
+            vector = self.embed(project)
+            if vector is None:
+                return
+            with self._lock.write():
+                self._get_index().upsert(project.id, vector, exists=project.id in self.projects)
+                self.projects[project.id] = project.dict()
+                self.filters.upsert(project.id, self._filter_row(self.projects[project.id]))
+                self.lexical.upsert(project.id, self._lexical_text(self.projects[project.id]))
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении проекта {project.id} в индексе: {str(e)}")
+
+    def remove(self, project_id: int) -> None:
+        """Удаление проекта из индекса"""
+        if self.shared_reader:
+            return
+        try:
+            with self._lock.write():
+                if project_id not in self.projects:
+                    return
+                self.index.remove(project_id)
+                del self.projects[project_id]
+                self.filters.remove(project_id)
+                self.lexical.remove(project_id)
+        except Exception as e:
+            logger.error(f"Ошибка при удалении проекта {project_id} из индекса: {str(e)}")
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Поиск проектов по запросу.
+        filters - значения полей FILTER_SET_FIELDS/FILTER_FLAG_FIELDS; поиск идет только
+        среди подходящих проектов общего индекса.
+        """
         try:
             if not self.projects:
                 return []
 
             # Векторизуем запрос
             query_vector = self._vectorize_text(query)
+            return self.search_vector(query_vector, top_k, ef_search=ef_search, nprobe=nprobe, filters=filters)
+        except Exception as e:
+            logger.error(f"Ошибка при поиске проектов: {str(e)}")
+            raise
 
-            # Ищем ближайшие векторы
-            distances, indices = self.index.search(
-                np.array([query_vector]).astype('float32'),
-                min(top_k, len(self.projects))
+    def search_vector(
+        self,
+        query_vector: np.ndarray,
+        top_k: int = 10,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Поиск проектов по готовому вектору запроса"""
+        if not self.projects:
+            return []
+
+        # Ищем ближайшие векторы; оценка - косинусное сходство
+        with self._lock.read():
+            allowed_ids = self._allowed_ids(filters)
+            hits = self.index.search(
+                query_vector, top_k, ef_search=ef_search, nprobe=nprobe, allowed_ids=allowed_ids
             )
 
-            # Формируем результаты
-            results = []
-            for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-                if idx < len(self.projects):
-                    project = self.projects[idx]
-                    similarity = 1 / (1 + distance)  # Преобразуем расстояние в сходство
-                    results.append((project.dict(), similarity))
+        # Формируем результаты
+        results = []
+        for project_id, similarity in hits:
+            project = self.projects.get(project_id)
+            if project is not None:
+                results.append((project, similarity))
 
+        return results
+
+    def hybrid_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        any_filters: Optional[Dict[str, Any]] = None,
+        lexical_hits: Optional[List[Tuple[int, float]]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Гибридный поиск: кандидаты BM25 и векторного индекса сливаются методом RRF.
+        Лексическая часть находит точные названия технологий, которые векторный поиск
+        может пропустить. Оценка результата - RRF, а не косинусное сходство.
+        lexical_hits - готовые лексические кандидаты (полнотекстовый поиск PostgreSQL)
+        вместо BM25 в памяти; фильтры применяются к ним так же, как к векторным.
+        """
+        try:
+            if not self.projects:
+                return []
+
+            candidates = max(top_k, settings.SEARCH_HYBRID_CANDIDATES)
+            query_vector = self._vectorize_text(query)
+            with self._lock.read():
+                allowed_ids = self._allowed_ids(filters, any_filters)
+                fused = self._fuse(query, query_vector, candidates, allowed_ids, lexical_hits)
+
+            results = []
+            for project_id, score in fused:
+                project = self.projects.get(project_id)
+                if project is not None:
+                    results.append((project, score))
+                    if len(results) == top_k:
+                        break
             return results
         except Exception as e:
-            logger.error(f"Ошибка при поиске проектов: {str(e)}")
+            logger.error(f"Ошибка при гибридном поиске проектов: {str(e)}")
+            raise
+
+    def _fuse(
+        self,
+        query: str,
+        query_vector: np.ndarray,
+        candidates: int,
+        allowed_ids: Optional[np.ndarray],
+        lexical_hits: Optional[List[Tuple[int, float]]]
+    ) -> List[Tuple[int, float]]:
+        """Слияние векторных и лексических кандидатов методом RRF; вызывается под блокировкой чтения"""
+        semantic_hits = self.index.search(query_vector, candidates, allowed_ids=allowed_ids)
+        if lexical_hits is None:
+            lexical_hits = self.lexical.search(query, candidates, allowed_ids=allowed_ids)
+        elif allowed_ids is not None:
+            allowed = np.isin([hit[0] for hit in lexical_hits], allowed_ids)
+            lexical_hits = [hit for hit, keep in zip(lexical_hits, allowed) if keep]
+        return reciprocal_rank_fusion([semantic_hits, lexical_hits], k=settings.SEARCH_RRF_K)
+
+    def _ranked_after(
+        self,
+        query: str,
+        count: int,
+        after: Optional[Tuple[str, float, int]] = None,
+        seen: int = 0,
+        filters: Optional[Dict[str, Any]] = None,
+        any_filters: Optional[Dict[str, Any]] = None,
+        lexical_hits: Optional[List[Tuple[int, float]]] = None
+    ) -> List[Tuple[Dict[str, Any], float, str]]:
+        """
+        До count результатов постраничного поиска после позиции after = (часть, оценка, id).
+
+        Порядок выдачи состоит из двух частей. Голова - результаты RRF по спискам кандидатов
+        фиксированной длины SEARCH_HYBRID_CANDIDATES в порядке (оценка RRF, id). Хвост - все
+        остальные подходящие проекты в порядке (косинусное сходство, id). Оценки обеих частей
+        не зависят от глубины страницы, поэтому продолжение идет по предикату (оценка, id)
+        после последнего выданного результата, а не по смещению. Хвост читается из векторного
+        индекса с top_k, расширяемым от seen + count, пока после курсора не наберется count
+        результатов, поэтому стоимость страницы зависит от ее размера и глубины, а не от корпуса.
+        """
+        if not self.projects:
+            return []
+
+        query_vector = self._vectorize_text(query)
+        results: List[Tuple[int, float, str]] = []
+        with self._lock.read():
+            allowed_ids = self._allowed_ids(filters, any_filters)
+            head = self._fuse(query, query_vector, settings.SEARCH_HYBRID_CANDIDATES, allowed_ids, lexical_hits)
+            head.sort(key=lambda hit: (-hit[1], hit[0]))
+
+            if after is None or after[0] == PAGE_HEAD:
+                for project_id, score in head:
+                    if after is None or (-score, project_id) > (-after[1], after[2]):
+                        results.append((project_id, score, PAGE_HEAD))
+                        if len(results) == count:
+                            break
+                after = None
+
+            total = len(self.projects) if allowed_ids is None else len(allowed_ids)
+            if len(results) < count and total > 0:
+                head_ids = {project_id for project_id, _ in head}
+                needed = count - len(results)
+                top_k = min(total, seen + len(head_ids) + needed)
+                while True:
+                    hits = self.index.search(query_vector, top_k, allowed_ids=allowed_ids)
+                    complete = top_k >= total or len(hits) < top_k
+                    # Объекты с той же оценкой, что и последний найденный, могли не войти в top_k
+                    boundary = hits[-1][1] if hits and not complete else None
+                    tail = sorted(
+                        (
+                            (project_id, score) for project_id, score in hits
+                            if project_id not in head_ids
+                            and (boundary is None or score > boundary)
+                            and (after is None or (-score, project_id) > (-after[1], after[2]))
+                        ),
+                        key=lambda hit: (-hit[1], hit[0])
+                    )
+                    if len(tail) >= needed or complete:
+                        break
+                    top_k = min(total, top_k * 2)
+                results.extend((project_id, score, PAGE_TAIL) for project_id, score in tail[:needed])
+
+            return [
+                (self.projects[project_id], score, part)
+                for project_id, score, part in results if project_id in self.projects
+            ]
+
+    def search_range(
+        self,
+        query: str,
+        skip: int = 0,
+        limit: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        any_filters: Optional[Dict[str, Any]] = None,
+        lexical_hits: Optional[List[Tuple[int, float]]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Результаты постраничного поиска со смещением: тот же порядок, что и у страниц по курсору,
+        без ограничения глубины. Стоимость растет со смещением, для глубоких страниц нужен курсор.
+        """
+        hits = self._ranked_after(
+            query, skip + limit, filters=filters, any_filters=any_filters, lexical_hits=lexical_hits
+        )
+        return [(project, score) for project, score, _ in hits[skip:]]
+
+    def search_page(
+        self,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        any_filters: Optional[Dict[str, Any]] = None,
+        lexical_hits: Optional[List[Tuple[int, float]]] = None
+    ) -> Tuple[List[Tuple[Dict[str, Any], float]], Optional[str]]:
+        """
+        Страница гибридного поиска и курсор следующей страницы (None - результатов больше нет).
+
+        Курсор хранит ключ запроса, часть выдачи, оценку и id последнего результата и число
+        выданных результатов; следующая страница продолжается после них (_ranked_after).
+        Изменения индекса между страницами не делают курсор недействительным. Как и при
+        пагинации по ключу в БД, новые результаты выше курсора не попадут в выдачу, а в голове,
+        где оценка RRF зависит от рангов, вставка может сдвинуть выданные результаты за курсор
+        и повторить их.
+        Вектор запроса берется из кэша запросов, а из БД читается только сама страница.
+        """
+        key = query_key(self.engine.model_name, query, {**(filters or {}), **(any_filters or {})})
+        state = decode_cursor(cursor, key) if cursor else None
+        after = (state.get("p", PAGE_HEAD), state["s"], state["i"]) if state else None
+        seen = state["n"] if state else 0
+
+        hits = self._ranked_after(
+            query, limit + 1, after=after, seen=seen,
+            filters=filters, any_filters=any_filters, lexical_hits=lexical_hits
+        )
+        page = hits[:limit]
+        next_cursor = None
+        if len(hits) > limit:
+            last_project, last_score, last_part = page[-1]
+            next_cursor = encode_cursor(key, last_score, last_project["id"], seen + len(page), part=last_part)
+        return [(project, score) for project, score, _ in page], next_cursor
+
+    # Асинхронные обертки: векторизация запроса и поиск выполняются в пуле, а не в цикле событий
+
+    async def search_async(self, *args: Any, **kwargs: Any) -> List[Tuple[Dict[str, Any], float]]:
+        return await inference_executor.run(self.search, *args, **kwargs)
+
+    async def hybrid_search_async(self, *args: Any, **kwargs: Any) -> List[Tuple[Dict[str, Any], float]]:
+        return await inference_executor.run(self.hybrid_search, *args, **kwargs)
+
+    async def search_page_async(self, *args: Any, **kwargs: Any) -> Tuple[List[Tuple[Dict[str, Any], float]], Optional[str]]:
+        return await inference_executor.run(self.search_page, *args, **kwargs)
+
+    def save_snapshot(self, fingerprint: Optional[Dict[str, Any]] = None) -> str:
+        """Сохранение снимка индекса и карты id на диск"""
+        meta = dict(fingerprint or {})
+        meta["model"] = self.engine.model_name
+        meta["encoder"] = self.engine.encoder.kind
+        with self._lock.read():
+            index = self._get_index()
+            meta["dimension"] = index.dimension
+            meta["vector_index"] = index.state()
+            self.snapshot_version = self.snapshot_store.save(
+                index, list(self.projects), list(self.projects.values()), meta
+            )
+        self.snapshot_meta = meta
+        return self.snapshot_version
+
+    def load_snapshot(self) -> bool:
+        """Загрузка последнего снимка индекса, отображенного в память"""
+        snapshot = self.snapshot_store.load()
+        if snapshot is None or not is_snapshot_compatible(snapshot.meta, self.engine):
+            return False
+
+        filters = self._build_filters(snapshot.payloads)
+        # Лексический индекс не входит в снимок: он строится по данным проектов без векторизации
+        lexical = self._build_lexical(snapshot.payloads)
+        with self._lock.write():
+            self.index = snapshot.index
+            self.projects = dict(zip(snapshot.ids, snapshot.payloads))
+            self.filters = filters
+            self.lexical = lexical
+        self.snapshot_version = snapshot.version
+        self.snapshot_meta = snapshot.meta
+        logger.info(f"Загружен снимок индекса проектов {snapshot.version}: {len(self.projects)} проектов")
+        return True
+
+    def warm_start(self, db: Session) -> None:
+        """Загрузка снимка при старте воркера с переиндексацией, если он устарел"""
+        try:
+            fingerprint = table_fingerprint(db, Project)
+            if self.load_snapshot() and (self.shared_reader or not is_snapshot_stale(self.snapshot_meta, fingerprint)):
+                # Устаревший снимок читатель не перестраивает: новую версию опубликует публикатор
+                return
+
+            logger.info("Снимок индекса проектов отсутствует или устарел, выполняется переиндексация")
+            self.index_projects(db.query(Project).options(undefer(Project.embedding)).all())
+            # Сохраняем посчитанные эмбеддинги, чтобы следующая перестройка не векторизовала их заново;
+            # updated_at при этом не меняется, поэтому отпечаток таблицы остается прежним
+            db.commit()
+            if not self.shared_reader:
+                self.save_snapshot(fingerprint)
+        except Exception as e:
+            logger.error(f"Ошибка при загрузке индекса проектов: {str(e)}")
             raise
 
 # Создаем глобальный экземпляр сервиса
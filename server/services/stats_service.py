@@ -0,0 +1,172 @@
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import String, case, cast, func, literal, select, text, true, union_all
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+from core.config import settings
+from models.project import Project
+from models.user import User
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Материализованное представление из миграции c8f1e5a2b6d4
+STATS_VIEW = "entity_stats"
+
+# Ключ pg_try_advisory_xact_lock: представление за цикл обновляет один воркер
+REFRESH_LOCK_KEY = 7215025
+
+# Поля-массивы, значения которых подсчитываются: (сущность, поле, колонка)
+ARRAY_FIELDS = (
+    ("project", "technologies", Project.technologies),
+    ("project", "required_roles", Project.required_roles),
+    ("user", "skills", User.skills),
+    ("user", "roles", User.roles),
+)
+
+
+class StatsService:
+    """
+    Статистика проектов и пользователей, посчитанная в БД группировкой.
+
+    Строки статистики - (сущность, поле, значение, количество): распределение проектов
+    по статусу, пользователей по активности и значения массивов технологий, ролей и навыков
+    (GROUP BY по jsonb_array_elements_text). В PostgreSQL при STATS_MATERIALIZED=true строки
+    читаются из материализованного представления, размер которого зависит от числа различных
+    значений, а не от размера таблиц; фоновый поток обновляет его раз в
+    STATS_REFRESH_INTERVAL_SECONDS без блокировки чтения (REFRESH ... CONCURRENTLY).
+    В остальных случаях те же группировки выполняются при запросе.
+    """
+
+    def __init__(self, refresh_interval: Optional[float] = None) -> None:
+        self.refresh_interval = refresh_interval or settings.STATS_REFRESH_INTERVAL_SECONDS
+        self.last_refresh: Optional[datetime] = None
+        self.refreshes = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def materialized(self, db: Session) -> bool:
+        return settings.STATS_MATERIALIZED and db.get_bind().dialect.name == "postgresql"
+
+    def _array_counts(self, db: Session, entity: str, field: str, column: Any) -> Any:
+        # None в JSON-колонке хранится как JSON null, а не NULL: разворачиваются только массивы
+        if db.get_bind().dialect.name == "postgresql":
+            array = cast(column, JSONB)
+            array = case((func.jsonb_typeof(array) == "array", array), else_=cast(literal("[]"), JSONB))
+            elements = func.jsonb_array_elements_text(array).table_valued("value")
+        else:
+            array = case((func.json_type(column) == "array", column), else_="[]")
+            elements = func.json_each(array).table_valued("value")
+        value = cast(elements.c.value, String)
+        return select(
+            literal(entity).label("entity"), literal(field).label("field"), value.label("value"), func.count().label("count")
+        ).select_from(column.table).join(elements, true()).where(value.isnot(None)).group_by(value)
+
+    def _live_rows(self, db: Session) -> List[Tuple[str, str, str, int]]:
+        """Строки статистики, посчитанные группировкой по таблицам"""
+        status = func.coalesce(Project.status, "unknown")
+        active = case((User.is_active == true(), "true"), else_="false")
+        parts = [
+            select(literal("project"), literal("status"), status, func.count()).select_from(Project).group_by(status),
+            select(literal("user"), literal("is_active"), active, func.count()).select_from(User).group_by(active),
+        ]
+        parts.extend(self._array_counts(db, entity, field, column) for entity, field, column in ARRAY_FIELDS)
+        return [tuple(row) for row in db.execute(union_all(*parts)).all()]
+
+    def get(self, db: Session) -> Dict[str, Any]:
+        """Сводная статистика проектов и пользователей"""
+        try:
+            if self.materialized(db):
+                rows = db.execute(text(f"SELECT entity, field, value, count FROM {STATS_VIEW}")).all()
+                meta = [row for row in rows if row[0] == "meta"]
+                refreshed_at = meta[0][2] if meta else None
+                return self._assemble(rows, refreshed_at, materialized=True)
+            return self._assemble(self._live_rows(db), datetime.utcnow().isoformat(), materialized=False)
+        except Exception as e:
+            logger.error(f"Ошибка при расчете статистики: {str(e)}")
+            raise
+
+    def _assemble(self, rows: List[Any], refreshed_at: Optional[str], materialized: bool) -> Dict[str, Any]:
+        counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+        for entity, field, value, count in rows:
+            counts.setdefault((entity, field), {})[value] = int(count)
+
+        def ranked(entity: str, field: str) -> Dict[str, int]:
+            values = counts.get((entity, field), {})
+            return dict(sorted(values.items(), key=lambda item: (-item[1], item[0])))
+
+        by_status = ranked("project", "status")
+        activity = counts.get(("user", "is_active"), {})
+        return {
+            "projects": {
+                "total": sum(by_status.values()),
+                "by_status": by_status,
+                "technologies": ranked("project", "technologies"),
+                "required_roles": ranked("project", "required_roles")
+            },
+            "users": {
+                "total": sum(activity.values()),
+                "active": activity.get("true", 0),
+                "skills": ranked("user", "skills"),
+                "roles": ranked("user", "roles")
+            },
+            "materialized": materialized,
+            "refreshed_at": refreshed_at
+        }
+
+    def refresh(self, db: Session) -> bool:
+        """
+        Обновление материализованного представления; False, если его обновляет другой воркер
+        или представление не используется
+        """
+        if not self.materialized(db):
+            return False
+        try:
+            if not db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": REFRESH_LOCK_KEY}).scalar():
+                db.rollback()
+                return False
+            db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {STATS_VIEW}"))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.errors += 1
+            logger.error(f"Ошибка при обновлении статистики: {str(e)}")
+            raise
+        self.last_refresh = datetime.utcnow()
+        self.refreshes += 1
+        return True
+
+    def _run(self, session_factory: Callable[[], Session]) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            db = session_factory()
+            try:
+                self.refresh(db)
+            except Exception:
+                # Ошибка уже записана в лог; следующая попытка - в следующем цикле
+                pass
+            finally:
+                db.close()
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Запуск фонового обновления представления"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(session_factory,), name="stats-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "refresh_interval": self.refresh_interval,
+            "last_refresh": self.last_refresh.isoformat() if self.last_refresh else None,
+            "refreshes": self.refreshes,
+            "errors": self.errors
+        }
+
+# Создаем глобальный экземпляр сервиса
+stats_service = StatsService()
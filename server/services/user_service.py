@@ -221,14 +221,19 @@ class UserService:
         } 
         '''
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, and_, case, func, literal, text
 from fastapi import HTTPException, status
 from models.user import User
 from schemas.user import UserCreate, UserUpdate
 from core.security import verify_password, get_password_hash
 from core.config import settings
+from core.database import json_array_contains
+from services.search_cursor import query_key, encode_cursor, decode_cursor
+from services.stats_service import stats_service
+from services.profile_search import profile_search
+from services.match_table import match_table, MATCH_USER
 
 class UserService:
     def __init__(self, db: Session):
@@ -247,8 +252,11 @@ class UserService:
         hashed_password = get_password_hash(user_create.password)
         db_user = User(email=user_create.email, password=hashed_password, full_name=user_create.full_name)
         self.db.add(db_user)
+        profile_search.embed(db_user)
         self.db.commit()
         self.db.refresh(db_user)
+        profile_search.upsert(db_user)
+        match_table.mark_changed(MATCH_USER, db_user.id)
         return db_user
 
     def get_user_by_email(self, email: str):
@@ -262,8 +270,11 @@ class UserService:
             db_user.email = user_update.email
         if user_update.full_name:
             db_user.full_name = user_update.full_name
+        profile_search.embed(db_user)
         self.db.commit()
         self.db.refresh(db_user)
+        profile_search.upsert(db_user)
+        match_table.mark_changed(MATCH_USER, db_user.id)
         return db_user
 
     def delete_user(self, user_id: int):
@@ -272,4 +283,90 @@ class UserService:
             raise HTTPException(status_code=404, detail="User not found")
         self.db.delete(db_user)
         self.db.commit()
+        profile_search.remove(user_id)
+        match_table.mark_changed(MATCH_USER, user_id)
         return {"message": "User deleted successfully"}
+
+    def search_users(
+        self,
+        query: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        role: Optional[str] = None,
+        limit: int = 100
+    ) -> List[User]:
+        """Первая страница поиска пользователей, упорядоченная по сходству с запросом"""
+        users, _ = self.search_users_page(query, skills, role, limit=limit)
+        return users
+
+    def search_users_page(
+        self,
+        query: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        role: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        """
+        Нечеткий поиск пользователей по имени пользователя и email с пагинацией по курсору.
+        В PostgreSQL кандидаты отбираются оператором <% по GIN-индексам триграмм (pg_trgm),
+        поэтому опечатки и части email находятся без полного просмотра таблицы.
+        Результаты упорядочены по (сходство, id), курсор хранит эту пару для последней записи.
+        """
+        filters = []
+        if skills:
+            filters.append(json_array_contains(self.db, User.skills, skills))
+        if role:
+            filters.append(json_array_contains(self.db, User.roles, [role]))
+
+        key = query_key("users", query or "", {"skills": skills, "role": role})
+        state = decode_cursor(cursor, key) if cursor else None
+        if query:
+            score = self._user_search_score(query)
+            filters.append(self._user_search_match(query))
+        else:
+            score = literal(0.0)
+        if state:
+            filters.append(or_(score < state["s"], and_(score == state["s"], User.id > state["i"])))
+
+        # Одна лишняя запись показывает, есть ли следующая страница
+        rows = self.db.query(User, score.label("score")).filter(*filters).order_by(
+            score.desc(), User.id
+        ).limit(limit + 1).all()
+        users = [user for user, _ in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last_user, last_score = rows[limit - 1]
+            seen = (state["n"] if state else 0) + limit
+            next_cursor = encode_cursor(key, float(last_score), last_user.id, seen)
+        return users, next_cursor
+
+    def _user_search_score(self, query: str) -> Any:
+        """Сходство запроса с именем пользователя или email: word_similarity из pg_trgm"""
+        by_username = func.word_similarity(query, func.coalesce(User.username, ""))
+        by_email = func.word_similarity(query, func.coalesce(User.email, ""))
+        return case((by_username >= by_email, by_username), else_=by_email)
+
+    def _user_search_match(self, query: str) -> Any:
+        """Условие отбора кандидатов; в PostgreSQL - индексируемый оператор <%"""
+        threshold = settings.USER_SEARCH_SIMILARITY_THRESHOLD
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Порог оператора <% задается настройкой pg_trgm только для текущей транзакции
+            self.db.execute(
+                text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+                {"threshold": str(threshold)}
+            )
+            return or_(literal(query).op("<%")(User.username), literal(query).op("<%")(User.email))
+        return or_(
+            func.word_similarity(query, User.username) >= threshold,
+            func.word_similarity(query, User.email) >= threshold
+        )
+
+    def get_user_stats(self) -> Dict[str, Any]:
+        """Статистика пользователей: группировка в БД вместо подсчета по загруженным записям"""
+        stats = stats_service.get(self.db)["users"]
+        return {
+            "total_users": stats["total"],
+            "active_users": stats["active"],
+            "skill_distribution": stats["skills"],
+            "role_distribution": stats["roles"]
+        }
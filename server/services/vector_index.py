@@ -0,0 +1,598 @@
+from typing import List, Tuple, Dict, Any, Optional, Set
+from core.config import settings
+import numpy as np
+import os
+import logging
+
+try:
+    import faiss
+except ImportError:
+    # Без FAISS доступен только NumPy-бэкенд
+    faiss = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND_FAISS = "faiss"
+BACKEND_NUMPY = "numpy"
+BACKENDS = (BACKEND_FAISS, BACKEND_NUMPY)
+
+INDEX_FLAT = "flat"
+INDEX_HNSW = "hnsw"
+INDEX_IVFPQ = "ivfpq"
+INDEX_TYPES = (INDEX_FLAT, INDEX_HNSW, INDEX_IVFPQ)
+
+# Представление векторов в плоском индексе и HNSW (IVF-PQ всегда хранит коды PQ)
+STORAGE_FLOAT32 = "float32"
+STORAGE_FLOAT16 = "float16"
+STORAGE_INT8 = "int8"
+STORAGE_PQ = "pq"
+STORAGE_TYPES = (STORAGE_FLOAT32, STORAGE_FLOAT16, STORAGE_INT8, STORAGE_PQ)
+
+# Метки для повторно добавленных векторов в индексах без физического удаления
+ALIAS_LABEL_BASE = 1 << 48
+
+# Минимальное число точек на центроид при обучении k-means в FAISS
+MIN_POINTS_PER_CENTROID = 39
+
+FAISS_INDEX_FILE = "index.faiss"
+NUMPY_VECTORS_FILE = "vectors.npy"
+NUMPY_IDS_FILE = "ids.npy"
+
+
+def choose_backend(backend: Optional[str] = None) -> str:
+    """Выбор бэкенда по конфигурации: при auto используется FAISS, если он установлен"""
+    backend = backend or settings.SEARCH_BACKEND
+    if backend == "auto":
+        return BACKEND_FAISS if faiss is not None else BACKEND_NUMPY
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд поиска: {backend}")
+    if backend == BACKEND_FAISS and faiss is None:
+        raise ValueError("Бэкенд faiss недоступен: пакет faiss-cpu не установлен")
+    return backend
+
+
+def choose_index_type(size: int) -> str:
+    """Выбор типа индекса по конфигурации и размеру корпуса"""
+    index_type = settings.SEARCH_INDEX_TYPE
+    if index_type == "auto":
+        return settings.SEARCH_ANN_INDEX_TYPE if size >= settings.SEARCH_ANN_THRESHOLD else INDEX_FLAT
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Неизвестный тип индекса: {index_type}")
+    return index_type
+
+
+def choose_storage(storage: Optional[str] = None) -> str:
+    storage = storage or settings.SEARCH_VECTOR_STORAGE
+    if storage not in STORAGE_TYPES:
+        raise ValueError(f"Неизвестный формат хранения векторов: {storage}")
+    return storage
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-нормализация, после которой скалярное произведение равно косинусному сходству"""
+    vectors = np.array(vectors, dtype='float32', ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+class VectorIndex:
+    """
+    Интерфейс индекса нормализованных эмбеддингов с доступом по внешнему id.
+
+    Оценки в результатах поиска - косинусное сходство. Реализации сохраняют себя
+    в директорию снимка (write) и восстанавливаются из нее (read) по состоянию state().
+    """
+    backend = ""
+
+    def __init__(self, dimension: int, index_type: str = INDEX_FLAT, storage: str = STORAGE_FLOAT32) -> None:
+        self.dimension = dimension
+        self.index_type = index_type
+        self.storage = storage
+        self.mmapped = False
+
+    @classmethod
+    def build(
+        cls,
+        dimension: int,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+        index_type: Optional[str] = None,
+        storage: Optional[str] = None
+    ) -> "VectorIndex":
+        raise NotImplementedError
+
+    @classmethod
+    def read(cls, directory: str, state: Dict[str, Any], mmap: bool = True) -> "VectorIndex":
+        raise NotImplementedError
+
+    def write(self, directory: str) -> None:
+        raise NotImplementedError
+
+    def state(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def memory_bytes(self) -> int:
+        raise NotImplementedError
+
+    def upsert(self, item_id: int, vector: np.ndarray, exists: bool) -> None:
+        raise NotImplementedError
+
+    def remove(self, item_id: int) -> None:
+        raise NotImplementedError
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        allowed_ids: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        raise NotImplementedError
+
+
+class FaissVectorIndex(VectorIndex):
+    """
+    Индекс FAISS по скалярному произведению нормализованных векторов.
+
+    Поддерживаются точный плоский индекс, HNSW и IVF-PQ. Векторы в плоском индексе и HNSW
+    хранятся как float32, float16, int8 (скалярное квантование) или коды PQ. Оценки в
+    результатах поиска - косинусное сходство. HNSW не умеет удалять векторы, поэтому удаленные и замененные
+    векторы помечаются и отфильтровываются при поиске до следующей полной перестройки.
+    """
+    backend = BACKEND_FAISS
+
+    def __init__(
+        self,
+        dimension: int,
+        index_type: str = INDEX_FLAT,
+        index: Optional[Any] = None,
+        storage: str = STORAGE_FLOAT32
+    ) -> None:
+        super().__init__(dimension, index_type, storage)
+        self.index = index if index is not None else self._create(index_type, storage=storage)
+        # Метка вектора в FAISS, если она отличается от внешнего id
+        self._labels: Dict[int, int] = {}
+        self._owners: Dict[int, int] = {}
+        self._tombstones: Set[int] = set()
+        self._next_label = ALIAS_LABEL_BASE
+
+    def _create(self, index_type: str, nlist: Optional[int] = None, storage: str = STORAGE_FLOAT32) -> Any:
+        metric = faiss.METRIC_INNER_PRODUCT
+        scalar_types = {
+            STORAGE_FLOAT16: faiss.ScalarQuantizer.QT_fp16,
+            STORAGE_INT8: faiss.ScalarQuantizer.QT_8bit
+        }
+        if index_type == INDEX_FLAT:
+            if storage in scalar_types:
+                base = faiss.IndexScalarQuantizer(self.dimension, scalar_types[storage], metric)
+            elif storage == STORAGE_PQ:
+                base = faiss.IndexPQ(self.dimension, settings.SEARCH_PQ_M, 8, metric)
+            else:
+                base = faiss.IndexFlatIP(self.dimension)
+        elif index_type == INDEX_HNSW:
+            if storage in scalar_types:
+                base = faiss.IndexHNSWSQ(self.dimension, scalar_types[storage], settings.SEARCH_HNSW_M, metric)
+            elif storage == STORAGE_PQ:
+                base = faiss.IndexHNSWPQ(self.dimension, settings.SEARCH_PQ_M, settings.SEARCH_HNSW_M, 8, metric)
+            else:
+                base = faiss.IndexHNSWFlat(self.dimension, settings.SEARCH_HNSW_M, metric)
+            base.hnsw.efConstruction = settings.SEARCH_HNSW_EF_CONSTRUCTION
+            base.hnsw.efSearch = settings.SEARCH_HNSW_EF_SEARCH
+        elif index_type == INDEX_IVFPQ:
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            base = faiss.IndexIVFPQ(
+                quantizer,
+                self.dimension,
+                nlist or settings.SEARCH_IVF_NLIST,
+                settings.SEARCH_PQ_M,
+                8,
+                faiss.METRIC_INNER_PRODUCT
+            )
+            base.nprobe = settings.SEARCH_IVF_NPROBE
+        else:
+            raise ValueError(f"Неизвестный тип индекса: {index_type}")
+        return faiss.IndexIDMap2(base)
+
+    @classmethod
+    def build(
+        cls,
+        dimension: int,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+        index_type: Optional[str] = None,
+        storage: Optional[str] = None
+    ) -> "FaissVectorIndex":
+        """Построение индекса по всему корпусу с выбором типа по его размеру"""
+        index_type = index_type or choose_index_type(len(ids))
+        storage = choose_storage(storage)
+        vector_index = cls(dimension, INDEX_FLAT)
+        vectors = normalize(vectors)
+
+        if index_type == INDEX_IVFPQ:
+            nlist = min(settings.SEARCH_IVF_NLIST, len(ids) // MIN_POINTS_PER_CENTROID)
+            if nlist < 1 or len(ids) < 256 * MIN_POINTS_PER_CENTROID:
+                logger.warning(f"Недостаточно данных для обучения IVF-PQ ({len(ids)}), используется точный индекс")
+                index_type = INDEX_FLAT
+            else:
+                vector_index.index = vector_index._create(INDEX_IVFPQ, nlist)
+                storage = STORAGE_PQ
+        if storage == STORAGE_PQ and index_type != INDEX_IVFPQ and len(ids) < 256 * MIN_POINTS_PER_CENTROID:
+            logger.warning(f"Недостаточно данных для обучения PQ ({len(ids)}), векторы хранятся как float32")
+            storage = STORAGE_FLOAT32
+        if index_type != INDEX_IVFPQ and (index_type != INDEX_FLAT or storage != STORAGE_FLOAT32):
+            vector_index.index = vector_index._create(index_type, storage=storage)
+        if not vector_index.index.is_trained:
+            vector_index.index.train(vectors)
+
+        vector_index.index_type = index_type
+        vector_index.storage = storage
+        vector_index.index.add_with_ids(vectors, np.asarray(ids, dtype='int64'))
+        return vector_index
+
+    @classmethod
+    def from_snapshot(cls, index: Any, state: Dict[str, Any], dimension: int) -> "FaissVectorIndex":
+        """Восстановление индекса из снимка, загруженного через mmap"""
+        vector_index = cls(
+            dimension, state.get("index_type", INDEX_FLAT), index, state.get("storage", STORAGE_FLOAT32)
+        )
+        vector_index.mmapped = True
+        vector_index._labels = dict(state.get("labels", {}))
+        vector_index._owners = {label: item_id for item_id, label in vector_index._labels.items()}
+        vector_index._tombstones = set(state.get("tombstones", ()))
+        vector_index._next_label = state.get("next_label", ALIAS_LABEL_BASE)
+        return vector_index
+
+    @classmethod
+    def read(cls, directory: str, state: Dict[str, Any], mmap: bool = True) -> "FaissVectorIndex":
+        """
+        Чтение индекса из директории снимка (по умолчанию через mmap).
+        IO_FLAG_MMAP_IFC отображает коды векторов из файла без копирования, и страницы
+        снимка общие для всех воркеров хоста; IO_FLAG_MMAP, наоборот, копирует их
+        в анонимную память процесса. В версиях faiss без MMAP_IFC индекс читается в память.
+        """
+        mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+        mmap = mmap and mmap_flag is not None
+        flags = mmap_flag | faiss.IO_FLAG_READ_ONLY if mmap else 0
+        index = faiss.read_index(os.path.join(directory, FAISS_INDEX_FILE), flags)
+        vector_index = cls.from_snapshot(index, state, index.d)
+        vector_index.mmapped = mmap
+        return vector_index
+
+    def write(self, directory: str) -> None:
+        faiss.write_index(self.index, os.path.join(directory, FAISS_INDEX_FILE))
+
+    def state(self) -> Dict[str, Any]:
+        """Состояние, которое нужно сохранить в снимке вместе с индексом FAISS"""
+        return {
+            "backend": self.backend,
+            "index_type": self.index_type,
+            "storage": self.storage,
+            "labels": dict(self._labels),
+            "tombstones": sorted(self._tombstones),
+            "next_label": self._next_label
+        }
+
+    @property
+    def supports_removal(self) -> bool:
+        return self.index_type != INDEX_HNSW
+
+    @property
+    def fragmentation(self) -> float:
+        """Доля помеченных как удаленные векторов в индексе"""
+        return len(self._tombstones) / self.index.ntotal if self.index.ntotal else 0.0
+
+    def __len__(self) -> int:
+        return self.index.ntotal - len(self._tombstones)
+
+    def memory_bytes(self) -> int:
+        """Размер сериализованного индекса - оценка занимаемой им памяти"""
+        return int(faiss.serialize_index(self.index).size)
+
+    def _ensure_writable(self) -> None:
+        """Копирование индекса в память перед первым изменением снимка, загруженного через mmap"""
+        if self.mmapped:
+            self.index = faiss.clone_index(self.index)
+            self.mmapped = False
+
+    def _discard(self, item_id: int) -> None:
+        """Удаление текущего вектора объекта (в HNSW - пометка как удаленного)"""
+        label = self._labels.pop(item_id, item_id)
+        self._owners.pop(label, None)
+        if self.supports_removal:
+            self.index.remove_ids(np.array([label], dtype='int64'))
+        else:
+            self._tombstones.add(label)
+
+    def upsert(self, item_id: int, vector: np.ndarray, exists: bool) -> None:
+        """Добавление или замена вектора объекта"""
+        self._ensure_writable()
+        if exists:
+            self._discard(item_id)
+
+        label = item_id
+        if label in self._tombstones:
+            # Старый вектор с этой меткой остался в индексе, новому нужна своя метка
+            label = self._next_label
+            self._next_label += 1
+            self._labels[item_id] = label
+            self._owners[label] = item_id
+        self.index.add_with_ids(normalize(vector), np.array([label], dtype='int64'))
+
+    def remove(self, item_id: int) -> None:
+        """Удаление вектора объекта"""
+        self._ensure_writable()
+        self._discard(item_id)
+
+    def _search_params(
+        self,
+        ef_search: Optional[int],
+        nprobe: Optional[int],
+        selector: Optional[Any] = None
+    ) -> Optional[Any]:
+        if self.index_type == INDEX_HNSW and (ef_search or selector is not None):
+            params = faiss.SearchParametersHNSW()
+            params.efSearch = ef_search or settings.SEARCH_HNSW_EF_SEARCH
+        elif self.index_type == INDEX_IVFPQ and (nprobe or selector is not None):
+            params = faiss.SearchParametersIVF()
+            params.nprobe = nprobe or settings.SEARCH_IVF_NPROBE
+        elif selector is not None:
+            params = faiss.SearchParameters()
+        else:
+            return None
+        if selector is not None:
+            params.sel = selector
+        return params
+
+    def _labels_for(self, item_ids: np.ndarray) -> np.ndarray:
+        """Метки FAISS для внешних id с учетом переназначенных меток"""
+        labels = np.asarray(item_ids, dtype='int64').copy()
+        if self._labels:
+            aliased = np.isin(labels, np.fromiter(self._labels, dtype='int64', count=len(self._labels)))
+            labels[aliased] = [self._labels[int(item_id)] for item_id in labels[aliased]]
+        return labels
+
+    def _search_exact(self, query: np.ndarray, labels: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """Точный перебор небольшого подмножества векторов"""
+        vectors = self.index.reconstruct_batch(labels)
+        scores = vectors @ normalize(query)[0]
+        k = min(top_k, len(labels))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._owners.get(int(labels[i]), int(labels[i])), float(scores[i])) for i in top]
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        allowed_ids: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Поиск top_k ближайших объектов; возвращает пары (id, косинусное сходство).
+        allowed_ids ограничивает поиск подмножеством объектов (результат фильтров).
+        """
+        if self.index.ntotal == 0 or top_k <= 0:
+            return []
+
+        # Запрашиваем с запасом на помеченные как удаленные векторы
+        selector = None
+        k = min(top_k + len(self._tombstones), self.index.ntotal)
+        if allowed_ids is not None:
+            if len(allowed_ids) == 0:
+                return []
+            labels = self._labels_for(allowed_ids)
+            # Графовый поиск с жестким фильтром теряет полноту, небольшие подмножества перебираем точно
+            if self.index_type == INDEX_HNSW and len(labels) <= settings.SEARCH_FILTER_EXACT_THRESHOLD:
+                return self._search_exact(query, labels, top_k)
+            selector = faiss.IDSelectorBatch(labels)
+            k = min(top_k, len(labels))
+
+        params = self._search_params(ef_search, nprobe, selector)
+        scores, labels = self.index.search(normalize(query), k, params=params)
+
+        results = []
+        for score, label in zip(scores[0], labels[0]):
+            label = int(label)
+            if label < 0 or label in self._tombstones:
+                continue
+            results.append((self._owners.get(label, label), float(score)))
+            if len(results) == top_k:
+                break
+        return results
+
+
+class NumpyVectorIndex(VectorIndex):
+    """
+    Точный поиск на NumPy без нативных зависимостей.
+
+    Векторы лежат в непрерывной матрице float32 в порядке добавления,
+    удаление переносит последнюю строку на место удаленной. Поиск - умножение матрицы
+    на запрос блоками по SEARCH_NUMPY_BLOCK_ROWS строк и отбор top-k через argpartition
+    в каждом блоке, поэтому временные массивы не растут вместе с корпусом. Сжатые форматы
+    хранения не поддерживаются: преобразование float16 в NumPy медленнее самого умножения.
+    """
+    backend = BACKEND_NUMPY
+
+    def __init__(self, dimension: int) -> None:
+        super().__init__(dimension, INDEX_FLAT, STORAGE_FLOAT32)
+        self._vectors = np.empty((0, dimension), dtype='float32')
+        self._ids = np.empty(0, dtype='int64')
+        self._size = 0
+        self._rows: Dict[int, int] = {}
+        # Отсортированные id и их строки для векторного поиска строк по списку id
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def build(
+        cls,
+        dimension: int,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+        index_type: Optional[str] = None,
+        storage: Optional[str] = None
+    ) -> "NumpyVectorIndex":
+        """Построение индекса по всему корпусу; поддерживается только точный поиск"""
+        if index_type not in (None, INDEX_FLAT):
+            logger.warning(f"Бэкенд numpy не поддерживает индекс {index_type}, используется точный поиск")
+        storage = choose_storage(storage)
+        if storage != STORAGE_FLOAT32:
+            logger.warning(f"Бэкенд numpy не поддерживает хранение {storage}, векторы хранятся как float32")
+
+        vector_index = cls(dimension)
+        vector_index._vectors = np.ascontiguousarray(normalize(vectors))
+        vector_index._ids = np.array(ids, dtype='int64')
+        vector_index._size = len(vector_index._ids)
+        vector_index._rows = {item_id: row for row, item_id in enumerate(vector_index._ids.tolist())}
+        return vector_index
+
+    @classmethod
+    def read(cls, directory: str, state: Dict[str, Any], mmap: bool = True) -> "NumpyVectorIndex":
+        """Чтение матрицы из директории снимка (по умолчанию через mmap)"""
+        vectors = np.load(os.path.join(directory, NUMPY_VECTORS_FILE), mmap_mode="r" if mmap else None)
+        vector_index = cls(vectors.shape[1])
+        vector_index._vectors = vectors
+        vector_index._ids = np.load(os.path.join(directory, NUMPY_IDS_FILE))
+        vector_index._size = len(vector_index._ids)
+        vector_index._rows = {item_id: row for row, item_id in enumerate(vector_index._ids.tolist())}
+        vector_index.mmapped = mmap
+        return vector_index
+
+    def write(self, directory: str) -> None:
+        np.save(os.path.join(directory, NUMPY_VECTORS_FILE), self._vectors[:self._size])
+        np.save(os.path.join(directory, NUMPY_IDS_FILE), self._ids[:self._size])
+
+    def state(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "index_type": self.index_type, "storage": self.storage}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def memory_bytes(self) -> int:
+        return int(self._vectors[:self._size].nbytes + self._ids[:self._size].nbytes)
+
+    def _reserve(self, rows: int) -> None:
+        """Увеличение емкости матрицы с запасом; копия также отвязывает ее от mmap"""
+        if rows <= len(self._vectors) and not self.mmapped:
+            return
+        capacity = max(rows, 2 * len(self._vectors), 8) if rows > len(self._vectors) else len(self._vectors)
+        vectors = np.empty((capacity, self.dimension), dtype='float32')
+        vectors[:self._size] = self._vectors[:self._size]
+        ids = np.empty(capacity, dtype='int64')
+        ids[:self._size] = self._ids[:self._size]
+        self._vectors, self._ids = vectors, ids
+        self.mmapped = False
+
+    def upsert(self, item_id: int, vector: np.ndarray, exists: bool) -> None:
+        """Добавление или замена вектора объекта"""
+        row = self._rows.get(item_id)
+        if row is None:
+            self._reserve(self._size + 1)
+            row = self._size
+            self._size += 1
+            self._rows[item_id] = row
+            self._ids[row] = item_id
+            self._sorted = None
+        else:
+            self._reserve(self._size)
+        self._vectors[row] = normalize(vector)[0]
+
+    def remove(self, item_id: int) -> None:
+        """Удаление вектора объекта: на его место переносится последняя строка"""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return
+        self._reserve(self._size)
+        last = self._size - 1
+        if row != last:
+            moved = int(self._ids[last])
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._size = last
+        self._sorted = None
+
+    def _rows_for(self, item_ids: np.ndarray) -> np.ndarray:
+        """Строки матрицы для внешних id; отсутствующие в индексе id пропускаются"""
+        if self._sorted is None:
+            order = np.argsort(self._ids[:self._size], kind="stable")
+            self._sorted = (self._ids[:self._size][order], order)
+        sorted_ids, order = self._sorted
+        item_ids = np.asarray(item_ids, dtype='int64')
+        positions = np.searchsorted(sorted_ids, item_ids).clip(max=max(len(sorted_ids) - 1, 0))
+        found = sorted_ids[positions] == item_ids if len(sorted_ids) else np.zeros(len(item_ids), dtype=bool)
+        return np.sort(order[positions[found]])
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        """Позиции k наибольших оценок без сортировки"""
+        if k >= len(scores):
+            return np.arange(len(scores))
+        return np.argpartition(-scores, k - 1)[:k]
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        allowed_ids: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Точный поиск top_k ближайших объектов; возвращает пары (id, косинусное сходство).
+        ef_search и nprobe не используются, allowed_ids ограничивает поиск подмножеством объектов.
+        """
+        if self._size == 0 or top_k <= 0:
+            return []
+        query = normalize(query)[0]
+
+        if allowed_ids is not None:
+            rows = self._rows_for(allowed_ids)
+            if len(rows) == 0:
+                return []
+            scores = self._vectors[rows] @ query
+            top = self._top(scores, top_k)
+            candidates, candidate_scores = rows[top], scores[top]
+        else:
+            block_rows = settings.SEARCH_NUMPY_BLOCK_ROWS
+            row_parts, score_parts = [], []
+            for start in range(0, self._size, block_rows):
+                scores = self._vectors[start:min(start + block_rows, self._size)] @ query
+                top = self._top(scores, top_k)
+                row_parts.append(top + start)
+                score_parts.append(scores[top])
+            candidates, candidate_scores = np.concatenate(row_parts), np.concatenate(score_parts)
+
+        top = self._top(candidate_scores, top_k)
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+        return [(int(self._ids[candidates[i]]), float(candidate_scores[i])) for i in top]
+
+
+BACKEND_CLASSES = {BACKEND_FAISS: FaissVectorIndex, BACKEND_NUMPY: NumpyVectorIndex}
+
+
+def create_vector_index(dimension: int, backend: Optional[str] = None) -> VectorIndex:
+    """Пустой индекс выбранного бэкенда"""
+    return BACKEND_CLASSES[choose_backend(backend)](dimension)
+
+
+def build_vector_index(
+    dimension: int,
+    ids: np.ndarray,
+    vectors: np.ndarray,
+    index_type: Optional[str] = None,
+    storage: Optional[str] = None,
+    backend: Optional[str] = None
+) -> VectorIndex:
+    """Построение индекса выбранного бэкенда по всему корпусу"""
+    return BACKEND_CLASSES[choose_backend(backend)].build(dimension, ids, vectors, index_type, storage)
+
+
+def read_vector_index(directory: str, state: Dict[str, Any], mmap: bool = True) -> VectorIndex:
+    """Чтение индекса из снимка бэкендом, которым он был записан (старые снимки - FAISS)"""
+    return BACKEND_CLASSES[choose_backend(state.get("backend", BACKEND_FAISS))].read(directory, state, mmap)
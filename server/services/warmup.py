@@ -0,0 +1,106 @@
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from sqlalchemy.orm import Session
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+STAGE_PENDING = "pending"
+STAGE_RUNNING = "running"
+STAGE_DONE = "done"
+STAGE_FAILED = "failed"
+
+
+class WarmupService:
+    """
+    Фоновый прогрев воркера: загрузка модели векторизации и поисковых индексов.
+
+    Воркер начинает принимать запросы сразу, а готовность к поисковым запросам
+    сообщает проба /api/v1/ready. Время от создания сервиса (старта воркера)
+    до окончания прогрева сохраняется как время холодного старта.
+    """
+
+    def __init__(self) -> None:
+        self.created_at = time.monotonic()
+        self.cold_start_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _default_stages(self, session_factory: Callable[[], Session]) -> List[Tuple[str, Callable[[], None]]]:
+        from services.embedding_engine import embedding_engine
+        from services.semantic_search import semantic_search
+        from services.profile_search import profile_search
+
+        def warm(search: Any) -> Callable[[], None]:
+            def run() -> None:
+                db = session_factory()
+                try:
+                    search.warm_start(db)
+                finally:
+                    db.close()
+            return run
+
+        return [
+            ("model", embedding_engine.load),
+            ("projects_index", warm(semantic_search)),
+            ("profiles_index", warm(profile_search))
+        ]
+
+    def run(self, stages: List[Tuple[str, Callable[[], None]]]) -> None:
+        """Последовательное выполнение этапов прогрева в текущем потоке"""
+        with self._lock:
+            self._stages = {name: {"status": STAGE_PENDING, "seconds": None} for name, _ in stages}
+
+        for name, stage in stages:
+            self._stages[name]["status"] = STAGE_RUNNING
+            started = time.monotonic()
+            try:
+                stage()
+            except Exception as e:
+                self._stages[name]["status"] = STAGE_FAILED
+                self.error = f"{name}: {str(e)}"
+                logger.error(f"Ошибка прогрева на этапе {name}: {str(e)}")
+                return
+            finally:
+                self._stages[name]["seconds"] = round(time.monotonic() - started, 3)
+            self._stages[name]["status"] = STAGE_DONE
+
+        self.cold_start_seconds = round(time.monotonic() - self.created_at, 3)
+        logger.info(f"Воркер прогрет, время холодного старта {self.cold_start_seconds:.2f} с")
+
+    def start(
+        self,
+        session_factory: Callable[[], Session],
+        stages: Optional[List[Tuple[str, Callable[[], None]]]] = None
+    ) -> None:
+        """Запуск прогрева в фоновом потоке"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            stages = stages or self._default_stages(session_factory)
+            self._stages = {name: {"status": STAGE_PENDING, "seconds": None} for name, _ in stages}
+            self._thread = threading.Thread(target=self.run, args=(stages,), name="warmup", daemon=True)
+            self._thread.start()
+
+    @property
+    def is_ready(self) -> bool:
+        return bool(self._stages) and all(
+            stage["status"] == STAGE_DONE for stage in self._stages.values()
+        )
+
+    def status(self) -> Dict[str, Any]:
+        """Прогресс прогрева для пробы готовности"""
+        done = sum(1 for stage in self._stages.values() if stage["status"] == STAGE_DONE)
+        return {
+            "ready": self.is_ready,
+            "progress": done / len(self._stages) if self._stages else 0.0,
+            "stages": {name: dict(stage) for name, stage in self._stages.items()},
+            "cold_start_seconds": self.cold_start_seconds,
+            "error": self.error
+        }
+
+# Создаем глобальный экземпляр сервиса
+warmup_service = WarmupService()
@@ -0,0 +1,31 @@
+from benchmarks.corpus import CorpusGenerator, parse_size, generate
+from benchmarks.run import summarize
+
+def test_corpus_is_deterministic() -> None:
+    # Act
+    first_projects, first_users = generate(20, seed=3)
+    second_projects, second_users = generate(20, seed=3)
+
+    # Assert
+    assert [p.dict() for p in first_projects] == [p.dict() for p in second_projects]
+    assert [u.dict() for u in first_users] == [u.dict() for u in second_users]
+    assert len({p.id for p in first_projects}) == 20
+    assert all(p.technologies and p.required_roles for p in first_projects)
+
+def test_queries_repeat_popular_terms() -> None:
+    # Act
+    queries = CorpusGenerator(0).queries(500)
+
+    # Assert
+    assert len(set(queries)) < len(queries)
+
+def test_parse_size_and_summary() -> None:
+    # Act
+    result = summarize("search", 1000, [0.001] * 99 + [0.1])
+
+    # Assert
+    assert [parse_size(value) for value in ("500", "10k", "1m", "2.5k")] == [500, 10000, 1000000, 2500]
+    assert result["p50_ms"] == 1.0
+    assert result["p99_ms"] > result["p95_ms"]
+    assert result["calls"] == 100
+    assert result["rss_mb"] > 0
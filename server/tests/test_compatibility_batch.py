@@ -0,0 +1,120 @@
+import json
+import asyncio
+import pytest
+import numpy as np
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, undefer
+from sqlalchemy.pool import StaticPool
+from core.database import Base
+from models.project import Project
+from models.user import User
+from services.embedding_cache import EmbeddingCache, QueryEmbeddingCache
+from services.embedding_engine import EmbeddingEngine
+from services.encoders import HashingEncoder
+from services.matching_service import MatchingService
+from services.vector_index import normalize
+from services.profile_search import ProfileSearch, profile_search
+from services.semantic_search import SemanticSearch, semantic_search
+from api.routes.matching import _stream_matrix, get_compatibility
+
+def _engine() -> EmbeddingEngine:
+    return EmbeddingEngine(
+        encoder=HashingEncoder(dimension=64),
+        cache=EmbeddingCache(),
+        query_cache=QueryEmbeddingCache(max_items=10, ttl_seconds=60)
+    )
+
+@pytest.fixture
+def db():
+    session = sessionmaker(bind=create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    ))()
+    Base.metadata.create_all(session.get_bind())
+    session.add_all([
+        Project(id=1, title="API", description="backend", technologies=["python", "fastapi"], required_roles=["developer"]),
+        Project(id=2, title="Design", description="mobile", technologies=["figma"], required_roles=["designer"]),
+        User(id=1, username="ivan", email="ivan@example.com", skills=["python", "fastapi"], roles=["developer"]),
+        User(id=2, username="anna", email="anna@example.com", skills=["figma"], roles=["designer"]),
+        User(id=3, username="olga", email="olga@example.com", skills=["python"], roles=["tester"])
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+def test_compatibility_matrix_is_cosine(db) -> None:
+    # Arrange
+    projects = db.query(Project).options(undefer(Project.embedding)).order_by(Project.id).all()
+    users = db.query(User).options(undefer(User.embedding)).order_by(User.id).all()
+    engine = _engine()
+    service = MatchingService()
+
+    with patch("services.matching_service.embedding_engine", engine):
+        project_vectors = normalize(engine.encode([semantic_search._prepare_text(p) for p in projects]))
+        user_vectors = normalize(engine.encode([profile_search._prepare_text(u) for u in users]))
+
+        # Act
+        scores = service.calculate_compatibility_matrix(projects, users)
+        single = service.calculate_compatibility(projects[0], users[0])
+
+    # Assert
+    assert scores.shape == (2, 3)
+    np.testing.assert_allclose(scores, project_vectors @ user_vectors.T, atol=1e-5)
+    assert scores[0, 0] > scores[0, 1]
+    assert scores[1, 1] > scores[1, 0]
+    assert single == pytest.approx(float(scores[0, 0]), abs=1e-5)
+    assert all(user.embedding_model == engine.model_name for user in users)
+
+def test_stream_matrix_rows() -> None:
+    # Act
+    lines = list(_stream_matrix([10, 20], [1, 2], np.array([[0.5, 0.25], [1.0, 0.0]], dtype='float32')))
+
+    # Assert
+    assert json.loads(lines[0]) == {"user_ids": [1, 2]}
+    assert json.loads(lines[2]) == {"project_id": 20, "scores": [1.0, 0.0]}
+    assert len(lines) == 3
+
+def test_recommendations_for_real_user(db) -> None:
+    # Arrange
+    engine = _engine()
+    projects = SemanticSearch(engine=engine)
+    profiles = ProfileSearch(engine=engine)
+    projects.index_projects(db.query(Project).options(undefer(Project.embedding)).all())
+    profiles.index_profiles(db.query(User).options(undefer(User.embedding)).all())
+    user = db.query(User).options(undefer(User.embedding)).filter(User.id == 1).one()
+    service = MatchingService()
+    service.min_compatibility_score = -1.0
+
+    with patch("services.matching_service.match_table") as match_table, \
+            patch("services.matching_service.semantic_search", projects), \
+            patch("services.matching_service.profile_search", profiles):
+        # Списка в таблице подбора нет: проекты ищутся по эмбеддингу анкеты
+        match_table.lookup.return_value = None
+
+        # Act
+        recommendations = service.get_recommendations(user, top_k=2, db=db)
+
+    # Assert
+    assert match_table.lookup.call_args[0][0] is db
+    assert recommendations["matching_projects"][0][0]["id"] == 1
+    similar = [profile["id"] for profile, _ in recommendations["similar_profiles"]]
+    assert len(similar) == 2 and 1 not in similar
+    assert engine.stats()["query_cache"]["misses"] == 0
+
+def test_single_pair_route_saves_embeddings(db) -> None:
+    # Arrange
+    engine = _engine()
+    updated_at = db.query(User.updated_at).filter(User.id == 1).scalar()
+
+    # Act
+    with patch("services.matching_service.embedding_engine", engine):
+        similarity = asyncio.run(get_compatibility(project_id=1, user_id=1, db=db, current_user=None))
+    # Незафиксированные маршрутом изменения не переживут откат
+    db.rollback()
+
+    # Assert
+    assert -1.0 <= similarity <= 1.0
+    assert db.query(Project.embedding_model).filter(Project.id == 1).scalar() == engine.model_name
+    user = db.query(User).filter(User.id == 1).one()
+    assert user.embedding_model == engine.model_name
+    assert user.updated_at == updated_at
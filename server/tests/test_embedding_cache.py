@@ -0,0 +1,123 @@
+import numpy as np
+from unittest.mock import Mock, patch
+from redis.exceptions import ConnectionError
+from services.embedding_cache import (
+    EmbeddingCache,
+    LRUCacheTier,
+    RedisCacheTier,
+    DiskCacheTier,
+    QueryEmbeddingCache,
+    embedding_key,
+    normalize_query
+)
+
+def _vector(value: float) -> np.ndarray:
+    return np.full(4, value, dtype='float32')
+
+def test_embedding_key_normalizes_whitespace() -> None:
+    assert embedding_key("model", "Python   FastAPI\n") == embedding_key("model", " Python FastAPI")
+    assert embedding_key("model", "Python") != embedding_key("other-model", "Python")
+
+def test_lru_tier_evicts_oldest() -> None:
+    # Arrange
+    tier = LRUCacheTier(max_items=2)
+    tier.set_many({"a": _vector(1), "b": _vector(2)})
+    tier.get_many(["a"])
+
+    # Act
+    tier.set_many({"c": _vector(3)})
+
+    # Assert
+    assert tier.get_many(["a", "b", "c"])[1] is None
+    assert tier.bytes_stored() == 2 * 16
+    assert tier.stats()["hits"] == 3
+
+def test_lru_tier_counts_stored_float32_bytes() -> None:
+    # Arrange
+    tier = LRUCacheTier(max_items=1)
+
+    # Act
+    tier.set_many({"a": np.ones(4, dtype='float64')})
+    stored = tier.bytes_stored()
+    tier.set_many({"b": np.ones(4, dtype='float64')})
+
+    # Assert
+    assert stored == 16
+    assert tier.bytes_stored() == 16
+
+def test_lower_tier_hit_is_promoted(tmp_path) -> None:
+    # Arrange
+    memory = LRUCacheTier(max_items=10)
+    disk = DiskCacheTier(str(tmp_path))
+    disk.set_many({"key": _vector(5)})
+    cache = EmbeddingCache([memory, disk])
+
+    # Act
+    first = cache.get("key")
+    second = cache.get("key")
+
+    # Assert
+    assert (first == _vector(5)).all()
+    assert (second == _vector(5)).all()
+    assert memory.stats()["hits"] == 1
+    assert disk.stats()["hits"] == 1
+
+def test_redis_tier_stores_raw_float32() -> None:
+    # Arrange
+    redis_mock = Mock()
+    tier = RedisCacheTier(redis_mock, ttl=60)
+    redis_mock.mget.return_value = [_vector(7).tobytes(), None]
+
+    # Act
+    tier.set_many({"key": _vector(7)})
+    values = tier.get_many(["key", "missing"])
+
+    # Assert
+    redis_mock.pipeline.return_value.set.assert_called_once_with(
+        "emb:key", _vector(7).tobytes(), ex=60
+    )
+    assert (values[0] == _vector(7)).all()
+    assert values[1] is None
+    assert tier.stats()["hit_rate"] == 0.5
+
+def test_redis_tier_backs_off_when_unavailable() -> None:
+    # Arrange
+    redis_mock = Mock()
+    redis_mock.mget.side_effect = ConnectionError("down")
+    tier = RedisCacheTier(redis_mock, ttl=60)
+
+    # Act
+    tier.get_many(["key"])
+    result = tier.get_many(["key"])
+
+    # Assert
+    assert result == [None]
+    assert redis_mock.mget.call_count == 1
+
+def test_query_cache_evicts_and_expires() -> None:
+    # Arrange
+    cache = QueryEmbeddingCache(max_items=2, ttl_seconds=60)
+
+    with patch("services.embedding_cache.time.monotonic", return_value=100.0):
+        cache.set("model", "python", _vector(1))
+        cache.set("model", "react", _vector(2))
+        cache.get("model", "python")
+        cache.set("model", "go", _vector(3))
+
+        # Act / Assert: вытеснен давно не запрошенный react
+        assert cache.get("model", "react") is None
+        assert (cache.get("model", "python") == _vector(1)).all()
+        assert cache.get("other-model", "python") is None
+
+    with patch("services.embedding_cache.time.monotonic", return_value=161.0):
+        assert cache.get("model", "python") is None
+
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+    assert cache.stats()["expired"] == 1
+    assert len(cache) == 1
+
+def test_normalize_query_ignores_case_and_spaces() -> None:
+    # Act / Assert
+    assert normalize_query("  Python\tBackend ") == normalize_query("python backend") == "python backend"
+    assert normalize_query("ＦａｓｔＡＰＩ") == "fastapi"
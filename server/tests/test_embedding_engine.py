@@ -0,0 +1,147 @@
+import pytest
+import numpy as np
+import threading
+import time
+from typing import Callable, List
+from unittest.mock import Mock
+from services.embedding_engine import EmbeddingEngine
+from services.embedding_cache import EmbeddingCache, LRUCacheTier, QueryEmbeddingCache
+from services.encoders import Encoder
+
+class FakeEncoder(Encoder):
+    """Кодировщик для тестов: модель создается переданной фабрикой при load()"""
+    kind = "fake"
+
+    def __init__(self, name: str, loader: Callable[[str], Mock]) -> None:
+        super().__init__(name)
+        self.loader = loader
+        self.model = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self) -> None:
+        if self.model is None:
+            started = time.perf_counter()
+            self.model = self.loader(self.name)
+            self.load_seconds = time.perf_counter() - started
+
+    @property
+    def dimension(self) -> int:
+        self.load()
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        self.load()
+        return np.asarray(self.model.encode(texts), dtype='float32')
+
+@pytest.fixture
+def model_mock() -> Mock:
+    model = Mock()
+    model.get_sentence_embedding_dimension.return_value = 4
+    model.encode.side_effect = lambda texts: np.array(
+        [[len(text), 0, 0, 1] for text in texts], dtype='float32'
+    )
+    return model
+
+@pytest.fixture
+def engine(model_mock: Mock) -> EmbeddingEngine:
+    engine = EmbeddingEngine(
+        encoder=FakeEncoder("test-model", Mock(return_value=model_mock)),
+        batch_window_ms=50,
+        max_batch_size=64,
+        cache=EmbeddingCache(),
+        query_cache=QueryEmbeddingCache(max_items=100, ttl_seconds=60)
+    )
+    engine.load()
+    return engine
+
+def test_model_is_loaded_lazily(model_mock: Mock) -> None:
+    # Arrange
+    loader = Mock(return_value=model_mock)
+    engine = EmbeddingEngine(encoder=FakeEncoder("test-model", loader), cache=EmbeddingCache())
+
+    # Assert
+    assert not engine.is_loaded
+    loader.assert_not_called()
+
+    # Act
+    dimension = engine.dimension
+    engine.load()
+
+    # Assert
+    assert dimension == 4
+    assert engine.is_loaded
+    assert engine.stats()["model_load_seconds"] is not None
+    loader.assert_called_once_with("test-model")
+
+def test_encode(engine: EmbeddingEngine, model_mock: Mock) -> None:
+    # Act
+    vectors = engine.encode(["a", "bbb"])
+
+    # Assert
+    assert vectors.dtype == np.float32
+    assert vectors.shape == (2, 4)
+    assert vectors[1][0] == 3
+    model_mock.encode.assert_called_once_with(["a", "bbb"])
+
+def test_concurrent_requests_are_batched(engine: EmbeddingEngine, model_mock: Mock) -> None:
+    # Arrange
+    texts = ["x" * i for i in range(1, 21)]
+    results = {}
+    barrier = threading.Barrier(len(texts))
+
+    def worker(text: str) -> None:
+        barrier.wait()
+        results[text] = engine.encode_one(text)
+
+    # Act
+    threads = [threading.Thread(target=worker, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert all(results[text][0] == len(text) for text in texts)
+    assert model_mock.encode.call_count < len(texts)
+    assert engine.stats()["batched_texts"] == len(texts)
+
+def test_encode_error_is_propagated(engine: EmbeddingEngine, model_mock: Mock) -> None:
+    # Arrange
+    model_mock.encode.side_effect = RuntimeError("boom")
+
+    # Act / Assert
+    with pytest.raises(RuntimeError):
+        engine.encode_one("text")
+
+def test_cached_texts_skip_model(model_mock: Mock) -> None:
+    # Arrange
+    engine = EmbeddingEngine(
+        encoder=FakeEncoder("test-model", Mock(return_value=model_mock)),
+        cache=EmbeddingCache([LRUCacheTier(max_items=100)])
+    )
+    engine.load()
+    engine.encode(["a", "bb"])
+
+    # Act
+    vectors = engine.encode(["bb", "a", "ccc"])
+    single = engine.encode_one("a")
+
+    # Assert
+    assert [vector[0] for vector in vectors] == [2, 1, 3]
+    assert single[0] == 1
+    assert model_mock.encode.call_count == 2
+    model_mock.encode.assert_called_with(["ccc"])
+
+def test_repeated_queries_skip_encoding(engine: EmbeddingEngine, model_mock: Mock) -> None:
+    # Act
+    first = engine.encode_query("Python  Backend")
+    second = engine.encode_query("python backend")
+
+    # Assert
+    assert (first == second).all()
+    model_mock.encode.assert_called_once_with(["python backend"])
+    assert engine.stats()["query_cache"]["hits"] == 1
+    assert engine.stats()["query_cache"]["misses"] == 1
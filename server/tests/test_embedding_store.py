@@ -0,0 +1,121 @@
+import numpy as np
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, undefer
+from core.database import Base
+from models.project import Project
+from models.user import User
+from services.embedding_cache import EmbeddingCache, QueryEmbeddingCache
+from services.embedding_engine import EmbeddingEngine
+from services.encoders import HashingEncoder
+from services.profile_search import ProfileSearch
+from services.embedding_store import (
+    collect_embeddings,
+    is_embedding_current,
+    pack_embedding,
+    store_embedding,
+    unpack_embeddings
+)
+
+def _engine() -> Mock:
+    engine = Mock()
+    engine.model_name = "test-model"
+    engine.dimension = 3
+    engine.encode.side_effect = lambda texts: np.array(
+        [[len(text), 1, 0] for text in texts], dtype='float32'
+    )
+    return engine
+
+def _entity() -> SimpleNamespace:
+    return SimpleNamespace(embedding=None, embedding_model=None, embedding_hash=None)
+
+def test_pack_and_unpack_round_trip() -> None:
+    # Arrange
+    vectors = np.random.rand(4, 3).astype('float32')
+
+    # Act
+    matrix = unpack_embeddings([pack_embedding(vector) for vector in vectors], 3)
+
+    # Assert
+    assert len(pack_embedding(vectors[0])) == 12
+    np.testing.assert_array_equal(matrix, vectors)
+
+def test_collect_embeddings_encodes_only_stale() -> None:
+    # Arrange
+    engine = _engine()
+    entities = [_entity(), _entity(), _entity()]
+    store_embedding(entities[0], "test-model", "a", np.array([7, 7, 7], dtype='float32'))
+    store_embedding(entities[1], "old-model", "bb", np.array([8, 8, 8], dtype='float32'))
+
+    # Act
+    vectors, encoded = collect_embeddings(entities, ["a", "bb", "ccc"], engine)
+
+    # Assert
+    assert encoded == 2
+    np.testing.assert_array_equal(vectors, [[7, 7, 7], [2, 1, 0], [3, 1, 0]])
+    engine.encode.assert_called_once_with(["bb", "ccc"])
+    assert all(is_embedding_current(entity, "test-model", text) for entity, text in zip(entities, ["a", "bb", "ccc"]))
+
+def test_changed_text_is_reencoded() -> None:
+    # Arrange
+    engine = _engine()
+    entity = _entity()
+    collect_embeddings([entity], ["first"], engine)
+
+    # Act
+    vectors, encoded = collect_embeddings([entity], ["second text"], engine)
+    _, encoded_again = collect_embeddings([entity], ["second text"], engine)
+
+    # Assert
+    assert encoded == 1
+    assert encoded_again == 0
+    assert vectors[0][0] == len("second text")
+
+def test_stored_embedding_keeps_updated_at() -> None:
+    # Arrange
+    engine = _engine()
+    db = sessionmaker(bind=create_engine("sqlite://"))()
+    Base.metadata.create_all(db.get_bind())
+    updated_at = datetime(2026, 1, 1)
+    db.add(Project(id=1, title="API", updated_at=updated_at))
+    db.commit()
+    project = db.query(Project).options(undefer(Project.embedding)).one()
+
+    # Act
+    collect_embeddings([project], ["API"], engine)
+    db.commit()
+    db.expire_all()
+    stored = db.query(Project).options(undefer(Project.embedding)).one()
+
+    # Assert
+    assert stored.updated_at == updated_at
+    assert stored.embedding_model == "test-model"
+    assert is_embedding_current(stored, "test-model", "API")
+    db.close()
+
+def test_user_row_is_embedded_and_indexed() -> None:
+    # Arrange
+    search = ProfileSearch(engine=EmbeddingEngine(
+        encoder=HashingEncoder(dimension=64),
+        cache=EmbeddingCache(),
+        query_cache=QueryEmbeddingCache(max_items=10, ttl_seconds=60)
+    ))
+    db = sessionmaker(bind=create_engine("sqlite://"))()
+    Base.metadata.create_all(db.get_bind())
+    db.add(User(id=1, username="ivan", email="ivan@example.com", skills=["python", "fastapi"], roles=["developer"]))
+    db.commit()
+    user = db.query(User).options(undefer(User.embedding)).one()
+
+    # Act
+    vector = search.embed(user)
+    search.upsert(user)
+    db.commit()
+
+    # Assert
+    assert vector is not None
+    assert search.indexed_ids() == [1]
+    assert search.search("python developer", 1)[0][0]["username"] == "ivan"
+    assert db.query(User.embedding_model).scalar() == search.engine.model_name
+    db.close()
@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from services.embedding_cache import EmbeddingCache
+from services.embedding_engine import EmbeddingEngine
+from services.encoders import HashingEncoder, create_encoder, ENCODER_HASHING, ENCODER_SENTENCE_TRANSFORMERS
+from services.index_snapshot import is_snapshot_compatible
+
+def test_hashing_encoder_vectors_are_normalized_and_deterministic() -> None:
+    # Arrange
+    encoder = HashingEncoder(dimension=256)
+    texts = ["Python FastAPI backend", "python  fastapi BACKEND", "React frontend дизайн", ""]
+
+    # Act
+    vectors = encoder.encode(texts)
+    again = HashingEncoder(dimension=256).encode(texts)
+
+    # Assert
+    assert vectors.shape == (4, 256)
+    assert vectors.dtype == np.float32
+    np.testing.assert_array_equal(vectors, again)
+    np.testing.assert_allclose(np.linalg.norm(vectors[:3], axis=1), 1.0, atol=1e-6)
+    assert not vectors[3].any()
+    assert vectors[0] @ vectors[1] == pytest.approx(1.0, abs=1e-6)
+    assert vectors[0] @ vectors[2] < 0.5
+
+def test_hashing_encoder_ranks_overlapping_texts_higher() -> None:
+    # Arrange
+    encoder = HashingEncoder(dimension=1024)
+    query, close, far = encoder.encode([
+        "machine learning engineer",
+        "engineer for a machine learning platform",
+        "mobile game designer"
+    ])
+
+    # Assert
+    assert query @ close > query @ far
+
+def test_engine_uses_hashing_encoder_without_model() -> None:
+    # Arrange
+    engine = EmbeddingEngine(encoder=HashingEncoder(dimension=64), cache=EmbeddingCache())
+
+    # Act
+    vectors = engine.encode(["a b", "c"])
+    single = engine.encode_one("a b")
+
+    # Assert
+    assert engine.is_loaded
+    assert engine.dimension == 64
+    assert engine.model_name == "hashing-v1-64"
+    assert engine.stats()["encoder"] == ENCODER_HASHING
+    np.testing.assert_allclose(single, vectors[0])
+
+def test_create_encoder() -> None:
+    # Assert
+    assert create_encoder(ENCODER_HASHING).kind == ENCODER_HASHING
+    assert create_encoder(ENCODER_SENTENCE_TRANSFORMERS, "test-model").name == "test-model"
+    with pytest.raises(ValueError):
+        create_encoder("unknown")
+
+def test_snapshot_of_other_encoder_is_not_compatible() -> None:
+    # Arrange
+    engine = SimpleNamespace(encoder=SimpleNamespace(kind=ENCODER_HASHING), model_name="hashing-v1-64")
+
+    # Assert
+    assert is_snapshot_compatible({"encoder": ENCODER_HASHING, "model": "hashing-v1-64"}, engine)
+    assert not is_snapshot_compatible({"model": "all-MiniLM-L6-v2"}, engine)
+    assert not is_snapshot_compatible({"encoder": ENCODER_HASHING, "model": "hashing-v1-1024"}, engine)
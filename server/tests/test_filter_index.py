@@ -0,0 +1,62 @@
+import numpy as np
+from services.filter_index import FilterIndex
+
+ROWS = [
+    {"id": 1, "status": "active", "technologies": ["python", "react"], "is_active": True},
+    {"id": 2, "status": "active", "technologies": ["python"], "is_active": True},
+    {"id": 3, "status": "completed", "technologies": ["go"], "is_active": False},
+    {"id": 4, "status": "active", "technologies": None, "is_active": False}
+]
+
+def _build() -> FilterIndex:
+    return FilterIndex.build(ROWS, set_fields=("status", "technologies"), flag_fields=("is_active",))
+
+def test_masks_are_intersected() -> None:
+    # Arrange
+    filters = _build()
+
+    # Act / Assert
+    assert sorted(filters.matching_ids(status="active")) == [1, 2, 4]
+    assert sorted(filters.matching_ids(status="active", technologies=["python"])) == [1, 2]
+    assert list(filters.matching_ids(technologies=["python", "react"])) == [1]
+    assert sorted(filters.matching_ids(is_active=False)) == [3, 4]
+    assert list(filters.matching_ids(technologies=["rust"])) == []
+    assert sorted(filters.matching_ids(status=None)) == [1, 2, 3, 4]
+
+def test_upsert_and_remove_update_masks() -> None:
+    # Arrange
+    filters = _build()
+
+    # Act
+    filters.upsert(2, {"status": "completed", "technologies": ["go"], "is_active": False})
+    filters.remove(1)
+    filters.upsert(5, {"status": "active", "technologies": ["python"], "is_active": True})
+
+    # Assert
+    assert len(filters) == 4
+    assert list(filters.matching_ids(technologies="python")) == [5]
+    assert sorted(filters.matching_ids(status="completed")) == [2, 3]
+    assert list(filters.matching_ids(is_active=True)) == [5]
+
+def test_capacity_grows_past_initial_block() -> None:
+    # Arrange
+    filters = FilterIndex(set_fields=("status",))
+
+    # Act
+    for item_id in range(100):
+        filters.upsert(item_id, {"status": "even" if item_id % 2 == 0 else "odd"})
+
+    # Assert
+    assert np.array_equal(np.sort(filters.matching_ids(status="odd")), np.arange(1, 100, 2))
+    assert filters.stats()["rows"] == 100
+
+def test_any_mask_matches_any_value() -> None:
+    # Arrange
+    filters = _build()
+
+    # Act
+    bits = filters.any_mask("technologies", ["react", "go", "rust"]) & filters.mask(status="active")
+
+    # Assert
+    assert sorted(filters.ids_for_mask(filters.any_mask("technologies", ["react", "go"]))) == [1, 3]
+    assert list(filters.ids_for_mask(bits)) == [1]
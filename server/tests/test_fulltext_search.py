@@ -0,0 +1,79 @@
+from unittest.mock import Mock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from core.config import settings
+from core.database import Base
+from models.project import Project
+from services.embedding_cache import EmbeddingCache, QueryEmbeddingCache
+from services.embedding_engine import EmbeddingEngine
+from services.encoders import HashingEncoder
+from services.fulltext_search import build_fulltext_query, detect_language, set_search_language, fulltext_enabled
+from services.semantic_search import SemanticSearch
+
+def test_detect_language() -> None:
+    # Arrange
+    project = Project(title="Платформа для команд", description="FastAPI и React")
+
+    # Act
+    set_search_language(project)
+
+    # Assert
+    assert project.search_language == "russian"
+    assert detect_language("Machine learning pipeline") == "english"
+    assert detect_language("") == "english"
+
+def test_fulltext_query_uses_websearch_and_rank() -> None:
+    # Arrange
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    # Act
+    sql = str(build_fulltext_query(db, "fastapi -django", 50, status="active").statement.compile(
+        dialect=postgresql.dialect()
+    ))
+
+    # Assert
+    assert "websearch_to_tsquery" in sql
+    assert "ts_rank_cd(projects.search_vector" in sql
+    assert "projects.search_vector @@" in sql
+    assert "LIMIT" in sql
+    db.close()
+
+def test_lexical_backend_follows_dialect() -> None:
+    # Arrange
+    sqlite_db = sessionmaker(bind=create_engine("sqlite://"))()
+    postgres_db = Mock()
+    postgres_db.get_bind.return_value.dialect.name = "postgresql"
+
+    # Act / Assert
+    with patch.object(settings, "SEARCH_LEXICAL_BACKEND", "auto"):
+        assert fulltext_enabled(postgres_db)
+        assert not fulltext_enabled(sqlite_db)
+    with patch.object(settings, "SEARCH_LEXICAL_BACKEND", "memory"):
+        assert not fulltext_enabled(postgres_db)
+    with patch.object(settings, "SEARCH_LEXICAL_BACKEND", "postgres"):
+        assert not fulltext_enabled(sqlite_db)
+    sqlite_db.close()
+
+def test_hybrid_search_filters_external_lexical_hits() -> None:
+    # Arrange
+    search = SemanticSearch(engine=EmbeddingEngine(
+        encoder=HashingEncoder(dimension=64),
+        cache=EmbeddingCache(),
+        query_cache=QueryEmbeddingCache(max_items=10, ttl_seconds=60)
+    ))
+    search.index_projects([
+        Project(id=1, title="API", description="", technologies=["python"], status="active"),
+        Project(id=2, title="App", description="", technologies=["dart"], status="completed"),
+        Project(id=3, title="ML", description="", technologies=["python"], status="active")
+    ])
+
+    # Act
+    results = search.hybrid_search("zzz", top_k=3, filters={"status": "active"}, lexical_hits=[(2, 9.0), (3, 1.0)])
+
+    # Assert
+    ids = [project["id"] for project, _ in results]
+    assert 2 not in ids
+    assert ids[0] == 3
@@ -0,0 +1,125 @@
+import subprocess
+import sys
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.database import Base
+from models.project import Project
+from services.embedding_cache import EmbeddingCache, QueryEmbeddingCache
+from services.embedding_engine import EmbeddingEngine
+from services.encoders import HashingEncoder
+from services.index_publisher import IndexPublisher, ROLE_PUBLISHER, ROLE_READER
+from services.index_snapshot import IndexSnapshotStore
+from services.semantic_search import SemanticSearch
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add_all([
+        Project(id=1, title="FastAPI backend", description="REST API", technologies=["python"]),
+        Project(id=2, title="Mobile app", description="Flutter", technologies=["dart"])
+    ])
+    db.commit()
+    db.close()
+    return factory
+
+def _search(tmp_path) -> SemanticSearch:
+    engine = EmbeddingEngine(
+        encoder=HashingEncoder(dimension=64),
+        cache=EmbeddingCache(),
+        query_cache=QueryEmbeddingCache(max_items=10, ttl_seconds=60)
+    )
+    return SemanticSearch(engine=engine, snapshot_store=IndexSnapshotStore("projects", base_dir=str(tmp_path)))
+
+def test_only_one_worker_becomes_publisher(tmp_path) -> None:
+    # Arrange
+    first = IndexPublisher(searches=[_search(tmp_path)], lock_dir=str(tmp_path))
+    second_search = _search(tmp_path)
+    second = IndexPublisher(searches=[second_search], lock_dir=str(tmp_path))
+
+    # Act
+    roles = (first.assign_role(), second.assign_role())
+
+    # Assert
+    assert roles == (ROLE_PUBLISHER, ROLE_READER)
+    assert second_search.shared_reader
+
+def test_reader_swaps_to_published_version(tmp_path, session_factory) -> None:
+    # Arrange
+    publisher_search, reader_search = _search(tmp_path), _search(tmp_path)
+    publisher = IndexPublisher(searches=[publisher_search], lock_dir=str(tmp_path))
+    reader = IndexPublisher(searches=[reader_search], lock_dir=str(tmp_path))
+    publisher.assign_role()
+    reader.assign_role()
+    db = session_factory()
+    publisher_search.warm_start(db)
+    reader_search.warm_start(db)
+    first_version = reader_search.snapshot_version
+
+    # Act: запись в воркере-читателе не меняет его индекс, изменение публикует публикатор
+    project = db.query(Project).get(2)
+    project.title = "Mobile FastAPI client"
+    db.add(Project(id=3, title="Data pipeline", description="Airflow"))
+    db.delete(db.query(Project).get(1))
+    db.commit()
+    reader_search.upsert(project)
+    unchanged = reader_search.get_payload(2)["title"]
+    published = publisher.catch_up(db, publisher_search)
+    swapped = reader.refresh(reader_search)
+
+    # Assert
+    assert unchanged == "Mobile app"
+    assert published is not None and published > first_version
+    assert swapped
+    assert reader_search.snapshot_version == published
+    assert sorted(reader_search.indexed_ids()) == [2, 3]
+    assert reader_search.get_payload(2)["title"] == "Mobile FastAPI client"
+    assert reader_search.index.mmapped
+    assert publisher.catch_up(db, publisher_search) is None
+    assert not reader.refresh(reader_search)
+    db.close()
+
+def test_reader_takes_over_when_publisher_dies(tmp_path, session_factory) -> None:
+    # Arrange: публикатор - отдельный процесс, который держит блокировку
+    publisher_process = subprocess.Popen(
+        [
+            sys.executable, "-c",
+            "import sys, time\n"
+            "from services.index_publisher import IndexPublisher\n"
+            "publisher = IndexPublisher(searches=[], lock_dir=sys.argv[1])\n"
+            "print(publisher.assign_role(), flush=True)\n"
+            "time.sleep(60)",
+            str(tmp_path)
+        ],
+        stdout=subprocess.PIPE, text=True
+    )
+    assert publisher_process.stdout.readline().strip() == ROLE_PUBLISHER
+    reader_search = _search(tmp_path)
+    reader = IndexPublisher(searches=[reader_search], lock_dir=str(tmp_path))
+    reader.assign_role()
+    db = session_factory()
+    reader_search.warm_start(db)
+    db.close()
+    first_version = reader_search.snapshot_version
+    reader.run_once(session_factory)
+    still_reader = reader.role
+
+    # Act
+    publisher_process.kill()
+    publisher_process.wait()
+    db = session_factory()
+    db.add(Project(id=3, title="Data pipeline", description="Airflow"))
+    db.commit()
+    db.close()
+    reader.run_once(session_factory)
+
+    # Assert
+    assert still_reader == ROLE_READER
+    assert reader.role == ROLE_PUBLISHER
+    assert not reader_search.shared_reader
+    assert reader_search.snapshot_version != first_version
+    assert reader_search.snapshot_store.current_version() == reader_search.snapshot_version
+    assert sorted(reader_search.indexed_ids()) == [1, 2, 3]
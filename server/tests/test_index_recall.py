@@ -0,0 +1,32 @@
+import pytest
+import numpy as np
+from scripts.index_recall import evaluate, exact_top_k, synthetic_corpus
+from services.vector_index import normalize
+
+def test_exact_top_k() -> None:
+    # Arrange
+    corpus = normalize(np.eye(4, dtype='float32'))
+    queries = normalize(np.array([[1, 0.5, 0, 0], [0, 0, 0, 1]], dtype='float32'))
+
+    # Act
+    top = exact_top_k(corpus, queries, k=2, block=1)
+
+    # Assert
+    assert set(top[0]) == {0, 1}
+    assert 3 in top[1]
+
+@pytest.mark.parametrize("backend", ["faiss", "numpy"])
+def test_exact_configuration_has_full_recall(backend: str) -> None:
+    # Arrange
+    corpus = normalize(synthetic_corpus(500, 16, clusters=10))
+    ids = np.arange(500, dtype='int64') + 1000
+    queries = corpus[:20]
+    truth = exact_top_k(corpus, queries, k=5)
+
+    # Act
+    result = evaluate(ids, corpus, queries, truth, "flat", "float32", k=5, backend=backend)
+
+    # Assert
+    assert result["backend"] == backend
+    assert result["recall_at_k"] == 1.0
+    assert result["bytes_per_vector"] >= 16 * 4
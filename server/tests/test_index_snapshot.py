@@ -0,0 +1,53 @@
+import pytest
+import numpy as np
+import os
+from services.index_snapshot import IndexSnapshotStore, is_snapshot_stale
+from services.vector_index import VectorIndex, build_vector_index, BACKEND_FAISS, BACKEND_NUMPY
+
+def _make_index(ids, dimension: int = 8, backend: str = BACKEND_FAISS) -> VectorIndex:
+    vectors = np.random.rand(len(ids), dimension).astype('float32')
+    return build_vector_index(dimension, np.array(ids, dtype='int64'), vectors, backend=backend)
+
+@pytest.mark.parametrize("backend", [BACKEND_FAISS, BACKEND_NUMPY])
+def test_save_and_load_snapshot(tmp_path, backend):
+    """Тест сохранения и загрузки снимка индекса"""
+    store = IndexSnapshotStore("projects", base_dir=str(tmp_path))
+    assert store.load() is None
+
+    index = _make_index([10, 20, 30], backend=backend)
+    payloads = [{"id": i, "title": f"Project {i}"} for i in (10, 20, 30)]
+    version = store.save(index, [10, 20, 30], payloads, {"row_count": 3, "vector_index": index.state()})
+
+    snapshot = store.load()
+    assert snapshot is not None
+    assert snapshot.version == version
+    assert snapshot.index.backend == backend
+    assert snapshot.index.mmapped
+    assert len(snapshot.index) == 3
+    assert snapshot.ids == [10, 20, 30]
+    assert snapshot.payloads[1]["title"] == "Project 20"
+    assert snapshot.meta["row_count"] == 3
+
+    # Поиск по загруженному индексу дает те же результаты, что и по исходному
+    query = np.random.rand(8).astype('float32')
+    assert snapshot.index.search(query, 3) == index.search(query, 3)
+
+def test_old_snapshots_are_pruned(tmp_path):
+    """Тест удаления старых снимков сверх лимита"""
+    store = IndexSnapshotStore("profiles", base_dir=str(tmp_path), keep=2)
+    versions = [store.save(_make_index([i]), [i], [{"id": i}]) for i in range(4)]
+
+    remaining = sorted(
+        entry for entry in os.listdir(store.root)
+        if os.path.isdir(os.path.join(store.root, entry))
+    )
+    assert remaining == versions[-2:]
+    assert store.load().ids == [3]
+
+def test_is_snapshot_stale():
+    """Тест определения устаревшего снимка"""
+    meta = {"row_count": 5, "max_updated_at": "2024-03-20T12:00:00", "dimension": 384}
+    assert not is_snapshot_stale(meta, {"row_count": 5, "max_updated_at": "2024-03-20T12:00:00"})
+    assert is_snapshot_stale(meta, {"row_count": 6, "max_updated_at": "2024-03-20T12:00:00"})
+    assert is_snapshot_stale(meta, {"row_count": 5, "max_updated_at": "2024-03-21T08:00:00"})
+    assert is_snapshot_stale({}, {"row_count": 0, "max_updated_at": None})
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from services.inference_executor import InferenceExecutor
+
+def test_blocking_call_does_not_stall_event_loop() -> None:
+    # Arrange
+    executor = InferenceExecutor(workers=2, max_queue=8)
+    ticks = []
+
+    async def ticker() -> None:
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def scenario() -> int:
+        result, _ = await asyncio.gather(executor.run(lambda: time.sleep(0.2) or 42), ticker())
+        return result
+
+    # Act
+    started = time.monotonic()
+    result = asyncio.run(scenario())
+
+    # Assert: тики цикла событий идут, пока синхронная функция выполняется в пуле
+    assert result == 42
+    assert len(ticks) == 5 and ticks[-1] - started < 0.15
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+def test_full_queue_is_rejected_with_503() -> None:
+    # Arrange
+    executor = InferenceExecutor(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario() -> None:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        while executor.stats()["running"] == 0:
+            await asyncio.sleep(0.001)
+        queued = asyncio.ensure_future(executor.run(lambda: "done"))
+        await asyncio.sleep(0)
+
+        # Act
+        with pytest.raises(HTTPException) as error:
+            await executor.run(lambda: "rejected")
+        stats = executor.stats()
+        release.set()
+        await asyncio.gather(running, queued)
+
+        # Assert
+        assert error.value.status_code == 503
+        assert stats["queue_depth"] == 1
+        assert stats["rejected"] == 1
+
+    asyncio.run(scenario())
+    assert executor.stats()["completed"] == 2
+    executor.shutdown()
+
+def test_exception_is_propagated() -> None:
+    # Arrange
+    executor = InferenceExecutor(workers=1, max_queue=4)
+
+    def fail() -> None:
+        raise ValueError("boom")
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run(fail))
+    assert executor.stats()["failed"] == 1
+    assert executor.stats()["completed"] == 0
+    assert executor.stats()["queue_depth"] == 0
+    executor.shutdown()
+
+def test_cancelled_request_releases_queue_slot() -> None:
+    # Arrange
+    executor = InferenceExecutor(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario() -> None:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        while executor.stats()["running"] == 0:
+            await asyncio.sleep(0.001)
+        queued = asyncio.ensure_future(executor.run(lambda: "cancelled"))
+        await asyncio.sleep(0)
+
+        # Act: ожидающий запрос отменяется, пока его задача еще в очереди
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        depth = executor.stats()["queue_depth"]
+        release.set()
+        await running
+        result = await executor.run(lambda: "accepted")
+
+        # Assert
+        assert depth == 0
+        assert result == "accepted"
+
+    asyncio.run(scenario())
+    stats = executor.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["completed"] == 2 and stats["failed"] == 0
+    executor.shutdown()
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.database import Base, json_array_contains, json_array_overlaps
+from models.project import Project
+from services.project_service import ProjectService
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Project(id=1, title="API", technologies=["python", "fastapi"], required_roles=["backend"], status="active"),
+        Project(id=2, title="App", technologies=["dart"], required_roles=["mobile", "designer"], status="active"),
+        Project(id=3, title="ML", technologies=["python", "pytorch"], required_roles=["backend", "ml"], status="completed"),
+        Project(id=4, title="Empty", technologies=None, required_roles=[], status="on_hold")
+    ])
+    session.commit()
+    # Значение по умолчанию подставляется при вставке, поэтому NULL-статус задается отдельно
+    session.add(Project(id=5, title="Draft"))
+    session.flush()
+    session.query(Project).filter(Project.id == 5).update({Project.status: None})
+    session.commit()
+    yield session
+    session.close()
+
+def test_json_array_conditions(db) -> None:
+    # Act
+    contains_all = db.query(Project.id).filter(json_array_contains(db, Project.technologies, ["python", "pytorch"]))
+    contains_any = db.query(Project.id).filter(json_array_overlaps(db, Project.technologies, ["dart", "pytorch"]))
+
+    # Assert
+    assert sorted(row.id for row in contains_all) == [3]
+    assert sorted(row.id for row in contains_any) == [2, 3]
+
+def test_search_projects_filters_in_sql(db) -> None:
+    # Arrange
+    service = ProjectService(db)
+
+    # Act
+    by_technology = service.search_projects(technologies=["python"])
+    by_role_and_status = service.search_projects(required_roles=["backend"], status="completed")
+    inactive = service.search_projects(is_active=False)
+    page = service.search_projects(skip=1, limit=2)
+
+    # Assert
+    assert [p.id for p in by_technology] == [1, 3]
+    assert [p.id for p in by_role_and_status] == [3]
+    assert [p.id for p in inactive] == [3, 4, 5]
+    assert [p.id for p in page] == [2, 3]
@@ -0,0 +1,70 @@
+import numpy as np
+from services.lexical_index import LexicalIndex, tokenize, reciprocal_rank_fusion
+
+DOCUMENTS = [
+    (1, "REST API на FastAPI и PostgreSQL"),
+    (2, "Мобильное приложение на Flutter"),
+    (3, "Веб-сервис на Django, без FastAPI"),
+    (4, "Чат-бот на node.js и C++ для игр")
+]
+
+def test_tokenize_keeps_technology_names() -> None:
+    # Act
+    tokens = tokenize("Backend: Node.js, C++ и C#; FastAPI.")
+
+    # Assert
+    assert tokens == ["backend", "node.js", "c++", "и", "c#", "fastapi"]
+
+def test_search_ranks_exact_terms() -> None:
+    # Arrange
+    lexical_index = LexicalIndex.build(DOCUMENTS)
+
+    # Act
+    hits = lexical_index.search("fastapi postgresql", top_k=10)
+
+    # Assert
+    assert [item_id for item_id, _ in hits] == [1, 3]
+    assert hits[0][1] > hits[1][1] > 0
+    assert [item_id for item_id, _ in lexical_index.search("C++", top_k=10)] == [4]
+    assert lexical_index.search("rust", top_k=10) == []
+
+def test_search_respects_allowed_ids_and_top_k() -> None:
+    # Arrange
+    lexical_index = LexicalIndex.build(DOCUMENTS)
+
+    # Act / Assert
+    assert [item_id for item_id, _ in lexical_index.search("на", top_k=2)] != []
+    assert len(lexical_index.search("на", top_k=2)) == 2
+    assert [item_id for item_id, _ in lexical_index.search("fastapi", 10, allowed_ids=np.array([3, 99]))] == [3]
+
+def test_upsert_remove_and_compact() -> None:
+    # Arrange
+    lexical_index = LexicalIndex.build(DOCUMENTS)
+
+    # Act
+    lexical_index.upsert(1, "Сервис на Go")
+    lexical_index.remove(2)
+    before = lexical_index.search("fastapi", 10)
+    lexical_index.compact()
+    after = lexical_index.search("fastapi", 10)
+
+    # Assert
+    assert len(lexical_index) == 3
+    assert [item_id for item_id, _ in before] == [3]
+    assert before == after
+    assert [item_id for item_id, _ in lexical_index.search("go", 10)] == [1]
+    assert lexical_index.search("flutter", 10) == []
+    assert lexical_index.stats()["deleted"] == 0
+
+def test_reciprocal_rank_fusion_rewards_agreement() -> None:
+    # Arrange
+    semantic = [(1, 0.9), (2, 0.8), (3, 0.7)]
+    lexical = [(3, 12.0), (4, 8.0)]
+
+    # Act
+    fused = reciprocal_rank_fusion([semantic, lexical], k=60)
+
+    # Assert
+    assert fused[0][0] == 3
+    assert {item_id for item_id, _ in fused} == {1, 2, 3, 4}
+    assert abs(fused[0][1] - (1 / 63 + 1 / 61)) < 1e-12
@@ -0,0 +1,35 @@
+import threading
+from core.locks import ReadWriteLock
+
+def test_readers_share_lock_and_writer_waits() -> None:
+    # Arrange
+    lock = ReadWriteLock()
+    both_reading = threading.Barrier(2, timeout=2)
+    events = []
+
+    def reader() -> None:
+        with lock.read():
+            # Оба чтения должны одновременно находиться под блокировкой
+            both_reading.wait()
+            events.append("read")
+
+    def writer() -> None:
+        with lock.write():
+            events.append("write")
+
+    # Act
+    with lock.read():
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in readers:
+            thread.start()
+        for thread in readers:
+            thread.join(timeout=2)
+        pending_writer = threading.Thread(target=writer)
+        pending_writer.start()
+        pending_writer.join(timeout=0.05)
+        blocked = pending_writer.is_alive()
+    pending_writer.join(timeout=2)
+
+    # Assert
+    assert events == ["read", "read", "write"]
+    assert blocked
@@ -0,0 +1,131 @@
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.database import Base
+from models.match import Match
+from models.project import Project
+from models.user import User
+from services.match_table import MatchTable, MATCH_PROJECT, MATCH_USER
+
+class FakeSearch:
+    """Поисковый сервис с векторами по id объекта"""
+
+    def __init__(self, vectors):
+        self.vectors = {item_id: np.asarray(vector, dtype='float32') for item_id, vector in vectors.items()}
+
+    def embed(self, obj):
+        return self.vectors.get(obj.id)
+
+    def get_payload(self, item_id):
+        return {"id": item_id} if item_id in self.vectors else None
+
+    def search_vector(self, vector, top_k=10):
+        scored = sorted(((float(v @ vector), item_id) for item_id, v in self.vectors.items()), reverse=True)
+        return [({"id": item_id}, score) for score, item_id in scored[:top_k]]
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([Project(id=1, title="p1"), Project(id=2, title="p2")])
+    session.add_all([
+        User(id=i, email=f"u{i}@example.com", username=f"u{i}", hashed_password="x") for i in (10, 20, 30)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+@pytest.fixture
+def table():
+    projects = FakeSearch({1: [1, 0], 2: [0, 1]})
+    users = FakeSearch({10: [1, 0], 20: [0.7, 0.7], 30: [0.2, 0.98]})
+    table = MatchTable(
+        engine=SimpleNamespace(model_name="test-model"),
+        project_search=projects,
+        user_search=users,
+        top_k=2,
+        fanout=2,
+        max_age_seconds=3600
+    )
+    with patch.object(table, "_ensure_worker"):
+        yield table
+
+def _list(db, source_type, source_id):
+    rows = db.query(Match).filter_by(source_type=source_type, source_id=source_id).order_by(Match.rank).all()
+    return [row.target_id for row in rows]
+
+def test_refresh_writes_own_and_neighbor_lists(db, table) -> None:
+    # Act
+    refreshed = table.refresh(db, [(MATCH_PROJECT, 1, True)])
+
+    # Assert
+    assert _list(db, MATCH_PROJECT, 1) == [10, 20]
+    # Ближайшие к проекту участники получили свои списки проектов
+    assert _list(db, MATCH_USER, 10) == [1, 2]
+    assert _list(db, MATCH_USER, 20)[0] in (1, 2)
+    assert refreshed == 3
+    assert _list(db, MATCH_USER, 30) == []
+
+def test_lookup_reads_fresh_list(db, table) -> None:
+    # Arrange
+    table.refresh(db, [(MATCH_PROJECT, 1, False)])
+    project = db.get(Project, 1)
+
+    # Act
+    results = table.lookup(db, MATCH_PROJECT, project, top_k=2)
+
+    # Assert
+    assert [payload["id"] for payload, _ in results] == [10, 20]
+    assert results[0][1] == pytest.approx(1.0)
+    assert table.lookup(db, MATCH_PROJECT, project, top_k=3) is None
+    assert table.stats()["hits"] == 1
+
+def test_changed_entity_updates_lists_that_contain_it(db, table) -> None:
+    # Arrange
+    table.refresh(db, [(MATCH_PROJECT, 1, False), (MATCH_PROJECT, 2, False)])
+    assert _list(db, MATCH_PROJECT, 1) == [10, 20]
+
+    # Act: участник 20 сместился к проекту 2 и должен выпасть из списка проекта 1
+    table.user_search.vectors[20] = np.array([0, 1], dtype='float32')
+    table.refresh(db, [(MATCH_USER, 20, True)])
+
+    # Assert
+    assert _list(db, MATCH_PROJECT, 1) == [10, 30]
+    assert _list(db, MATCH_PROJECT, 2) == [20, 30]
+
+def test_stale_list_falls_back_and_is_requeued(db, table) -> None:
+    # Arrange
+    table.refresh(db, [(MATCH_PROJECT, 1, False)])
+    project = db.get(Project, 1)
+    project.updated_at = datetime.utcnow() + timedelta(seconds=5)
+
+    # Act
+    stale = table.lookup(db, MATCH_PROJECT, project, top_k=2)
+    pending = table.lookup(db, MATCH_PROJECT, db.get(Project, 1), top_k=2)
+
+    # Assert
+    assert stale is None
+    assert pending is None
+    assert table._queue.get_nowait() == (MATCH_PROJECT, 1, False)
+    assert table.stats()["misses"] == 2
+
+def test_deleted_source_and_target(db, table) -> None:
+    # Arrange
+    table.refresh(db, [(MATCH_PROJECT, 1, False), (MATCH_USER, 10, False)])
+    db.delete(db.get(User, 10))
+    db.commit()
+    del table.user_search.vectors[10]
+
+    # Act
+    lookup = table.lookup(db, MATCH_PROJECT, db.get(Project, 1), top_k=2)
+    table.refresh(db, [(MATCH_USER, 10, True)])
+
+    # Assert
+    assert lookup is None
+    assert _list(db, MATCH_USER, 10) == []
+    assert 10 not in _list(db, MATCH_PROJECT, 1)
@@ -0,0 +1,65 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.database import Base
+from models.project import Project
+from models.notification import Notification
+from services.pagination import keyset_page
+from api.services.project_service import get_projects_page, search_projects_page_db
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    started = datetime(2026, 1, 1)
+    # У проектов 4 и 5 одинаковое время создания: порядок между ними задает id
+    session.add_all([
+        Project(id=i, title=f"Project {i}", created_at=started + timedelta(minutes=min(i, 4)))
+        for i in range(1, 6)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+def test_keyset_pages_cover_list_once(db) -> None:
+    # Act
+    pages, cursor = [], None
+    while True:
+        page, cursor = get_projects_page(db, limit=2, cursor=cursor)
+        pages.append([project.id for project in page])
+        if cursor is None:
+            break
+
+    # Assert
+    assert pages == [[5, 4], [3, 2], [1]]
+
+def test_keyset_cursor_is_bound_to_list(db) -> None:
+    # Arrange
+    _, cursor = get_projects_page(db, limit=2)
+    notifications = db.query(Notification).filter(Notification.user_id == 1)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        keyset_page(notifications, Notification.created_at, Notification.id, 2, cursor, scope="notifications:1")
+    with pytest.raises(ValueError):
+        get_projects_page(db, limit=2, cursor=cursor[:-4] + "AAAA")
+
+def test_filtered_cursor_is_bound_to_filters(db) -> None:
+    # Arrange
+    db.query(Project).filter(Project.id > 3).update({"status": "closed"})
+    db.commit()
+    page, cursor = search_projects_page_db(db, {"status": "active"}, limit=2)
+
+    # Act
+    next_page, next_cursor = search_projects_page_db(db, {"status": "active"}, limit=2, cursor=cursor)
+
+    # Assert
+    assert [project.id for project in page] == [3, 2]
+    assert [project.id for project in next_page] == [1]
+    assert next_cursor is None
+    with pytest.raises(ValueError):
+        search_projects_page_db(db, {}, limit=2, cursor=cursor)
+    with pytest.raises(ValueError):
+        get_projects_page(db, limit=2, cursor=cursor)
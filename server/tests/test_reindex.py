@@ -0,0 +1,45 @@
+import numpy as np
+from scripts.reindex import ReindexCheckpoint, length_sorted_batches
+
+def test_length_sorted_batches() -> None:
+    # Arrange
+    texts = ["cccc", "a", "bbb", "dd", "eeeee"]
+
+    # Act
+    batches = length_sorted_batches(texts, batch_size=2)
+
+    # Assert
+    assert batches == [[1, 3], [2, 0], [4]]
+
+def test_checkpoint_resumes_from_last_shard(tmp_path) -> None:
+    # Arrange
+    directory = str(tmp_path / ".reindex")
+    checkpoint = ReindexCheckpoint(directory)
+    checkpoint.start({"model": "test-model", "chunk_size": 2})
+    checkpoint.add_shard(np.array([1, 2]), np.ones((2, 3), dtype='float32'), [{"id": 1}, {"id": 2}], encoded=2)
+    checkpoint.add_shard(np.array([5]), np.zeros((1, 3), dtype='float32'), [{"id": 5}], encoded=0)
+
+    # Act
+    resumed = ReindexCheckpoint(directory)
+    state = resumed.load()
+    ids, vectors, payloads = resumed.read_shards()
+
+    # Assert
+    assert state["last_id"] == 5
+    assert state["rows"] == 3
+    assert state["encoded"] == 2
+    assert ids.tolist() == [1, 2, 5]
+    assert vectors.shape == (3, 3)
+    assert [payload["id"] for payload in payloads] == [1, 2, 5]
+
+def test_new_run_discards_old_shards(tmp_path) -> None:
+    # Arrange
+    checkpoint = ReindexCheckpoint(str(tmp_path / ".reindex"))
+    checkpoint.start({"model": "test-model", "chunk_size": 2})
+    checkpoint.add_shard(np.array([1]), np.ones((1, 3), dtype='float32'), [{"id": 1}], encoded=1)
+
+    # Act
+    checkpoint.start({"model": "other-model", "chunk_size": 2})
+
+    # Assert
+    assert ReindexCheckpoint(str(tmp_path / ".reindex")).load()["shards"] == []
@@ -0,0 +1,116 @@
+import pytest
+import numpy as np
+from unittest.mock import patch
+from core.config import settings
+from services.embedding_cache import EmbeddingCache, QueryEmbeddingCache
+from services.embedding_engine import EmbeddingEngine
+from services.encoders import HashingEncoder
+from services.semantic_search import SemanticSearch
+from models.project import Project
+from services.search_cursor import query_key, encode_cursor, decode_cursor
+
+@pytest.fixture
+def search(tmp_path) -> SemanticSearch:
+    engine = EmbeddingEngine(
+        encoder=HashingEncoder(dimension=64),
+        cache=EmbeddingCache(),
+        query_cache=QueryEmbeddingCache(max_items=10, ttl_seconds=60)
+    )
+    search = SemanticSearch(engine=engine)
+    payloads = [
+        {
+            "id": i,
+            "title": f"Проект {i} python" if i % 3 else f"Проект {i}",
+            "description": "backend сервис",
+            "technologies": ["python"] if i % 2 else ["go"],
+            "required_roles": [],
+            "status": "active"
+        }
+        for i in range(1, 51)
+    ]
+    vectors = engine.encode([f"{p['title']} {p['description']}" for p in payloads])
+    search.replace_index(np.array([p["id"] for p in payloads]), vectors, payloads)
+    return search
+
+def test_cursor_roundtrip_and_validation() -> None:
+    # Arrange
+    key = query_key("model", "Python  Backend", {"status": "active"})
+    cursor = encode_cursor(key, 0.5, 7, 20)
+
+    # Act
+    state = decode_cursor(cursor, query_key("model", "python backend", {"status": "active"}))
+
+    # Assert
+    assert state == {"k": key, "s": 0.5, "i": 7, "n": 20}
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, query_key("model", "python backend"))
+    with pytest.raises(ValueError):
+        decode_cursor(cursor[:-2] + ("A" if cursor[-2] != "A" else "B") + cursor[-1], key)
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor", key)
+
+def test_pages_cover_results_without_repeats(search: SemanticSearch) -> None:
+    # Arrange
+    full = [project["id"] for project, _ in search.search_page("python backend", limit=100)[0]]
+
+    # Act
+    pages, cursor = [], None
+    while True:
+        page, cursor = search.search_page("python backend", limit=7, cursor=cursor)
+        pages.extend(project["id"] for project, _ in page)
+        if cursor is None:
+            break
+
+    # Assert
+    assert pages == full
+    assert len(pages) == len(set(pages)) == 50
+
+def test_page_after_cursor_respects_filters(search: SemanticSearch) -> None:
+    # Act
+    first, cursor = search.search_page("python", limit=5, filters={"technologies": ["go"]})
+    second, _ = search.search_page("python", limit=5, cursor=cursor, filters={"technologies": ["go"]})
+
+    # Assert
+    assert all("go" in project["technologies"] for project, _ in first + second)
+    assert not {p["id"] for p, _ in first} & {p["id"] for p, _ in second}
+    with pytest.raises(ValueError):
+        search.search_page("python", limit=5, cursor=cursor)
+
+def test_cursor_survives_index_writes(search: SemanticSearch) -> None:
+    # Arrange
+    first, cursor = search.search_page("python backend", limit=7)
+
+    # Act: курсор продолжается после последнего результата (оценка, id), а не по смещению
+    search.upsert(Project(
+        id=51, title="python backend python", description="backend сервис",
+        technologies=["python"], required_roles=[], status="active"
+    ))
+    pages = [project["id"] for project, _ in first]
+    while cursor is not None:
+        page, cursor = search.search_page("python backend", limit=7, cursor=cursor)
+        pages.extend(project["id"] for project, _ in page)
+
+    # Assert: вставка сдвигает оценки RRF вниз, поэтому результаты могут повториться, но не пропасть
+    assert set(range(1, 51)) <= set(pages)
+
+def test_pages_continue_past_fused_head(search: SemanticSearch) -> None:
+    # Arrange: голова RRF из 5 кандидатов на список, остальное - хвост по сходству
+    with patch.object(settings, "SEARCH_HYBRID_CANDIDATES", 5):
+        index_search = patch.object(search.index, "search", wraps=search.index.search)
+
+        # Act
+        pages, cursor, top_ks = [], None, []
+        while True:
+            with index_search as spy:
+                page, cursor = search.search_page("python backend", limit=7, cursor=cursor)
+            top_ks.append(max(call.args[1] for call in spy.call_args_list))
+            pages.extend(project["id"] for project, _ in page)
+            if cursor is None:
+                break
+        offset_page = [project["id"] for project, _ in search.search_range("python backend", skip=40, limit=20)]
+
+    # Assert
+    assert len(pages) == len(set(pages)) == 50
+    assert offset_page == pages[40:]
+    # Первая страница читает из индекса только голову и страницу, а не весь корпус
+    assert top_ks[0] < 20
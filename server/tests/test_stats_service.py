@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.database import Base
+from models.project import Project
+from models.user import User
+from services.project_service import ProjectService
+from services.stats_service import StatsService
+from services.user_service import UserService
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Project(id=1, technologies=["python", "react"], required_roles=["backend"], status="active"),
+        Project(id=2, technologies=["python"], required_roles=["backend", "designer"], status="completed"),
+        Project(id=3, technologies=None, required_roles=[], status="on_hold"),
+        User(id=1, email="a@example.com", username="a", skills=["python", "sql"], roles=["admin"], is_active=True),
+        User(id=2, email="b@example.com", username="b", skills=["python"], roles=None, is_active=True),
+        User(id=3, email="c@example.com", username="c", skills=None, roles=["member"], is_active=False)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+def test_stats_are_grouped_in_database(db) -> None:
+    # Arrange
+    service = StatsService()
+
+    # Act
+    stats = service.get(db)
+
+    # Assert
+    assert stats["projects"]["total"] == 3
+    assert stats["projects"]["by_status"] == {"active": 1, "completed": 1, "on_hold": 1}
+    assert stats["projects"]["technologies"] == {"python": 2, "react": 1}
+    assert list(stats["projects"]["required_roles"].items()) == [("backend", 2), ("designer", 1)]
+    assert stats["users"]["total"] == 3
+    assert stats["users"]["active"] == 2
+    assert stats["users"]["skills"] == {"python": 2, "sql": 1}
+    assert stats["users"]["roles"] == {"admin": 1, "member": 1}
+    assert not stats["materialized"]
+    assert not service.refresh(db)
+
+def test_service_statistics_use_grouped_stats(db) -> None:
+    # Act
+    project_stats = ProjectService(db).get_project_statistics()
+    user_stats = UserService(db).get_user_stats()
+
+    # Assert
+    assert project_stats["total_projects"] == 3
+    assert project_stats["active_projects"] == 1
+    assert project_stats["completed_projects"] == 1
+    assert project_stats["top_technologies"] == {"python": 2, "react": 1}
+    assert user_stats["active_users"] == 2
+    assert user_stats["skill_distribution"]["python"] == 2
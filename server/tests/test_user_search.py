@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.database import Base
+from core.trigram import similarity, word_similarity
+from models.user import User
+from services.user_service import UserService
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        User(id=1, username="ivan_petrov", email="ivan.petrov@example.com", skills=["python", "fastapi"], roles=["admin"]),
+        User(id=2, username="ivanov", email="i.ivanov@example.com", skills=["python"]),
+        User(id=3, username="maria", email="maria@example.com", skills=["react"]),
+        User(id=4, username="petrova", email="petrova@example.com", skills=["python", "django"], roles=["member"])
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+def test_trigram_similarity() -> None:
+    # Assert
+    assert similarity("word", "word") == 1.0
+    assert similarity("", "word") == 0.0
+    assert word_similarity("petrov", "ivan.petrov@example.com") == 1.0
+    assert word_similarity("petorv", "ivan.petrov@example.com") > 0.0
+
+def test_search_users_ranks_by_similarity(db) -> None:
+    # Arrange
+    service = UserService(db)
+
+    # Act
+    by_typo = service.search_users(query="ivanof")
+    by_email_part = service.search_users(query="petrov")
+    with_skills = service.search_users(query="petrov", skills=["django"])
+    with_role = service.search_users(query="petrov", role="admin")
+
+    # Assert
+    assert [user.id for user in by_typo][:1] == [2]
+    assert [user.id for user in by_email_part][0] == 1
+    assert 3 not in [user.id for user in by_email_part]
+    assert [user.id for user in with_skills] == [4]
+    assert [user.id for user in with_role] == [1]
+
+def test_search_users_keyset_pages(db) -> None:
+    # Arrange
+    service = UserService(db)
+
+    # Act
+    first, cursor = service.search_users_page(skills=["python"], limit=2)
+    second, last_cursor = service.search_users_page(skills=["python"], limit=2, cursor=cursor)
+
+    # Assert
+    assert [user.id for user in first] == [1, 2]
+    assert [user.id for user in second] == [4]
+    assert last_cursor is None
+    with pytest.raises(ValueError):
+        service.search_users_page(skills=["react"], limit=2, cursor=cursor)
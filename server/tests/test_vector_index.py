@@ -0,0 +1,246 @@
+import os
+import pytest
+import numpy as np
+from unittest.mock import patch
+from services.vector_index import (
+    FaissVectorIndex,
+    NumpyVectorIndex,
+    choose_backend,
+    choose_index_type,
+    create_vector_index,
+    read_vector_index,
+    BACKEND_FAISS,
+    BACKEND_NUMPY,
+    INDEX_FLAT,
+    INDEX_HNSW,
+    INDEX_IVFPQ,
+    STORAGE_FLOAT16,
+    STORAGE_FLOAT32,
+    STORAGE_INT8,
+    STORAGE_PQ
+)
+
+DIMENSION = 8
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((50, DIMENSION)).astype('float32')
+
+@pytest.fixture
+def ids() -> np.ndarray:
+    return np.arange(1, 51, dtype='int64')
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+@pytest.mark.parametrize("index_type", [INDEX_FLAT, INDEX_HNSW])
+def test_scores_are_cosine(index_type: str, ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Arrange
+    index = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=index_type)
+
+    # Act
+    hits = index.search(vectors[3] * 10, top_k=3)
+
+    # Assert
+    assert hits[0][0] == 4
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+    for item_id, score in hits:
+        assert score == pytest.approx(cosine(vectors[3], vectors[item_id - 1]), abs=1e-5)
+
+@pytest.mark.parametrize("index_type", [INDEX_FLAT, INDEX_HNSW])
+def test_upsert_and_remove(index_type: str, ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Arrange
+    index = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=index_type)
+
+    # Act
+    index.upsert(5, vectors[10], exists=True)
+    index.remove(11)
+    index.upsert(5, vectors[20], exists=True)
+    hits = index.search(vectors[20], top_k=2, ef_search=128)
+
+    # Assert
+    assert len(index) == 49
+    assert {item_id for item_id, _ in hits} == {5, 21}
+    assert all(item_id != 11 for item_id, _ in index.search(vectors[10], top_k=5))
+
+def test_hnsw_removal_uses_tombstones(ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Arrange
+    index = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=INDEX_HNSW)
+
+    # Act
+    index.remove(1)
+    index.upsert(2, vectors[2], exists=True)
+
+    # Assert
+    assert not index.supports_removal
+    assert index.fragmentation > 0
+    assert index.state()["tombstones"] == [1, 2]
+    assert index.search(vectors[2], top_k=1)[0][0] in (2, 3)
+
+def test_state_round_trip(ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Arrange
+    index = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=INDEX_HNSW)
+    index.upsert(7, vectors[0], exists=True)
+
+    # Act
+    restored = FaissVectorIndex.from_snapshot(index.index, index.state(), DIMENSION)
+    restored.upsert(8, vectors[1], exists=True)
+
+    # Assert
+    assert restored.index_type == INDEX_HNSW
+    assert restored.index is not index.index
+    assert {item_id for item_id, _ in restored.search(vectors[0], top_k=2)} == {1, 7}
+
+def test_ivfpq_falls_back_to_flat_on_small_corpus(ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Act
+    index = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=INDEX_IVFPQ)
+
+    # Assert
+    assert index.index_type == INDEX_FLAT
+    assert len(index) == 50
+
+def test_choose_index_type() -> None:
+    with patch("services.vector_index.settings") as settings:
+        settings.SEARCH_INDEX_TYPE = "auto"
+        settings.SEARCH_ANN_INDEX_TYPE = INDEX_HNSW
+        settings.SEARCH_ANN_THRESHOLD = 1000
+
+        assert choose_index_type(999) == INDEX_FLAT
+        assert choose_index_type(1000) == INDEX_HNSW
+
+        settings.SEARCH_INDEX_TYPE = "unknown"
+        with pytest.raises(ValueError):
+            choose_index_type(10)
+
+@pytest.mark.parametrize("index_type", [INDEX_FLAT, INDEX_HNSW])
+def test_search_is_limited_to_allowed_ids(index_type: str, ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Arrange
+    index = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=index_type)
+    index.upsert(10, vectors[0], exists=True)
+    allowed = np.array([10, 20, 30], dtype='int64')
+
+    # Act
+    hits = index.search(vectors[0], top_k=5, allowed_ids=allowed)
+
+    # Assert
+    assert [item_id for item_id, _ in hits][0] == 10
+    assert {item_id for item_id, _ in hits} == {10, 20, 30}
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert index.search(vectors[0], top_k=5, allowed_ids=np.array([], dtype='int64')) == []
+
+@pytest.mark.parametrize("storage", [STORAGE_FLOAT16, STORAGE_INT8])
+def test_compressed_storage_keeps_cosine_scores(storage: str, ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Arrange
+    index = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=INDEX_FLAT, storage=storage)
+    exact = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=INDEX_FLAT, storage=STORAGE_FLOAT32)
+
+    # Act
+    hits = index.search(vectors[3], top_k=1)
+    restored = FaissVectorIndex.from_snapshot(index.index, index.state(), DIMENSION)
+
+    # Assert
+    assert hits[0][0] == 4
+    assert hits[0][1] == pytest.approx(1.0, abs=0.05)
+    assert restored.storage == storage
+    assert index.memory_bytes() < exact.memory_bytes()
+
+def test_pq_storage_falls_back_on_small_corpus(ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Act
+    index = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=INDEX_HNSW, storage=STORAGE_PQ)
+
+    # Assert
+    assert index.storage == STORAGE_FLOAT32
+    assert index.index_type == INDEX_HNSW
+
+def test_numpy_backend_matches_faiss_flat(ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Arrange
+    exact = FaissVectorIndex.build(DIMENSION, ids, vectors, index_type=INDEX_FLAT)
+    index = NumpyVectorIndex.build(DIMENSION, ids, vectors)
+    queries = np.random.default_rng(1).standard_normal((5, DIMENSION)).astype('float32')
+
+    # Act
+    with patch("services.vector_index.settings") as settings:
+        settings.SEARCH_VECTOR_STORAGE = STORAGE_FLOAT32
+        settings.SEARCH_NUMPY_BLOCK_ROWS = 7
+        results = [(index.search(query, top_k=5), exact.search(query, top_k=5)) for query in queries]
+
+    # Assert
+    for hits, expected in results:
+        assert [item_id for item_id, _ in hits] == [item_id for item_id, _ in expected]
+        np.testing.assert_allclose([score for _, score in hits], [score for _, score in expected], atol=1e-5)
+
+def test_numpy_upsert_remove_and_filter(ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Arrange
+    index = NumpyVectorIndex.build(DIMENSION, ids, vectors)
+
+    # Act
+    index.upsert(5, vectors[10], exists=True)
+    index.remove(11)
+    index.upsert(100, vectors[20], exists=False)
+    hits = index.search(vectors[20], top_k=2)
+    filtered = index.search(vectors[10], top_k=5, allowed_ids=np.array([5, 11, 30, 999], dtype='int64'))
+
+    # Assert
+    assert len(index) == 50
+    assert {item_id for item_id, _ in hits} == {21, 100}
+    assert [item_id for item_id, _ in filtered] == [5, 30]
+    assert filtered[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert index.search(vectors[0], top_k=5, allowed_ids=np.array([11], dtype='int64')) == []
+
+def _rss_anon_bytes() -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("RssAnon недоступен")
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="нужен procfs")
+def test_faiss_snapshot_is_mapped_without_copy(tmp_path) -> None:
+    # Arrange
+    # Матрица больше порога mmap в malloc, чтобы освобожденная память вернулась системе
+    big_vectors = np.random.rand(40000, 512).astype('float32')
+    index = FaissVectorIndex.build(512, np.arange(40000, dtype='int64'), big_vectors)
+    index.write(str(tmp_path))
+    matrix_bytes = big_vectors.nbytes
+    del index, big_vectors
+    before = _rss_anon_bytes()
+
+    # Act
+    restored = read_vector_index(str(tmp_path), {"backend": BACKEND_FAISS, "index_type": INDEX_FLAT})
+    restored.search(np.ones(512, dtype='float32'), top_k=3)
+    grown = _rss_anon_bytes() - before
+
+    # Assert
+    assert restored.mmapped
+    assert len(restored) == 40000
+    # Матрица 80 МБ остается в страницах файла снимка, а не копируется в память процесса
+    assert grown < matrix_bytes / 4
+
+def test_numpy_snapshot_is_mmapped_and_copied_on_write(tmp_path, ids: np.ndarray, vectors: np.ndarray) -> None:
+    # Arrange
+    index = NumpyVectorIndex.build(DIMENSION, ids, vectors, storage=STORAGE_INT8)
+    index.write(str(tmp_path))
+
+    # Act
+    restored = read_vector_index(str(tmp_path), index.state())
+    was_mmapped = restored.mmapped
+    restored.upsert(1, vectors[2], exists=True)
+
+    # Assert
+    assert was_mmapped
+    assert not restored.mmapped
+    assert restored.storage == STORAGE_FLOAT32
+    assert index.memory_bytes() == 50 * (DIMENSION * 4 + 8)
+    assert {item_id for item_id, _ in restored.search(vectors[2], top_k=2)} == {1, 3}
+    assert index.search(vectors[0], top_k=1)[0][0] == 1
+
+def test_choose_backend() -> None:
+    with patch("services.vector_index.settings") as settings:
+        settings.SEARCH_BACKEND = "auto"
+        assert choose_backend() == BACKEND_FAISS
+        with patch("services.vector_index.faiss", None):
+            assert choose_backend() == BACKEND_NUMPY
+            with pytest.raises(ValueError):
+                choose_backend(BACKEND_FAISS)
+        assert isinstance(create_vector_index(DIMENSION, BACKEND_NUMPY), NumpyVectorIndex)
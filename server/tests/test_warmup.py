@@ -0,0 +1,111 @@
+import threading
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from api.endpoints.health import router
+from core.database import Base
+from models.project import Project
+from models.user import User
+from services.embedding_cache import EmbeddingCache, QueryEmbeddingCache
+from services.embedding_engine import EmbeddingEngine
+from services.encoders import HashingEncoder
+from services.index_snapshot import IndexSnapshotStore
+from services.profile_search import ProfileSearch
+from services.semantic_search import SemanticSearch
+from services.warmup import WarmupService
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    return TestClient(app)
+
+def test_warmup_reports_progress_and_cold_start() -> None:
+    # Arrange
+    service = WarmupService()
+    release = threading.Event()
+    calls = []
+
+    # Act
+    service.start(None, stages=[
+        ("model", lambda: calls.append("model")),
+        ("projects_index", release.wait)
+    ])
+    in_progress = service.status()
+    release.set()
+    service._thread.join(timeout=5)
+
+    # Assert
+    assert calls == ["model"]
+    assert not in_progress["ready"]
+    assert in_progress["cold_start_seconds"] is None
+    assert service.is_ready
+    assert service.status()["progress"] == 1.0
+    assert service.status()["cold_start_seconds"] >= 0
+
+def test_warmup_failure_is_reported() -> None:
+    # Arrange
+    service = WarmupService()
+
+    def fail() -> None:
+        raise RuntimeError("no model")
+
+    # Act
+    service.run([("model", fail), ("projects_index", lambda: None)])
+
+    # Assert
+    status = service.status()
+    assert not status["ready"]
+    assert status["stages"]["model"]["status"] == "failed"
+    assert status["stages"]["projects_index"]["status"] == "pending"
+    assert "no model" in status["error"]
+
+def test_ready_and_health_endpoints() -> None:
+    # Arrange
+    service = WarmupService()
+    with patch("api.endpoints.health.warmup_service", service):
+        client = _client()
+
+        # Act / Assert
+        assert client.get("/api/v1/health").status_code == 200
+        assert client.get("/api/v1/ready").status_code == 503
+
+        service.run([("model", lambda: None)])
+        response = client.get("/api/v1/ready")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+def test_default_stages_index_real_rows(tmp_path) -> None:
+    # Arrange
+    engine = EmbeddingEngine(
+        encoder=HashingEncoder(dimension=64),
+        cache=EmbeddingCache(),
+        query_cache=QueryEmbeddingCache(max_items=10, ttl_seconds=60)
+    )
+    projects = SemanticSearch(engine=engine, snapshot_store=IndexSnapshotStore("projects", str(tmp_path)))
+    profiles = ProfileSearch(engine=engine, snapshot_store=IndexSnapshotStore("profiles", str(tmp_path)))
+    session_factory = sessionmaker(bind=create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    ))
+    db = session_factory()
+    Base.metadata.create_all(db.get_bind())
+    db.add(User(id=1, username="ivan", email="ivan@example.com", skills=["python"], roles=["developer"]))
+    db.add(Project(id=1, title="API", description="backend", technologies=["python"], required_roles=["developer"]))
+    db.commit()
+    db.close()
+    service = WarmupService()
+
+    # Act
+    with patch("services.embedding_engine.embedding_engine", engine), \
+            patch("services.semantic_search.semantic_search", projects), \
+            patch("services.profile_search.profile_search", profiles):
+        service.run(service._default_stages(session_factory))
+
+    # Assert
+    status = service.status()
+    assert status["ready"], status["error"]
+    assert status["cold_start_seconds"] is not None
+    assert profiles.indexed_ids() == [1]
+    assert projects.indexed_ids() == [1]